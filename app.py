@@ -5,6 +5,8 @@ from pathlib import Path
 
 from flask import Flask, jsonify, make_response, request, send_file, send_from_directory
 
+import loco_search
+
 
 # ============================================================
 # RailOps backend web server
@@ -23,6 +25,17 @@ from flask import Flask, jsonify, make_response, request, send_file, send_from_d
 BASE_DIR = Path(__file__).resolve().parent
 STATIC_DIR = BASE_DIR / "static"
 STATIC_DOWNLOADS_DIR = STATIC_DIR / "downloads"
+LOCO_SEARCH_INDEX = STATIC_DOWNLOADS_DIR / "loco_search_index.json"
+VLINE_DATA_FILE = STATIC_DOWNLOADS_DIR / "vline_services_data.json"
+
+SEARCH_DEFAULT_PER_PAGE = 25
+SEARCH_MAX_PER_PAGE = 100
+
+# Loaded search index, reloaded when the cron writes a new file.
+_search_cache = {"mtime": None, "index": None}
+
+# "version" of vline_services_data.json, reread when the file changes.
+_vline_data_cache = {"mtime": None, "version": None}
 
 app = Flask(__name__)
 
@@ -72,6 +85,54 @@ def file_response(path: Path, mimetype: str, missing_payload=None, missing_statu
     return add_cors(send_file(path, mimetype=mimetype))
 
 
+def revalidated_file_response(path: Path, mimetype: str, etag: str, missing_payload=None):
+    """
+    Like file_response, but cacheable: the client keeps the file and
+    revalidates with If-None-Match, getting a 304 while etag is unchanged.
+    """
+    if not path.exists():
+        return file_response(path, mimetype, missing_payload)
+
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(send_file(path, mimetype=mimetype, etag=False, conditional=False))
+
+    resp.set_etag(etag)
+    add_cors(resp)
+    resp.headers["Cache-Control"] = "no-cache"
+    del resp.headers["Pragma"]
+    del resp.headers["Expires"]
+    return resp
+
+
+def file_etag(path: Path) -> str:
+    try:
+        stat = path.stat()
+    except OSError:
+        return ""
+
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def get_vline_data_version() -> str:
+    try:
+        mtime = VLINE_DATA_FILE.stat().st_mtime_ns
+    except OSError:
+        return ""
+
+    if _vline_data_cache["mtime"] != mtime:
+        try:
+            version = json.loads(VLINE_DATA_FILE.read_text(encoding="utf-8")).get("version")
+        except (OSError, ValueError, AttributeError):
+            version = None
+
+        _vline_data_cache["version"] = str(version or file_etag(VLINE_DATA_FILE))
+        _vline_data_cache["mtime"] = mtime
+
+    return _vline_data_cache["version"]
+
+
 def safe_stat(path: Path):
     if not path.exists():
         return {
@@ -93,6 +154,28 @@ def ensure_dirs():
     STATIC_DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def get_search_index():
+    try:
+        mtime = LOCO_SEARCH_INDEX.stat().st_mtime
+    except OSError:
+        return None
+
+    if _search_cache["mtime"] != mtime:
+        _search_cache["index"] = loco_search.load_search_index(LOCO_SEARCH_INDEX)
+        _search_cache["mtime"] = mtime
+
+    return _search_cache["index"]
+
+
+def int_arg(name: str, default: int, minimum: int, maximum: int) -> int:
+    try:
+        value = int(request.args.get(name, default))
+    except (TypeError, ValueError):
+        value = default
+
+    return max(minimum, min(maximum, value))
+
+
 def ensure_placeholder_downloads():
     """
     Creates very small placeholder HTML files only if missing.
@@ -192,7 +275,8 @@ def home():
                 "/locos.json, /loco_history.json, /loco_export.csv, /loco_summary.txt, "
                 "/vline_services.json, /vline_services.csv, "
                 "/downloads/loco_database.html, /downloads/recently_added.html, "
-                "/downloads/loco_numbers_only.html, /downloads/vline_services.html"
+                "/downloads/loco_numbers_only.html, /downloads/vline_services.html, "
+                "/api/locos/search?q=NR82"
             ),
         }
     )
@@ -232,7 +316,10 @@ def debug_files():
         BASE_DIR / "loco_history.json",
         BASE_DIR / "loco_export.csv",
         BASE_DIR / "loco_summary.txt",
+        BASE_DIR / "loco_tracker.json",
+        BASE_DIR / "loco_tracker_history.json",
         BASE_DIR / "blocklist.json",
+        BASE_DIR / "vline_store.json",
         BASE_DIR / "vline_services.json",
         BASE_DIR / "vline_services.csv",
         STATIC_DOWNLOADS_DIR / "loco_database.html",
@@ -240,7 +327,9 @@ def debug_files():
         STATIC_DOWNLOADS_DIR / "loco_numbers_only.html",
         STATIC_DOWNLOADS_DIR / "loco_database.xlsx",
         STATIC_DOWNLOADS_DIR / "loco_numbers_only.xlsx",
+        STATIC_DOWNLOADS_DIR / "loco_search_index.json",
         STATIC_DOWNLOADS_DIR / "vline_services.html",
+        VLINE_DATA_FILE,
     ]
 
     return json_response(
@@ -359,6 +448,54 @@ def public_blocklist_json():
     )
 
 
+# ============================================================
+# Loco search API
+# ============================================================
+
+@app.route("/api/locos/search", methods=["GET", "OPTIONS"])
+def api_locos_search():
+    if request.method == "OPTIONS":
+        return add_cors(make_response("", 204))
+
+    query = request.args.get("q", "").strip()
+    page = int_arg("page", 1, 1, 100000)
+    per_page = int_arg("per_page", SEARCH_DEFAULT_PER_PAGE, 1, SEARCH_MAX_PER_PAGE)
+    fuzzy = request.args.get("fuzzy", "1").strip().lower() not in ["0", "false", "no"]
+
+    index = get_search_index()
+
+    if index is None:
+        return json_response(
+            {
+                "ok": False,
+                "error": "search_index_not_found",
+                "hint": "Run Railway cron to generate static/downloads/loco_search_index.json",
+            },
+            503,
+        )
+
+    if not query:
+        return json_response({"ok": False, "error": "missing_query", "hint": "Use ?q=NR82"}, 400)
+
+    matches = loco_search.search(index, query, fuzzy=fuzzy)
+    start = (page - 1) * per_page
+
+    return json_response(
+        {
+            "ok": True,
+            "q": query,
+            "total": len(matches),
+            "page": page,
+            "per_page": per_page,
+            "index_generated": index.get("generated"),
+            "results": [
+                loco_search.doc_result(index, doc, match)
+                for doc, match in matches[start:start + per_page]
+            ],
+        }
+    )
+
+
 # ============================================================
 # V/Line service database public routes
 # ============================================================
@@ -396,9 +533,10 @@ def public_vline_services_html():
     if request.method == "OPTIONS":
         return add_cors(make_response("", 204))
 
-    return file_response(
+    return revalidated_file_response(
         STATIC_DOWNLOADS_DIR / "vline_services.html",
         "text/html",
+        file_etag(STATIC_DOWNLOADS_DIR / "vline_services.html"),
         """<!doctype html>
 <html lang="en">
 <head>
@@ -416,6 +554,23 @@ def public_vline_services_html():
     )
 
 
+@app.route("/downloads/vline_services_data.json", methods=["GET", "OPTIONS"])
+def public_vline_services_data():
+    if request.method == "OPTIONS":
+        return add_cors(make_response("", 204))
+
+    return revalidated_file_response(
+        VLINE_DATA_FILE,
+        "application/json",
+        get_vline_data_version(),
+        {
+            "ok": False,
+            "error": "vline_services_data.json not found",
+            "hint": "Run Railway cron after adding vline_database.py",
+        },
+    )
+
+
 # ============================================================
 # Generic downloads route
 # ============================================================
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the RailOps generators.
+
+Run from the repo root, e.g.:
+    python -m benchmarks.loco_database_bench --trains 10000 --locos 100000
+"""
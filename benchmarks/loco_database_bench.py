@@ -0,0 +1,217 @@
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import railops_loco_database as generator
+import sighting_log
+
+from benchmarks.synthetic import write_dataset
+
+
+# ============================================================
+# railops_loco_database benchmark
+#
+# Generates seeded synthetic trains.json / locos.json / blocklist.json
+# in a temp folder, points the generator at it and times every stage of
+# main() on its own. Writes a JSON report and can compare it against a
+# stored baseline report.
+#
+#   python -m benchmarks.loco_database_bench --trains 10000 --locos 100000
+#   python -m benchmarks.loco_database_bench --baseline bench_loco_database_base.json
+# ============================================================
+
+
+def point_generator_at(directory: Path) -> None:
+    downloads = directory / "static" / "downloads"
+
+    generator.TRAINS_FILE = directory / "trains.json"
+    generator.LIVE_TRAINS_FILE = directory / "live_trains.json"
+    generator.LOCOS_FILE = directory / "locos.json"
+    generator.LOCO_HISTORY_FILE = directory / "loco_history.json"
+    generator.LOCO_EXPORT_FILE = directory / "loco_export.csv"
+    generator.LOCO_SUMMARY_FILE = directory / "loco_summary.txt"
+    generator.BLOCKLIST_FILE = directory / "blocklist.json"
+    generator.BLOCKLIST_STATE_FILE = directory / "blocklist_state.json"
+    generator.LOCO_OUTPUT_MANIFEST = directory / "loco_outputs_manifest.json"
+    generator.LOCO_STORE_DB = directory / "locos.db"
+    generator.DOWNLOADS_DIR = downloads
+    generator.LOCO_DATABASE_HTML = downloads / "loco_database.html"
+    generator.RECENTLY_ADDED_HTML = downloads / "recently_added.html"
+    generator.LOCO_NUMBERS_ONLY_HTML = downloads / "loco_numbers_only.html"
+    generator.LOCO_DATABASE_XLSX = downloads / "loco_database.xlsx"
+    generator.LOCO_NUMBERS_ONLY_XLSX = downloads / "loco_numbers_only.xlsx"
+    generator.LOCO_SEARCH_INDEX = downloads / "loco_search_index.json"
+    generator.PARTITIONS_DIR = downloads / "partitions"
+    generator.LOCO_PARTITIONS_HTML = downloads / "loco_partitions.html"
+
+
+def run_stages(directory: Path, include_xlsx: bool) -> dict[str, float]:
+    stages: dict[str, float] = {}
+
+    @contextmanager
+    def stage(name: str):
+        start = time.perf_counter()
+        yield
+        stages[name] = round(time.perf_counter() - start, 4)
+
+    generator.ensure_dirs()
+    generated_iso = generator.iso_now()
+
+    with stage("load_trains"):
+        trains = generator.load_trains_payload().get("trains", [])
+
+    with stage("load_locos"):
+        existing = generator.load_existing_locos()
+
+    sightings: list[tuple] = []
+
+    with stage("merge_locos"):
+        merged, new_added, _seen = generator.merge_locos(existing, trains, sightings)
+
+    with stage("blocklist_visible"):
+        visible = generator.visible_locos(merged)
+
+    # Second pass reuses blocklist_state.json, as a normal cron run does.
+    with stage("blocklist_visible_warm"):
+        generator.visible_locos(merged)
+
+    blocklist = json.loads(generator.BLOCKLIST_FILE.read_text(encoding="utf-8"))
+    blocklist["blocked_locos"].append("NR1*")
+    generator.BLOCKLIST_FILE.write_text(json.dumps(blocklist), encoding="utf-8")
+
+    with stage("blocklist_edit"):
+        generator.visible_locos(merged)
+
+    blocklist["blocked_locos"].remove("NR1*")
+    generator.BLOCKLIST_FILE.write_text(json.dumps(blocklist), encoding="utf-8")
+    generator.visible_locos(merged)
+
+    with stage("sort"):
+        sorted(
+            visible,
+            key=lambda x: generator.loco_sort_key(
+                generator.get_first(x, ["loco_number", "Loco Number", "number", "loco"])
+            ),
+        )
+
+    with stage("save_locos_json"):
+        generator.save_json(generator.LOCOS_FILE, visible)
+
+    with stage("sighting_log"):
+        sighting_log.append_sightings(sightings, directory / "sightings")
+
+    with stage("output_digests"):
+        generator.output_digests(visible, len(new_added))
+
+    with stage("database_html"):
+        generator.generate_database_html(visible, generated_iso, len(new_added), presorted=True)
+
+    with stage("virtual_database_html"):
+        generator.generate_virtual_database_html(visible, generated_iso, len(new_added), presorted=True)
+
+    with stage("recent_html"):
+        generator.generate_recent_html(visible, generated_iso, len(new_added))
+
+    with stage("numbers_html"):
+        generator.generate_numbers_html(visible, generated_iso, len(new_added))
+
+    with stage("search_index"):
+        generator.generate_search_index(visible, generated_iso)
+
+    with stage("partitions"):
+        generator.write_partitions(visible, generated_iso)
+
+    with stage("csv"):
+        generator.generate_csv(visible)
+
+    if include_xlsx and generator.Workbook is not None:
+        with stage("xlsx"):
+            generator.generate_xlsx(visible)
+
+    stages["_counts"] = {
+        "trains": len(trains),
+        "existing_locos": len(existing),
+        "merged": len(merged),
+        "visible": len(visible),
+        "new_added": len(new_added),
+    }
+
+    return stages
+
+
+def compare(report: dict, baseline: dict) -> list[str]:
+    lines = []
+
+    for name, seconds in report["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+
+        if not isinstance(before, (int, float)) or not isinstance(seconds, (int, float)):
+            continue
+
+        ratio = seconds / before if before else float("inf")
+        lines.append(f"{name:<24} {before:>9.4f}s -> {seconds:>9.4f}s  x{ratio:.2f}")
+
+    return lines
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark railops_loco_database stages on synthetic data.")
+    parser.add_argument("--trains", type=int, default=10000)
+    parser.add_argument("--locos", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-xlsx", action="store_true", help="Skip the (slow) workbook stage.")
+    parser.add_argument("--report", default="bench_loco_database.json")
+    parser.add_argument("--baseline", help="Earlier report to compare against.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="railops-bench-") as temp:
+        directory = Path(temp)
+
+        start = time.perf_counter()
+        write_dataset(directory, args.trains, args.locos, args.seed)
+        dataset_seconds = round(time.perf_counter() - start, 4)
+
+        point_generator_at(directory)
+        stages = run_stages(directory, include_xlsx=not args.skip_xlsx)
+
+    counts = stages.pop("_counts")
+
+    report = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            "trains": args.trains,
+            "locos": args.locos,
+            "seed": args.seed,
+        },
+        "counts": counts,
+        "dataset_seconds": dataset_seconds,
+        "stages": stages,
+        "total_seconds": round(sum(stages.values()), 4),
+    }
+
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, seconds in stages.items():
+        print(f"{name:<24} {seconds:>9.4f}s")
+    print(f"{'total':<24} {report['total_seconds']:>9.4f}s")
+    print(f"Wrote: {args.report}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        print("")
+        print(f"Compared with {args.baseline}:")
+        for line in compare(report, baseline):
+            print(line)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
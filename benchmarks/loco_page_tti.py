@@ -0,0 +1,174 @@
+import argparse
+import functools
+import gzip
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import loco_store
+import railops_loco_database as generator
+
+from benchmarks.loco_database_bench import point_generator_at
+
+
+# ============================================================
+# loco_database.html: static vs virtual
+#
+# Renders both modes of the full database page from the same locos.json,
+# reports page weight (raw and gzipped) and, when the Lighthouse CLI is
+# on PATH, time to interactive on Lighthouse's default mobile profile
+# (a mid-range phone: 4x CPU slowdown, slow 4G). Each page is served
+# over local HTTP and audited --runs times; the report keeps medians.
+#
+#   python -m benchmarks.loco_page_tti
+#   python -m benchmarks.loco_page_tti --locos locos.json --runs 5
+#
+# Lighthouse needs Chrome: npm install -g lighthouse
+# ============================================================
+
+
+MODES = ["static", "virtual"]
+
+LIGHTHOUSE_METRICS = {
+    "interactive": "tti_ms",
+    "first-contentful-paint": "fcp_ms",
+    "total-blocking-time": "tbt_ms",
+    "dom-size": "dom_elements",
+}
+
+
+def render_pages(locos: list[dict], directory: Path) -> dict[str, Path]:
+    point_generator_at(directory)
+    generator.ensure_dirs()
+    generated_iso = generator.iso_now()
+    pages = {}
+
+    for mode in MODES:
+        if mode == "virtual":
+            generator.generate_virtual_database_html(locos, generated_iso)
+        else:
+            generator.generate_database_html(locos, generated_iso)
+
+        pages[mode] = generator.DOWNLOADS_DIR / f"loco_database_{mode}.html"
+        shutil.move(generator.LOCO_DATABASE_HTML, pages[mode])
+
+    return pages
+
+
+def page_weight(path: Path) -> dict[str, int]:
+    raw = path.read_bytes()
+    return {
+        "bytes": len(raw),
+        "gzip_bytes": len(gzip.compress(raw, compresslevel=9)),
+    }
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve(directory: Path) -> ThreadingHTTPServer:
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def lighthouse_run(lighthouse: str, url: str, output: Path) -> dict[str, float]:
+    subprocess.run(
+        [
+            lighthouse,
+            url,
+            "--only-categories=performance",
+            "--output=json",
+            f"--output-path={output}",
+            "--chrome-flags=--headless=new --no-sandbox",
+            "--quiet",
+        ],
+        check=True,
+    )
+
+    audits = json.loads(output.read_text(encoding="utf-8"))["audits"]
+
+    return {
+        name: audits[audit]["numericValue"]
+        for audit, name in LIGHTHOUSE_METRICS.items()
+        if audits.get(audit, {}).get("numericValue") is not None
+    }
+
+
+def measure_tti(lighthouse: str, pages: dict[str, Path], runs: int) -> dict[str, dict[str, float]]:
+    server = serve(next(iter(pages.values())).parent)
+    port = server.server_address[1]
+    results = {}
+
+    try:
+        for mode, path in pages.items():
+            samples = [
+                lighthouse_run(lighthouse, f"http://127.0.0.1:{port}/{path.name}", path.with_suffix(f".lh{run}.json"))
+                for run in range(runs)
+            ]
+            results[mode] = {
+                name: round(statistics.median(sample[name] for sample in samples), 1)
+                for name in LIGHTHOUSE_METRICS.values()
+                if all(name in sample for sample in samples)
+            }
+    finally:
+        server.shutdown()
+
+    return results
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Compare the static and virtual loco_database.html pages.")
+    parser.add_argument("--locos", default=str(generator.LOCOS_FILE), help="locos.json to render.")
+    parser.add_argument("--runs", type=int, default=3, help="Lighthouse runs per page.")
+    parser.add_argument("--lighthouse", default=shutil.which("lighthouse"), help="Lighthouse CLI path.")
+    parser.add_argument("--report", default="bench_loco_page_tti.json")
+    args = parser.parse_args(argv)
+
+    locos = loco_store.records_from_payload(json.loads(Path(args.locos).read_text(encoding="utf-8")))
+
+    with tempfile.TemporaryDirectory(prefix="railops-tti-") as temp:
+        pages = render_pages(locos, Path(temp))
+        weights = {mode: page_weight(path) for mode, path in pages.items()}
+
+        if args.lighthouse:
+            tti = measure_tti(args.lighthouse, pages, args.runs)
+        else:
+            print("Lighthouse CLI not found; page weight only (npm install -g lighthouse).")
+            tti = {}
+
+    report = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            "locos_file": args.locos,
+            "locos": len(locos),
+            "runs": args.runs,
+            "lighthouse": bool(args.lighthouse),
+        },
+        "pages": {mode: dict(weights[mode], **tti.get(mode, {})) for mode in MODES},
+    }
+
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for mode, page in report["pages"].items():
+        metrics = "  ".join(f"{name} {value}" for name, value in page.items())
+        print(f"{mode:<8} {metrics}")
+    print(f"Wrote: {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,243 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+
+# ============================================================
+# Seeded synthetic TrainFinder data
+#
+# Mirrors the mix seen in a real trains.json scrape: about half marker
+# ghosts, TNSW-xxxx-xxxx metro sets, MM-xxxM Melbourne metro, QLD7...
+# light rail, VLINE-xxxx and 3VLnn regional services, then freight and
+# passenger locos such as NR44, AN11, VL352, 8216, CF4404, ACD6071.
+# ============================================================
+
+
+LOCO_CLASSES = [
+    ("NR", 1, 121, "PN Intermodal"),
+    ("AN", 1, 11, "PN Intermodal"),
+    ("VL", 351, 362, "Qube Grain"),
+    ("", 8101, 8184, "PN Coal"),
+    ("", 9001, 9035, "PN Coal"),
+    ("", 1101, 1112, "Qube Trip Train"),
+    ("G", 511, 543, "SCT Intermodal"),
+    ("CF", 4401, 4420, "Qube Light Engine"),
+    ("ACD", 6001, 6080, "Aurizon Steel"),
+    ("XRN", 1, 48, "PN Intermodal"),
+    ("CSR", 1, 40, "SCT Intermodal"),
+    ("TT", 1, 130, "PN Coal"),
+    ("LDP", 1, 9, "SSR Grain"),
+    ("GWA", 1, 10, "GWA Intermodal"),
+]
+
+FREIGHT_TRAIN_NUMBERS = ["7SB3", "5PM5", "6MP9", "HV976", "T963", "D409", "2BM7", "4MB7", "1MP9", "3PS1"]
+
+PLACES = [
+    "Chullora",
+    "Acacia Ridge",
+    "SCT, Laverton",
+    "SCT, Forrestfield",
+    "Hunter Valley",
+    "Kooragang NCIG",
+    "Dynon",
+    "Islington",
+    "Southern Cross",
+    "Traralgon",
+]
+
+METRO_LINES = ["T1 North Shore Line", "T4 Eastern Suburbs Line", "T8 Airport Line", "T2 Inner West Line"]
+MM_LINES = ["Hurstbridge Line", "Cranbourne Line", "Frankston Line", "Craigieburn Line"]
+VLINE_ROUTES = [
+    "Bendigo - Melbourne Via Sunbury",
+    "Geelong - Melbourne Via Geelong",
+    "Ballarat - Melbourne Via Melton",
+    "Gippsland Line Service",
+]
+
+
+def blank_train(rng: random.Random) -> dict[str, Any]:
+    return {
+        "id": "",
+        "train_number": "",
+        "train_name": "",
+        "loco": "",
+        "operator": "",
+        "origin": "",
+        "destination": "",
+        "speed": 0,
+        "heading": 0,
+        "km": "",
+        "time": "",
+        "date": "",
+        "description": "",
+        "cId": "",
+        "servId": "",
+        "trKey": "",
+        "lat": round(rng.uniform(-38.5, -27.0), 6),
+        "lon": round(rng.uniform(138.0, 153.5), 6),
+    }
+
+
+def loco_number(rng: random.Random, spread: int = 1) -> tuple[str, str]:
+    prefix, low, high, description = rng.choice(LOCO_CLASSES)
+    number = rng.randint(low, high + (high - low + 1) * (spread - 1))
+    if prefix in {"XRN", "CSR", "LDP", "GWA"}:
+        return f"{prefix}{number:03d}", description
+    return f"{prefix}{number}", description
+
+
+def make_train(index: int, rng: random.Random) -> dict[str, Any]:
+    train = blank_train(rng)
+    roll = rng.random()
+
+    if roll < 0.45:
+        train["id"] = f"arrowMarkersSource_{index}"
+        return train
+
+    if roll < 0.60:
+        name = f"TNSW-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+        train.update(
+            id=name,
+            train_name=name,
+            trKey=name,
+            train_number=f"{rng.randint(100, 999)}{rng.choice('ABCDF')}",
+            origin="City",
+            destination="Hornsby and Berowra via Gordon",
+            description=rng.choice(METRO_LINES),
+        )
+        return train
+
+    if roll < 0.63:
+        name = f"MM-{rng.randint(1, 999)}M"
+        train.update(id=name, train_name=name, trKey=name, train_number="HBE", description=rng.choice(MM_LINES))
+        return train
+
+    if roll < 0.65:
+        name = f"QLD7DBC12428F13E6FACD8FDFD0866122D3_DP{rng.randint(10, 99)}"
+        train.update(id=name, train_name=name, trKey=name, train_number=name[-4:], description="VLBD")
+        return train
+
+    if roll < 0.68:
+        service = str(rng.randint(8001, 8899))
+        name = f"VLINE-{service}"
+        train.update(id=name, train_name=name, trKey=name, train_number=service, description=rng.choice(VLINE_ROUTES))
+        return train
+
+    if roll < 0.70:
+        name = f"3VL{rng.randint(1, 199)}"
+        train.update(
+            id=name,
+            train_name=name,
+            trKey=name,
+            train_number=str(rng.randint(8001, 8899)),
+            origin="Southern Cross",
+            destination=rng.choice(["Traralgon", "Waurn Ponds", "Bendigo"]),
+            description="Gippsland Line Service",
+        )
+        return train
+
+    name, description = loco_number(rng, spread=4)
+    train.update(
+        id=name,
+        train_name=name,
+        trKey=name,
+        train_number=rng.choice(FREIGHT_TRAIN_NUMBERS),
+        origin=rng.choice(PLACES),
+        destination=rng.choice(PLACES),
+        speed=rng.randint(0, 115),
+        km=f"{rng.randint(1, 900)} km",
+        description=description,
+        cId=f"{rng.getrandbits(128):032x}",
+        servId=f"{rng.getrandbits(128):032x}",
+    )
+    return train
+
+
+def make_trains(count: int, seed: int = 1) -> dict[str, Any]:
+    rng = random.Random(seed)
+    return {
+        "lastUpdated": "2026-05-03T08:00:00Z",
+        "note": f"synthetic benchmark data, seed {seed}",
+        "trains": [make_train(index, rng) for index in range(count)],
+    }
+
+
+def make_locos(count: int, seed: int = 1) -> list[dict[str, Any]]:
+    """
+    Unique loco records in the locos.json shape. Numbers are drawn from
+    the real class prefixes; large counts widen the number ranges.
+    """
+    rng = random.Random(seed + 1)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    spread = max(1, count // 400)
+
+    locos = {}
+
+    while len(locos) < count:
+        number, description = loco_number(rng, spread=spread)
+
+        if number in locos:
+            number = f"{number}{rng.choice('ABCDEFGH')}{len(locos)}"
+
+        added = start + timedelta(seconds=rng.randint(0, 120 * 86400))
+        seen = added + timedelta(seconds=rng.randint(0, 7 * 86400))
+        train_id = rng.choice(FREIGHT_TRAIN_NUMBERS)
+
+        locos[number] = {
+            "loco_number": number,
+            "current_operator": "",
+            "vehicle_description": description,
+            "train_id": train_id,
+            "route": train_id,
+            "last_seen": seen.isoformat().replace("+00:00", "Z"),
+            "date_time_added": added.isoformat().replace("+00:00", "Z"),
+            "lat": str(round(rng.uniform(-38.5, -27.0), 6)),
+            "lon": str(round(rng.uniform(138.0, 153.5), 6)),
+            "source": "trains.json",
+            "date_time_added_epoch": int(added.timestamp()),
+            "last_seen_epoch": int(seen.timestamp()),
+        }
+
+    return list(locos.values())
+
+
+def make_blocklist() -> dict[str, list[str]]:
+    return {
+        "blocked_locos": [
+            "TNSW*",
+            "QLD7*",
+            "JP2*",
+            "MM-*",
+            "TEST*",
+            "DEMO*",
+            "UNKNOWN",
+            "UNREG",
+            "MARKERSOURCE*",
+            "ARROWMARKERSSOURCE*",
+            "*MARKERSOURCE*",
+            "*ARROWMARKERSSOURCE*",
+            "MM*M",
+            "VLINE*",
+        ],
+        "blocked_routes": ["TEST TRAIN", "LINE TEST", "DULWICH HILL LINE", "GCR1", "RANDWICK LINE"],
+        "blocked_descriptions": ["test train", "placeholder", "dummy", "not in service", "markersource"],
+        "blocked_operators": [],
+    }
+
+
+def write_dataset(directory: Path, trains: int, locos: int, seed: int = 1) -> dict[str, Path]:
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = {
+        "trains": directory / "trains.json",
+        "locos": directory / "locos.json",
+        "blocklist": directory / "blocklist.json",
+    }
+
+    paths["trains"].write_text(json.dumps(make_trains(trains, seed)), encoding="utf-8")
+    paths["locos"].write_text(json.dumps(make_locos(locos, seed)), encoding="utf-8")
+    paths["blocklist"].write_text(json.dumps(make_blocklist(), indent=2), encoding="utf-8")
+
+    return paths
@@ -0,0 +1,122 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import update_trains
+
+from benchmarks.synthetic import loco_number
+
+
+# ============================================================
+# update_trains.upsert_locos benchmark
+#
+# Builds a seeded list of scraped loco rows, points update_trains at a
+# temp locomotives.db / blocked_locos.txt and times upsert_locos for:
+#   cold       every row is new
+#   unchanged  the same rows again (no writes)
+#   changed    the same rows with --changed percent of operators edited
+# and export_loco_spreadsheet for:
+#   export         full workbook rebuild
+#   export_cached  no data change since the last export (skipped)
+#
+#   python -m benchmarks.update_trains_bench --rows 100000
+# ============================================================
+
+
+OPERATORS = ["Pacific National", "Aurizon", "Qube", "SCT Logistics", "One Rail", "Watco"]
+
+
+def make_rows(count: int, seed: int) -> list[dict[str, str]]:
+    rng = random.Random(seed)
+    spread = max(1, count // 400)
+    rows = {}
+
+    while len(rows) < count:
+        number, description = loco_number(rng, spread=spread)
+
+        if number in rows:
+            number = f"{number}{rng.choice('ABCDEFGH')}{len(rows)}"
+
+        rows[number] = {
+            "loco_number": number,
+            "current_operator": rng.choice(OPERATORS),
+            "vehicle_description": description,
+        }
+
+    return list(rows.values())
+
+
+def change_rows(rows: list[dict[str, str]], percent: float, seed: int) -> list[dict[str, str]]:
+    rng = random.Random(seed + 1)
+    changed = []
+
+    for row in rows:
+        if rng.random() * 100 < percent:
+            row = dict(row, current_operator=f"{row['current_operator']} (hired)")
+        changed.append(row)
+
+    return changed
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark update_trains.upsert_locos on synthetic rows.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--changed", type=float, default=10.0, help="Percent of rows edited for the changed pass.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--report", default="bench_update_trains.json")
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows, args.seed)
+    changed = change_rows(rows, args.changed, args.seed)
+    stages: dict[str, float] = {}
+    results: dict[str, dict[str, int]] = {}
+
+    with tempfile.TemporaryDirectory(prefix="railops-bench-") as temp:
+        update_trains.DB_PATH = str(Path(temp) / "locomotives.db")
+        update_trains.BLOCKED_PATH = str(Path(temp) / "blocked_locos.txt")
+        update_trains.XLSX_PATH = str(Path(temp) / "loco_database.xlsx")
+
+        conn = update_trains.get_db()
+        update_trains.init_db(conn)
+
+        for name, batch in [("cold", rows), ("unchanged", rows), ("changed", changed)]:
+            start = time.perf_counter()
+            results[name] = update_trains.upsert_locos(batch, conn)
+            stages[name] = round(time.perf_counter() - start, 4)
+
+        for name in ["export", "export_cached"]:
+            start = time.perf_counter()
+            results[name] = {"rebuilt": int(update_trains.export_loco_spreadsheet(conn))}
+            stages[name] = round(time.perf_counter() - start, 4)
+
+        conn.close()
+
+    report = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            "rows": args.rows,
+            "changed": args.changed,
+            "seed": args.seed,
+        },
+        "stages": stages,
+        "results": results,
+    }
+
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, seconds in stages.items():
+        print(f"{name:<14} {seconds:>9.4f}s  {json.dumps(results[name])}")
+    print(f"Wrote: {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+import argparse
+import json
+import logging
+import platform
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from werkzeug.serving import make_server
+
+import webrams_http
+import webrams_standin
+
+
+# ============================================================
+# webrams_http benchmark against the local stand-in
+#
+# Starts webrams_standin on a free port in a background thread and
+# times the browserless client through one account's run:
+#   login     login form post
+#   search    Running search and results parsing
+#   trains    progress + consist + incidents for every train
+#
+#   python -m benchmarks.webrams_http_bench --trains 40 --latency-ms 50
+#   python -m benchmarks.webrams_http_bench --recordings data/webrams_recordings
+# ============================================================
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark webrams_http against webrams_standin.")
+    parser.add_argument("--trains", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay the stand-in adds to every response.")
+    parser.add_argument("--recordings", default=None, help="Replay recorded pages instead of synthetic trains.")
+    parser.add_argument("--report", default="bench_webrams_http.json")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    app = webrams_standin.create_app(args.recordings, args.trains, args.seed, args.latency_ms)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    webrams_http.BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    stages: dict[str, float] = {}
+    client = webrams_http.new_client()
+
+    try:
+        start = time.perf_counter()
+        webrams_http.login(client, "bench", "bench")
+        stages["login"] = round(time.perf_counter() - start, 4)
+
+        start = time.perf_counter()
+        stubs = webrams_http.running_trains(client)
+        stages["search"] = round(time.perf_counter() - start, 4)
+
+        start = time.perf_counter()
+        sections = [
+            webrams_http.fetch_train_sections(client, stub, ["progress", "consist", "incidents"])
+            for stub in stubs
+        ]
+        stages["trains"] = round(time.perf_counter() - start, 4)
+    finally:
+        webrams_http.close_client(client)
+        server.shutdown()
+
+    results = {
+        "trains": len(stubs),
+        "with_consist": sum(1 for item in sections if item.get("consist", {}).get("consist")),
+        "consist_rows": sum(len(item.get("consist", {}).get("consist", [])) for item in sections),
+        "incident_pages": sum(1 for item in sections if "incidents" in item),
+        "per_train_seconds": round(stages["trains"] / max(1, len(stubs)), 4),
+    }
+
+    report = {
+        "generated": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": {
+            "trains": args.trains,
+            "seed": args.seed,
+            "latency_ms": args.latency_ms,
+            "recordings": args.recordings,
+        },
+        "stages": stages,
+        "results": results,
+    }
+
+    Path(args.report).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for name, seconds in stages.items():
+        print(f"{name:<8} {seconds:>9.4f}s")
+    print(json.dumps(results))
+    print(f"Wrote: {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,106 @@
+import bisect
+import fnmatch
+from typing import Callable, Iterable
+
+
+# ============================================================
+# RailOps loco indexes
+#
+# Small in-memory indexes used to apply blocklist edits without
+# re-matching every pattern against every loco:
+# - a prefix index over loco numbers (a sorted array, i.e. a flattened
+#   trie), for "TNSW*" / "MM*M" style patterns
+# - an inverted index from each distinct field value (route, description,
+#   operator) to its records, so text patterns are matched once per
+#   distinct value instead of once per loco
+#
+# Both return candidate record ids. Callers get exactly the same result
+# as a full scan.
+# ============================================================
+
+
+WILDCARD_CHARS = "*?["
+
+
+# ============================================================
+# Prefix index
+# ============================================================
+
+def build_prefix_index(values: Iterable[tuple[int, str]]) -> list[tuple[str, int]]:
+    """
+    Sorted (uppercased value, record id) pairs. Values are uppercased,
+    matching how is_blocked_value compares loco numbers.
+    """
+    return sorted((value.upper(), record_id) for record_id, value in values)
+
+
+def prefix_ids(index: list[tuple[str, int]], prefix: str) -> list[tuple[str, int]]:
+    """
+    All (value, record id) pairs whose value starts with prefix.
+    """
+    prefix = prefix.upper()
+    start = bisect.bisect_left(index, (prefix,))
+
+    if not prefix:
+        return index[start:]
+
+    end = start
+
+    while end < len(index) and index[end][0].startswith(prefix):
+        end += 1
+
+    return index[start:end]
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    The part of an fnmatch pattern before its first wildcard.
+    """
+    for position, char in enumerate(pattern):
+        if char in WILDCARD_CHARS:
+            return pattern[:position]
+
+    return pattern
+
+
+def wildcard_ids(index: list[tuple[str, int]], pattern: str) -> list[int]:
+    """
+    Record ids whose value matches an fnmatch pattern. Only values sharing
+    the pattern's literal prefix are tested.
+    """
+    pattern = pattern.upper()
+
+    return [
+        record_id
+        for value, record_id in prefix_ids(index, literal_prefix(pattern))
+        if fnmatch.fnmatch(value, pattern)
+    ]
+
+
+# ============================================================
+# Value index
+# ============================================================
+
+def build_value_index(values: Iterable[tuple[int, str]]) -> dict[str, list[int]]:
+    """
+    Maps each distinct value to the ids of the records holding it.
+    """
+    index: dict[str, list[int]] = {}
+
+    for record_id, value in values:
+        index.setdefault(value, []).append(record_id)
+
+    return index
+
+
+def value_ids(index: dict[str, list[int]], matches: Callable[[str], bool]) -> list[int]:
+    """
+    Record ids of every distinct value accepted by matches().
+    """
+    ids = []
+
+    for value, record_ids in index.items():
+        if matches(value):
+            ids.extend(record_ids)
+
+    return ids
@@ -0,0 +1,103 @@
+import os
+import time
+from typing import Any
+
+import memory_profile
+import railops_loco_database
+import train_partition
+import update_locos
+import vline_database
+
+
+# ============================================================
+# RailOps loco pipeline
+#
+# One entry point for the train databases. trains.json is read once and
+# split by train_partition.py in a single pass; each view gets its
+# stream:
+#
+# - vline (V/Line stream): vline_database.py
+#     vline_services.json, vline_services.csv, vline_services.html
+# - railops (loco stream): railops_loco_database.py
+#     locos.json, loco_history.json, loco_export.csv, loco_summary.txt,
+#     blocklist.json rules, HTML/XLSX downloads, sightings/
+# - tracker (loco stream): update_locos.py
+#     loco_tracker.json, loco_tracker_history.json,
+#     loco_tracker_export.csv, loco_tracker_summary.txt,
+#     blocked_locos.txt / blocked_descriptions.txt rules
+#
+# The views write separate files, so running both no longer overwrites
+# one database with the other. Sightings are logged once, by the railops
+# view (or by the tracker when it runs alone).
+#
+# LOCO_PIPELINE_VIEWS picks the views; the default is all three,
+# "vline,railops,tracker". The cron and fast_scraper.yml rely on the
+# vline view being on and skip their separate vline_database.py step.
+#
+#   python loco_pipeline.py
+#   LOCO_PIPELINE_VIEWS=railops,tracker python loco_pipeline.py
+# ============================================================
+
+
+LOCO_PIPELINE_VIEWS = [
+    view.strip().lower()
+    for view in os.getenv("LOCO_PIPELINE_VIEWS", "vline,railops,tracker").split(",")
+    if view.strip()
+]
+
+
+def load_trains() -> list[Any]:
+    payload = railops_loco_database.load_trains_payload()
+    trains = payload.get("trains", [])
+
+    if not isinstance(trains, list):
+        return []
+
+    return trains
+
+
+def main() -> int:
+    print("=== RAILOPS LOCO PIPELINE START ===", flush=True)
+
+    unknown = [view for view in LOCO_PIPELINE_VIEWS if view not in ["vline", "railops", "tracker"]]
+
+    if unknown:
+        print(f"Unknown LOCO_PIPELINE_VIEWS entries: {', '.join(unknown)}", flush=True)
+        return 2
+
+    memory_profile.mark("load_trains")
+    started = time.perf_counter()
+    trains = load_trains()
+    print(f"Loaded {len(trains)} trains in {time.perf_counter() - started:.2f}s", flush=True)
+
+    memory_profile.mark("partition")
+    partition = train_partition.partition_trains(trains)
+    print(train_partition.describe(partition), flush=True)
+
+    if "vline" in LOCO_PIPELINE_VIEWS:
+        started = time.perf_counter()
+        vline_database.main(partition=partition)
+        print(f"vline view done in {time.perf_counter() - started:.2f}s", flush=True)
+
+    # The tracker runs first so it can migrate any tracker-shaped
+    # locos.json before the railops view rewrites that file.
+    if "tracker" in LOCO_PIPELINE_VIEWS:
+        started = time.perf_counter()
+        update_locos.update_loco_database(
+            partition["loco"],
+            log_sightings=update_locos.SIGHTING_LOG_ENABLED and "railops" not in LOCO_PIPELINE_VIEWS,
+        )
+        print(f"tracker view done in {time.perf_counter() - started:.2f}s", flush=True)
+
+    if "railops" in LOCO_PIPELINE_VIEWS:
+        started = time.perf_counter()
+        railops_loco_database.main(partition=partition)
+        print(f"railops view done in {time.perf_counter() - started:.2f}s", flush=True)
+
+    print("=== RAILOPS LOCO PIPELINE DONE ===", flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(memory_profile.run("loco_pipeline", main))
@@ -0,0 +1,234 @@
+import bisect
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+
+# ============================================================
+# RailOps loco search index
+#
+# railops_loco_database.py writes static/downloads/loco_search_index.json
+# with build_search_index(). app.py loads it once (and again whenever the
+# file changes) and answers /api/locos/search with search().
+#
+# Index layout (compact, dictionary-encoded):
+#   docs:              [[loco_number, operator id, description id,
+#                        train_id, date_time_added], ...]
+#                      in loco_sort_key order
+#   operators:         ["Pacific National", ...]
+#   descriptions:      ["PN Infrabuild Steel", ...]
+#   numbers:           [[normalised loco number, doc], ...] sorted by
+#                      number, for prefix search with bisect
+#   number_grams:      {trigram: [doc, ...]} over "^NUMBER$", for fuzzy
+#                      matching of loco numbers
+#   operator_grams:    {trigram: [operator id, ...]}
+#   description_grams: {trigram: [description id, ...]}
+# ============================================================
+
+
+SEARCH_INDEX_VERSION = 1
+
+# Fuzzy number matches need at least this trigram (Jaccard) similarity.
+FUZZY_MIN_SCORE = 0.3
+
+MATCH_ORDER = ["exact", "prefix", "text", "fuzzy"]
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def search_key(value: Any) -> str:
+    """
+    Same normalisation as railops_loco_database.norm_key().
+    """
+    text = "" if value is None else str(value).strip().upper()
+    text = re.sub(r"\s+", "", text)
+    return text.replace("-", "")
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def number_grams(key: str) -> set[str]:
+    return trigrams(f"^{key}$")
+
+
+def add_postings(grams: dict[str, list[int]], text: str, item: int) -> None:
+    for gram in trigrams(text):
+        postings = grams.setdefault(gram, [])
+
+        if not postings or postings[-1] != item:
+            postings.append(item)
+
+
+# ============================================================
+# Build (generator side)
+# ============================================================
+
+def build_search_index(rows: list[list[str]], generated: str) -> dict[str, Any]:
+    """
+    rows are [loco_number, operator, description, train_id,
+    date_time_added], already in display order.
+    """
+    operators: dict[str, int] = {}
+    descriptions: dict[str, int] = {}
+    docs = []
+    numbers = []
+    grams: dict[str, list[int]] = {}
+
+    for doc, (loco_number, operator, description, train_id, added) in enumerate(rows):
+        operator_id = operators.setdefault(operator, len(operators))
+        description_id = descriptions.setdefault(description, len(descriptions))
+        docs.append([loco_number, operator_id, description_id, train_id, added])
+
+        key = search_key(loco_number)
+
+        if key:
+            numbers.append([key, doc])
+
+            for gram in number_grams(key):
+                grams.setdefault(gram, []).append(doc)
+
+    operator_grams: dict[str, list[int]] = {}
+    description_grams: dict[str, list[int]] = {}
+
+    for operator, operator_id in operators.items():
+        add_postings(operator_grams, operator.lower(), operator_id)
+
+    for description, description_id in descriptions.items():
+        add_postings(description_grams, description.lower(), description_id)
+
+    numbers.sort()
+
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "generated": generated,
+        "count": len(docs),
+        "docs": docs,
+        "operators": list(operators),
+        "descriptions": list(descriptions),
+        "numbers": numbers,
+        "number_grams": {gram: grams[gram] for gram in sorted(grams)},
+        "operator_grams": {gram: operator_grams[gram] for gram in sorted(operator_grams)},
+        "description_grams": {gram: description_grams[gram] for gram in sorted(description_grams)},
+    }
+
+
+# ============================================================
+# Load / query (app side)
+# ============================================================
+
+def load_search_index(path: Path) -> dict[str, Any] | None:
+    """
+    Loads the index and adds the lookup tables search() needs.
+    Returns None if the file is missing or from another version.
+    """
+    try:
+        index = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or index.get("version") != SEARCH_INDEX_VERSION:
+        return None
+
+    operator_docs: dict[int, list[int]] = {}
+    description_docs: dict[int, list[int]] = {}
+
+    for doc, row in enumerate(index["docs"]):
+        operator_docs.setdefault(row[1], []).append(doc)
+        description_docs.setdefault(row[2], []).append(doc)
+
+    index["_number_keys"] = [key for key, _doc in index["numbers"]]
+    index["_number_gram_counts"] = [len(number_grams(search_key(row[0]))) for row in index["docs"]]
+    index["_operator_docs"] = operator_docs
+    index["_description_docs"] = description_docs
+
+    return index
+
+
+def text_value_ids(grams: dict[str, list[int]], values: list[str], term: str) -> list[int]:
+    """
+    Ids of the dictionary values containing term (case-insensitive).
+    """
+    term_grams = trigrams(term)
+
+    if term_grams:
+        postings = sorted((grams.get(gram, []) for gram in term_grams), key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+    else:
+        candidates = range(len(values))
+
+    return [value_id for value_id in sorted(candidates) if term in values[value_id].lower()]
+
+
+def search(index: dict[str, Any], query: str, fuzzy: bool = True) -> list[tuple[int, str]]:
+    """
+    Returns [(doc, match)] ordered exact, prefix, text, fuzzy; each
+    group in loco order (fuzzy by score).
+    """
+    key = search_key(query)
+    term = str(query or "").strip().lower()
+    matches: dict[int, str] = {}
+
+    if key:
+        keys = index["_number_keys"]
+        start = bisect.bisect_left(keys, key)
+        end = start
+
+        while end < len(keys) and keys[end].startswith(key):
+            doc = index["numbers"][end][1]
+            matches[doc] = "exact" if keys[end] == key else "prefix"
+            end += 1
+
+    if term:
+        for value_id in text_value_ids(index["operator_grams"], index["operators"], term):
+            for doc in index["_operator_docs"].get(value_id, []):
+                matches.setdefault(doc, "text")
+
+        for value_id in text_value_ids(index["description_grams"], index["descriptions"], term):
+            for doc in index["_description_docs"].get(value_id, []):
+                matches.setdefault(doc, "text")
+
+    fuzzy_scores: dict[int, float] = {}
+
+    if fuzzy and key:
+        query_grams = number_grams(key)
+        overlap: dict[int, int] = {}
+
+        for gram in query_grams:
+            for doc in index["number_grams"].get(gram, []):
+                overlap[doc] = overlap.get(doc, 0) + 1
+
+        for doc, shared in overlap.items():
+            if doc in matches:
+                continue
+
+            doc_grams = index["_number_gram_counts"][doc]
+            score = shared / (len(query_grams) + doc_grams - shared)
+
+            if score >= FUZZY_MIN_SCORE:
+                fuzzy_scores[doc] = score
+
+    ranked = sorted(matches.items(), key=lambda item: (MATCH_ORDER.index(item[1]), item[0]))
+    ranked += [
+        (doc, "fuzzy")
+        for doc in sorted(fuzzy_scores, key=lambda doc: (-fuzzy_scores[doc], doc))
+    ]
+
+    return ranked
+
+
+def doc_result(index: dict[str, Any], doc: int, match: str) -> dict[str, Any]:
+    loco_number, operator_id, description_id, train_id, added = index["docs"][doc]
+
+    return {
+        "loco_number": loco_number,
+        "current_operator": index["operators"][operator_id],
+        "vehicle_description": index["descriptions"][description_id],
+        "train_id": train_id,
+        "date_time_added": added,
+        "match": match,
+    }
@@ -0,0 +1,263 @@
+import json
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any
+
+
+# ============================================================
+# RailOps SQLite loco store
+#
+# Optional master store for railops_loco_database.py
+# (LOCO_STORE=sqlite). One row per loco, keyed by the normalised loco
+# number, with the full record kept as JSON. locos.json, loco_export.csv
+# and the HTML/XLSX downloads stay as views generated from it.
+#
+# One-off migration from the existing locos.json:
+#   python loco_store.py import
+#   python loco_store.py import path/to/locos.json
+# ============================================================
+
+
+BASE_DIR = Path(__file__).resolve().parent
+
+LOCO_STORE_DB = BASE_DIR / "locos.db"
+LOCOS_FILE = BASE_DIR / "locos.json"
+
+
+# ============================================================
+# Database setup
+# ============================================================
+
+def get_store(path: Path = LOCO_STORE_DB) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def init_store(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS locos (
+            loco_key TEXT PRIMARY KEY,
+            loco_number TEXT NOT NULL,
+            current_operator TEXT,
+            vehicle_description TEXT,
+            date_time_added TEXT,
+            last_seen TEXT,
+            record TEXT NOT NULL
+        )
+    """)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_locos_operator ON locos (current_operator)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_locos_date_time_added ON locos (date_time_added)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_locos_last_seen ON locos (last_seen)")
+    conn.commit()
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def clean_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def loco_key(value: Any) -> str:
+    """
+    Same normalisation as railops_loco_database.norm_key().
+    """
+    text = clean_text(value).upper()
+    text = re.sub(r"\s+", "", text)
+    return text.replace("-", "")
+
+
+def record_loco_number(record: dict[str, Any]) -> str:
+    for key in ["loco_number", "Loco Number", "number", "loco", "id"]:
+        value = record.get(key)
+        if value not in [None, ""]:
+            return clean_text(value)
+    return ""
+
+
+def encode_record(record: dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+
+# ============================================================
+# Read / write
+# ============================================================
+
+def count_locos(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM locos").fetchone()[0]
+
+
+def load_rows(conn: sqlite3.Connection) -> dict[str, str]:
+    """
+    {loco_key: encoded record}. Pass it back to upsert_records() so a run
+    reads the table once.
+    """
+    return {row["loco_key"]: row["record"] for row in conn.execute("SELECT loco_key, record FROM locos")}
+
+
+def load_records(conn: sqlite3.Connection, rows: dict[str, str] | None = None) -> list[dict[str, Any]]:
+    if rows is None:
+        rows = load_rows(conn)
+    return [json.loads(record) for record in rows.values()]
+
+
+def upsert_records(
+    conn: sqlite3.Connection,
+    records: list[dict[str, Any]],
+    stored: dict[str, str] | None = None,
+) -> dict[str, int]:
+    """
+    Writes only the rows whose record changed, in one transaction.
+    stored is load_rows() from earlier in the run; it is updated in
+    place. Without it the table is read here.
+    """
+    if stored is None:
+        stored = load_rows(conn)
+
+    added = 0
+    updated = 0
+    unchanged = 0
+    changed_rows = []
+
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+
+        loco_number = record_loco_number(record)
+        key = loco_key(loco_number)
+
+        if not key:
+            continue
+
+        encoded = encode_record(record)
+        previous = stored.get(key)
+
+        if previous == encoded:
+            unchanged += 1
+            continue
+
+        if previous is None:
+            added += 1
+        else:
+            updated += 1
+
+        stored[key] = encoded
+        changed_rows.append(
+            (
+                key,
+                loco_number,
+                clean_text(record.get("current_operator")),
+                clean_text(record.get("vehicle_description")),
+                clean_text(record.get("date_time_added")),
+                clean_text(record.get("last_seen")),
+                encoded,
+            )
+        )
+
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO locos (
+                loco_key,
+                loco_number,
+                current_operator,
+                vehicle_description,
+                date_time_added,
+                last_seen,
+                record
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(loco_key) DO UPDATE SET
+                loco_number = excluded.loco_number,
+                current_operator = excluded.current_operator,
+                vehicle_description = excluded.vehicle_description,
+                date_time_added = excluded.date_time_added,
+                last_seen = excluded.last_seen,
+                record = excluded.record
+            """,
+            changed_rows,
+        )
+
+    return {
+        "added": added,
+        "updated": updated,
+        "unchanged": unchanged,
+    }
+
+
+def records_from_payload(payload: Any) -> list[dict[str, Any]]:
+    """
+    Loco records from any locos.json shape: a list, {"locos": [...]}
+    (or "items" / "data"), or the dict keyed by loco number that
+    update_locos.py used to write.
+    """
+    if isinstance(payload, list):
+        return payload
+
+    if isinstance(payload, dict):
+        for key in ["locos", "items", "data"]:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+
+        if payload and all(isinstance(value, dict) for value in payload.values()):
+            return [
+                {
+                    "loco_number": loco_number,
+                    "current_operator": clean_text(data.get("current_operator")),
+                    "vehicle_description": clean_text(data.get("vehicle_description") or data.get("last_description")),
+                    "train_id": clean_text(data.get("last_train_number")),
+                    "date_time_added": data.get("date_time_added") or data.get("first_seen") or "",
+                    "last_seen": data.get("last_seen") or "",
+                    "source": "trains.json",
+                }
+                for loco_number, data in payload.items()
+            ]
+
+    return []
+
+
+def import_locos_json(conn: sqlite3.Connection, path: Path = LOCOS_FILE) -> dict[str, int]:
+    if not path.exists():
+        return {"added": 0, "updated": 0, "unchanged": 0}
+
+    payload = json.loads(path.read_text(encoding="utf-8"))
+
+    return upsert_records(conn, records_from_payload(payload))
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main(argv: list[str]) -> int:
+    if not argv or argv[0] != "import":
+        print("Usage: python loco_store.py import [locos.json]")
+        return 2
+
+    source = Path(argv[1]) if len(argv) > 1 else LOCOS_FILE
+
+    conn = get_store()
+    try:
+        init_store(conn)
+        stats = import_locos_json(conn, source)
+        total = count_locos(conn)
+    finally:
+        conn.close()
+
+    print(f"Imported {source} into {LOCO_STORE_DB}")
+    print(json.dumps(stats, indent=2))
+    print(f"Locos in store: {total}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
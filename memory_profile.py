@@ -0,0 +1,157 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+
+# ============================================================
+# RailOps memory profiling mode
+#
+# Any generator entry point wrapped with run() can be started with
+# --profile-memory (or PROFILE_MEMORY=true). It then runs under
+# tracemalloc and writes a JSON artefact with:
+# - peak/current memory per stage (stages are marked with mark())
+# - the top allocation sites at the end of each stage and of the run
+#
+# Artefacts go to logs/ unless MEMORY_PROFILE_DIR is set.
+# ============================================================
+
+
+BASE_DIR = Path(__file__).resolve().parent
+
+PROFILE_FLAG = "--profile-memory"
+PROFILE_DIR = Path(os.getenv("MEMORY_PROFILE_DIR", str(BASE_DIR / "logs")))
+TOP_SITES = int(os.getenv("MEMORY_PROFILE_TOP", "10"))
+
+_state: dict[str, Any] = {}
+
+
+def requested(argv: list[str] | None = None) -> bool:
+    argv = sys.argv[1:] if argv is None else argv
+    env = os.getenv("PROFILE_MEMORY", "false").strip().lower() == "true"
+    return env or PROFILE_FLAG in argv
+
+
+def top_sites(limit: int = TOP_SITES) -> list[dict[str, Any]]:
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+    sites = []
+
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        sites.append(
+            {
+                "file": frame.filename,
+                "line": frame.lineno,
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+        )
+
+    return sites
+
+
+def _close_stage() -> None:
+    stage = _state.get("stage")
+
+    if not stage:
+        return
+
+    current, peak = tracemalloc.get_traced_memory()
+    stage.update(
+        {
+            "seconds": round(time.perf_counter() - stage.pop("_start"), 4),
+            "current_end_bytes": current,
+            "peak_bytes": peak,
+            "top_sites": top_sites(),
+        }
+    )
+
+    _state["stages"].append(stage)
+    _state["stage"] = None
+
+
+def mark(name: str) -> None:
+    """
+    Ends the current stage (if any) and starts a new one.
+    Does nothing unless profiling is active.
+    """
+    if not _state:
+        return
+
+    _close_stage()
+
+    tracemalloc.reset_peak()
+    current, _peak = tracemalloc.get_traced_memory()
+
+    _state["stage"] = {
+        "name": name,
+        "current_start_bytes": current,
+        "_start": time.perf_counter(),
+    }
+
+
+def start(name: str) -> None:
+    tracemalloc.start()
+    _state.clear()
+    _state.update(
+        {
+            "name": name,
+            "started": datetime.now(timezone.utc).isoformat(),
+            "stages": [],
+            "stage": None,
+            "_start": time.perf_counter(),
+        }
+    )
+
+
+def finish() -> Path | None:
+    if not _state:
+        return None
+
+    _close_stage()
+
+    report = {
+        "entry_point": _state["name"],
+        "started": _state["started"],
+        "finished": datetime.now(timezone.utc).isoformat(),
+        "seconds": round(time.perf_counter() - _state["_start"], 4),
+        "peak_bytes": max([stage["peak_bytes"] for stage in _state["stages"]] or [0]),
+        "stages": _state["stages"],
+        "top_sites": top_sites(),
+    }
+
+    tracemalloc.stop()
+    _state.clear()
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = PROFILE_DIR / f"memory_{report['entry_point']}_{stamp}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(f"Memory profile peak: {report['peak_bytes'] / 1024 / 1024:.1f} MB")
+    for stage in report["stages"]:
+        print(f"  {stage['name']:<20} peak {stage['peak_bytes'] / 1024 / 1024:8.1f} MB  {stage['seconds']:.2f}s")
+    print(f"Wrote memory profile: {path}")
+
+    return path
+
+
+def run(name: str, func: Callable[[], Any]) -> Any:
+    """
+    Calls func(), under tracemalloc when --profile-memory was requested.
+    """
+    if not requested():
+        return func()
+
+    start(name)
+    try:
+        return func()
+    finally:
+        finish()
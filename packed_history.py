@@ -0,0 +1,325 @@
+import base64
+import json
+import os
+import sys
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+# ============================================================
+# RailOps packed position history
+#
+# Compact storage for update_locos.py's loco_history.json.
+#
+# In memory, every loco's positions and the run "updates" list are
+# fixed-capacity ring buffers of parallel typed arrays:
+#   positions: epoch (int64), lat*1e6, lon*1e6, speed*10 (int32)
+#   updates:   epoch, trains_seen, locos_seen, blocked_skipped
+# Appending past capacity overwrites the oldest entry, so there is no
+# list slicing.
+#
+# On disk ("packed" format) each column is written oldest-first as
+# little-endian bytes in base64, in one compact JSON document.
+#
+# load_history() also reads the legacy shape:
+#   {"locos": {id: [{"timestamp", "lat", "lon", "speed"}]}, "updates": [...]}
+# and save_history(..., "json") writes it back, for consumers that still
+# expect it.
+# ============================================================
+
+
+PACKED_FORMAT = "railops-packed-history-v1"
+
+POSITION_CAPACITY = 100
+UPDATE_CAPACITY = 1000
+
+POSITION_COLUMNS = {"epoch": "q", "lat": "i", "lon": "i", "speed": "i"}
+UPDATE_COLUMNS = {"epoch": "q", "trains_seen": "i", "locos_seen": "i", "blocked_skipped": "i"}
+
+# Stored for missing lat/lon values. Scaled values outside the int32
+# range above it are stored as missing too.
+MISSING = -(2 ** 31)
+INT32_MAX = 2 ** 31 - 1
+
+COORD_SCALE = 1_000_000
+SPEED_SCALE = 10
+
+
+# ============================================================
+# Ring buffers
+# ============================================================
+
+def new_ring(columns: Dict[str, str], capacity: int) -> Dict[str, Any]:
+    return {
+        "capacity": capacity,
+        "head": 0,
+        "columns": {name: array(code) for name, code in columns.items()},
+    }
+
+
+def ring_len(ring: Dict[str, Any]) -> int:
+    return len(next(iter(ring["columns"].values())))
+
+
+def ring_append(ring: Dict[str, Any], values: Dict[str, int]) -> None:
+    """
+    Appends one entry. Once full, overwrites the oldest entry in place.
+    """
+    if ring_len(ring) < ring["capacity"]:
+        for name, column in ring["columns"].items():
+            column.append(values[name])
+        return
+
+    head = ring["head"]
+
+    for name, column in ring["columns"].items():
+        column[head] = values[name]
+
+    ring["head"] = (head + 1) % ring["capacity"]
+
+
+def ring_rows(ring: Dict[str, Any]) -> List[Dict[str, int]]:
+    """
+    Entries oldest first.
+    """
+    names = list(ring["columns"])
+    count = ring_len(ring)
+    head = ring["head"] if count == ring["capacity"] else 0
+
+    return [
+        {name: ring["columns"][name][(head + offset) % count] for name in names}
+        for offset in range(count)
+    ]
+
+
+def ring_ordered_columns(ring: Dict[str, Any]) -> Dict[str, array]:
+    head = ring["head"]
+
+    if not head:
+        return ring["columns"]
+
+    return {
+        name: column[head:] + column[:head]
+        for name, column in ring["columns"].items()
+    }
+
+
+def encode_ring(ring: Dict[str, Any]) -> Dict[str, Any]:
+    encoded = {"n": ring_len(ring)}
+
+    for name, column in ring_ordered_columns(ring).items():
+        if sys.byteorder != "little":
+            column = array(column.typecode, column)
+            column.byteswap()
+        encoded[name] = base64.b64encode(column.tobytes()).decode("ascii")
+
+    return encoded
+
+
+def decode_ring(encoded: Dict[str, Any], columns: Dict[str, str], capacity: int) -> Dict[str, Any]:
+    ring = new_ring(columns, capacity)
+
+    for name, column in ring["columns"].items():
+        column.frombytes(base64.b64decode(encoded.get(name, "")))
+
+        if sys.byteorder != "little":
+            column.byteswap()
+
+    count = min(ring_len(ring), capacity)
+
+    # Keep the newest entries if the capacity was lowered.
+    for name, column in ring["columns"].items():
+        del column[:len(column) - count]
+
+    return ring
+
+
+# ============================================================
+# Value conversion
+# ============================================================
+
+def to_epoch(value: Any) -> int:
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return 0
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return int(parsed.timestamp())
+
+
+def epoch_to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def scale(value: Any, factor: int, missing: int) -> int:
+    try:
+        scaled = round(float(value) * factor)
+    except (TypeError, ValueError, OverflowError):
+        return missing
+
+    if not MISSING < scaled <= INT32_MAX:
+        return missing
+
+    return scaled
+
+
+def unscale(value: int, factor: int, missing: Optional[Any]) -> Any:
+    if value == MISSING:
+        return missing
+
+    number = value / factor
+    return int(number) if number.is_integer() else number
+
+
+def position_values(epoch: int, lat: Any, lon: Any, speed: Any) -> Dict[str, int]:
+    return {
+        "epoch": int(epoch),
+        "lat": scale(lat, COORD_SCALE, MISSING),
+        "lon": scale(lon, COORD_SCALE, MISSING),
+        "speed": scale(speed, SPEED_SCALE, 0),
+    }
+
+
+# ============================================================
+# History
+# ============================================================
+
+def new_history() -> Dict[str, Any]:
+    return {"locos": {}, "updates": new_ring(UPDATE_COLUMNS, UPDATE_CAPACITY)}
+
+
+def append_position(history: Dict[str, Any], loco_id: str, epoch: int, lat: Any, lon: Any, speed: Any) -> None:
+    ring = history["locos"].get(loco_id)
+
+    if ring is None:
+        ring = history["locos"][loco_id] = new_ring(POSITION_COLUMNS, POSITION_CAPACITY)
+
+    ring_append(ring, position_values(epoch, lat, lon, speed))
+
+
+def append_update(history: Dict[str, Any], epoch: int, trains_seen: int, locos_seen: int, blocked_skipped: int) -> None:
+    ring_append(
+        history["updates"],
+        {
+            "epoch": int(epoch),
+            "trains_seen": int(trains_seen),
+            "locos_seen": int(locos_seen),
+            "blocked_skipped": int(blocked_skipped),
+        },
+    )
+
+
+def history_from_legacy(payload: Dict[str, Any]) -> Dict[str, Any]:
+    history = new_history()
+    locos = payload.get("locos") if isinstance(payload.get("locos"), dict) else {}
+    updates = payload.get("updates") if isinstance(payload.get("updates"), list) else []
+
+    for loco_id, entries in locos.items():
+        if not isinstance(entries, list):
+            continue
+
+        for entry in entries[-POSITION_CAPACITY:]:
+            if isinstance(entry, dict):
+                append_position(
+                    history,
+                    loco_id,
+                    to_epoch(entry.get("timestamp")),
+                    entry.get("lat"),
+                    entry.get("lon"),
+                    entry.get("speed", 0),
+                )
+
+    for entry in updates[-UPDATE_CAPACITY:]:
+        if isinstance(entry, dict):
+            append_update(
+                history,
+                to_epoch(entry.get("timestamp")),
+                scale(entry.get("trains_seen"), 1, 0),
+                scale(entry.get("locos_seen"), 1, 0),
+                scale(entry.get("blocked_skipped"), 1, 0),
+            )
+
+    return history
+
+
+def history_to_legacy(history: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "locos": {
+            loco_id: [
+                {
+                    "timestamp": epoch_to_iso(row["epoch"]),
+                    "lat": unscale(row["lat"], COORD_SCALE, None),
+                    "lon": unscale(row["lon"], COORD_SCALE, None),
+                    "speed": unscale(row["speed"], SPEED_SCALE, 0),
+                }
+                for row in ring_rows(ring)
+            ]
+            for loco_id, ring in history["locos"].items()
+        },
+        "updates": [
+            {
+                "timestamp": epoch_to_iso(row["epoch"]),
+                "trains_seen": row["trains_seen"],
+                "locos_seen": row["locos_seen"],
+                "blocked_skipped": row["blocked_skipped"],
+            }
+            for row in ring_rows(history["updates"])
+        ],
+    }
+
+
+def load_history(filename: str) -> Dict[str, Any]:
+    """
+    Reads packed or legacy JSON history. Anything else gives an empty history.
+    """
+    if not os.path.exists(filename):
+        return new_history()
+
+    try:
+        with open(filename, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+    except Exception as e:
+        print(f"❌ Failed to load {filename}: {e}")
+        return new_history()
+
+    if not isinstance(payload, dict):
+        return new_history()
+
+    if payload.get("format") != PACKED_FORMAT:
+        return history_from_legacy(payload)
+
+    history = new_history()
+    history["updates"] = decode_ring(payload.get("updates", {}), UPDATE_COLUMNS, UPDATE_CAPACITY)
+
+    for loco_id, encoded in (payload.get("locos") or {}).items():
+        history["locos"][loco_id] = decode_ring(encoded, POSITION_COLUMNS, POSITION_CAPACITY)
+
+    return history
+
+
+def save_history(filename: str, history: Dict[str, Any], history_format: str = "packed") -> None:
+    if history_format == "json":
+        payload = history_to_legacy(history)
+        text = json.dumps(payload, indent=2, ensure_ascii=False)
+    else:
+        payload = {
+            "format": PACKED_FORMAT,
+            "coord_scale": COORD_SCALE,
+            "speed_scale": SPEED_SCALE,
+            "updates": encode_ring(history["updates"]),
+            "locos": {
+                loco_id: encode_ring(ring)
+                for loco_id, ring in history["locos"].items()
+            },
+        }
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(text)
+    except Exception as e:
+        print(f"❌ Failed to save {filename}: {e}")
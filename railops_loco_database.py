@@ -1,16 +1,29 @@
 import csv
 import fnmatch
+import hashlib
+import heapq
 import html
 import json
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+import loco_index
+import loco_search
+import loco_store
+import memory_profile
+import sighting_log
+import train_partition
 
 try:
     from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
     from openpyxl.utils import get_column_letter
 except ImportError:
     Workbook = None
@@ -50,8 +63,47 @@ LOCO_NUMBERS_ONLY_HTML = DOWNLOADS_DIR / "loco_numbers_only.html"
 LOCO_DATABASE_XLSX = DOWNLOADS_DIR / "loco_database.xlsx"
 LOCO_NUMBERS_ONLY_XLSX = DOWNLOADS_DIR / "loco_numbers_only.xlsx"
 
+# Prebuilt index for app.py's /api/locos/search.
+LOCO_SEARCH_INDEX = DOWNLOADS_DIR / "loco_search_index.json"
+
+# Per-operator / per-class / per-month split pages and their index.
+PARTITIONS_DIR = DOWNLOADS_DIR / "partitions"
+LOCO_PARTITIONS_HTML = DOWNLOADS_DIR / "loco_partitions.html"
+
 BLOCKLIST_FILE = BASE_DIR / "blocklist.json"
 
+# Per-loco blocklist results from the last run, so unchanged locos are not
+# re-matched and a blocklist edit only matches the added patterns.
+BLOCKLIST_STATE_FILE = BASE_DIR / "blocklist_state.json"
+BLOCKLIST_STATE_VERSION = 1
+
+LOCO_OUTPUT_MANIFEST = BASE_DIR / "loco_outputs_manifest.json"
+
+# "json" keeps locos.json as the master database (default).
+# "sqlite" keeps the master in locos.db and writes locos.json as a view.
+LOCO_STORE_MODE = os.getenv("LOCO_STORE", "json").strip().lower()
+LOCO_STORE_DB = BASE_DIR / "locos.db"
+
+# Also append every accepted sighting to the compact log in sightings/.
+LOCO_SIGHTING_LOG = os.getenv("LOCO_SIGHTING_LOG", "true").strip().lower() == "true"
+
+# Outputs whose rendered fields are unchanged are still rebuilt once they
+# are this old, as a backstop against a template change without a
+# manifest version bump. 0 means only rebuild when the content changes.
+LOCO_OUTPUT_MAX_AGE_MINUTES = int(os.getenv("LOCO_OUTPUT_MAX_AGE_MINUTES", "360"))
+
+# "static" renders every row server-side (default).
+# "virtual" ships a JSON payload and renders only the rows on screen
+# (experimental; see generate_virtual_database_html).
+LOCO_DATABASE_HTML_MODE = os.getenv("LOCO_DATABASE_HTML_MODE", "static").strip().lower()
+
+# "write_only" streams both workbooks with shared named styles (default).
+# "classic" builds full in-memory workbooks and styles them afterwards.
+LOCO_XLSX_MODE = os.getenv("LOCO_XLSX_MODE", "write_only").strip().lower()
+
+# Also write the split pages under static/downloads/partitions/.
+LOCO_PARTITIONS = os.getenv("LOCO_PARTITIONS", "true").strip().lower() == "true"
+
 
 # ============================================================
 # Basic helpers
@@ -62,7 +114,9 @@ def utc_now() -> datetime:
 
 
 def iso_now() -> str:
-    return utc_now().isoformat().replace("+00:00", "Z")
+    # Always with microseconds, so every timestamp is the same width and
+    # refresh_generated_time() can patch pages in place.
+    return utc_now().isoformat(timespec="microseconds").replace("+00:00", "Z")
 
 
 def ensure_dirs() -> None:
@@ -187,29 +241,92 @@ def display_loco_number(value: Any) -> str:
     return text
 
 
-def parse_date_sort(value: Any) -> datetime:
+DATE_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+    "%d %b %Y %H:%M",
+    "%d %b %Y at %I:%M %p",
+]
+
+
+def parse_date_value(value: Any) -> datetime | None:
+    """
+    Parses ISO and the legacy formats (e.g. '%d/%m/%Y %H:%M:%S' from
+    update_trains.py). Values without a timezone are treated as UTC.
+    """
     text = norm_text(value)
 
     if not text:
-        return datetime(1970, 1, 1, tzinfo=timezone.utc)
+        return None
 
     try:
-        return datetime.fromisoformat(text.replace("Z", "+00:00"))
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
     except Exception:
-        pass
+        parsed = None
 
-    for fmt in [
-        "%Y-%m-%d %H:%M:%S",
-        "%d/%m/%Y %H:%M:%S",
-        "%d %b %Y %H:%M",
-        "%d %b %Y at %I:%M %p",
-    ]:
-        try:
-            return datetime.strptime(text, fmt).replace(tzinfo=timezone.utc)
-        except Exception:
-            pass
+    if parsed is None:
+        for fmt in DATE_FORMATS:
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except Exception:
+                pass
+
+    if parsed is None:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+def parse_date_sort(value: Any) -> datetime:
+    return parse_date_value(value) or datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def iso_z(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def normalise_record_dates(record: dict[str, Any]) -> None:
+    """
+    One-off migration for a stored loco record: rewrites date_time_added
+    and last_seen as ISO-Z and adds integer *_epoch fields next to them.
+    Records that already carry the epochs are left alone, so legacy
+    values are only parsed once.
+    """
+    for field in ["date_time_added", "last_seen"]:
+        epoch_field = f"{field}_epoch"
+
+        if isinstance(record.get(epoch_field), int):
+            continue
+
+        if field == "date_time_added":
+            text = preferred_existing_date(record)
+        else:
+            text = norm_text(record.get(field))
+
+        if not text:
+            continue
+
+        parsed = parse_date_value(text)
+
+        if parsed is None:
+            record[epoch_field] = 0
+            continue
 
-    return datetime(1970, 1, 1, tzinfo=timezone.utc)
+        record[field] = iso_z(parsed)
+        record[epoch_field] = int(parsed.timestamp())
+
+
+def added_epoch(loco: dict[str, Any]) -> int:
+    epoch = loco.get("date_time_added_epoch")
+
+    if isinstance(epoch, int):
+        return epoch
+
+    return int(parse_date_sort(loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"])).timestamp())
 
 
 def html_local_time(value: Any) -> str:
@@ -269,17 +386,7 @@ def load_trains_payload() -> dict[str, Any]:
 
 
 def load_existing_locos() -> list[dict[str, Any]]:
-    payload = load_json(LOCOS_FILE, [])
-
-    if isinstance(payload, list):
-        return payload
-
-    if isinstance(payload, dict):
-        for key in ["locos", "items", "data"]:
-            if isinstance(payload.get(key), list):
-                return payload[key]
-
-    return []
+    return loco_store.records_from_payload(load_json(LOCOS_FILE, []))
 
 
 def load_blocklist() -> dict[str, list[str]]:
@@ -306,50 +413,9 @@ def load_blocklist() -> dict[str, list[str]]:
 # ============================================================
 
 def extract_loco_number(train: dict[str, Any]) -> str:
-    candidates = [
-        "loco_number",
-        "locoNumber",
-        "loco",
-        "locomotive",
-        "locomotive_number",
-        "unit",
-        "vehicle",
-        "vehicle_id",
-        "trKey",
-        "name",
-        "train_name",
-        "trainName",
-        "label",
-        "id",
-        "ID",
-    ]
-
-    raw = get_first(train, candidates)
-
-    if not raw:
-        return ""
-
-    text = raw.strip()
-
-    if "•" in text:
-        text = text.split("•", 1)[0].strip()
-
-    if "|" in text:
-        text = text.split("|", 1)[0].strip()
-
-    text = re.sub(r"^(LOCO|Loco|loco)\s*[:#-]?\s*", "", text).strip()
-
-    match = re.search(r"[A-Z]{1,8}[- ]?\d{1,5}[A-Z]?", text.upper())
-
-    if match:
-        return match.group(0).replace(" ", "").replace("-", "")
-
-    match = re.search(r"\b\d{3,6}\b", text)
-
-    if match:
-        return match.group(0)
-
-    return text.upper().replace(" ", "").replace("-", "")
+    # Shared with the partitioner, so its ignore stream and the
+    # blocked_locos rules see the same number.
+    return train_partition.extract_loco_number(train)
 
 
 def extract_train_id(train: dict[str, Any]) -> str:
@@ -438,31 +504,183 @@ def is_blocked_value(value: str, patterns: list[str], wildcard: bool = False) ->
     return False
 
 
+# blocklist.json keys, in the same order as blocklist_fields().
+BLOCKLIST_KINDS = ["blocked_locos", "blocked_routes", "blocked_descriptions", "blocked_operators"]
+
+BLOCKLIST_REASONS = {
+    "blocked_locos": "blocked_loco",
+    "blocked_routes": "blocked_route",
+    "blocked_descriptions": "blocked_description",
+    "blocked_operators": "blocked_operator",
+}
+
+
+def blocklist_fields(loco_number: str, train: dict[str, Any]) -> tuple[str, str, str, str]:
+    return (
+        loco_number,
+        extract_route_text(train),
+        extract_description(train),
+        extract_operator(train),
+    )
+
+
+def blocked_reason(fields: tuple[str, str, str, str], blocklist: dict[str, list[str]]) -> str:
+    for kind, value in zip(BLOCKLIST_KINDS, fields):
+        if is_blocked_value(value, blocklist[kind], wildcard=kind == "blocked_locos"):
+            return BLOCKLIST_REASONS[kind]
+
+    return ""
+
+
 def is_loco_blocked(
     loco_number: str,
     train: dict[str, Any],
     blocklist: dict[str, list[str]],
 ) -> tuple[bool, str]:
+    reason = blocked_reason(blocklist_fields(loco_number, train), blocklist)
+    return bool(reason), reason
 
-    if is_blocked_value(loco_number, blocklist["blocked_locos"], wildcard=True):
-        return True, "blocked_loco"
 
-    route_text = extract_route_text(train)
+def blocklist_fingerprint(fields: tuple[str, str, str, str]) -> str:
+    return hashlib.blake2b("\x1f".join(fields).encode("utf-8"), digest_size=8).hexdigest()
 
-    if is_blocked_value(route_text, blocklist["blocked_routes"]):
-        return True, "blocked_route"
 
-    description = extract_description(train)
+def blocklist_pattern_matches(kind: str, pattern: str, values: dict[int, str], indexes: dict[str, Any]) -> list[int]:
+    """
+    Ids of the values matched by one blocklist pattern, found through a
+    loco_index index instead of testing every loco.
+    """
+    if kind not in indexes:
+        if kind == "blocked_locos":
+            indexes[kind] = loco_index.build_prefix_index(values.items())
+        else:
+            indexes[kind] = loco_index.build_value_index(values.items())
 
-    if is_blocked_value(description, blocklist["blocked_descriptions"]):
-        return True, "blocked_description"
+    if kind == "blocked_locos":
+        return loco_index.wildcard_ids(indexes[kind], pattern)
 
-    operator = extract_operator(train)
+    return loco_index.value_ids(indexes[kind], lambda value: is_blocked_value(value, [pattern]))
+
+
+def apply_blocklist(
+    locos: list[dict[str, Any]],
+    blocklist: dict[str, list[str]],
+    state_path: Path | None = None,
+) -> tuple[list[str], dict[str, list[str]]]:
+    """
+    Returns the blocked reason ("" if visible) for each loco, plus the
+    loco numbers whose visibility changed since the last run:
+    {"hidden": [...], "restored": [...]}.
+
+    Locos whose blocklist fields are unchanged reuse the saved result.
+    After a blocklist edit, saved-visible locos are only matched against
+    the added patterns and saved-blocked locos are re-checked in full.
+    """
+    state_path = state_path or BLOCKLIST_STATE_FILE
+    state = load_json(state_path, {})
+
+    if not isinstance(state, dict) or state.get("version") != BLOCKLIST_STATE_VERSION:
+        state = {}
+
+    previous_blocklist = state.get("blocklist")
+    saved = state.get("records") if isinstance(previous_blocklist, dict) else None
+    saved = saved if isinstance(saved, dict) else {}
+
+    blocklist_changed = previous_blocklist != blocklist
+    added_patterns = {
+        kind: [
+            pattern
+            for pattern in blocklist[kind]
+            if pattern not in (previous_blocklist or {}).get(kind, [])
+        ]
+        for kind in BLOCKLIST_KINDS
+    }
+
+    reasons: list[str] = []
+    loco_numbers: list[str] = []
+    keys: list[str] = []
+    fingerprints: list[str] = []
+    pending: dict[int, tuple[str, str, str, str]] = {}
+
+    for position, loco in enumerate(locos):
+        loco_number = get_first(loco, ["loco_number", "Loco Number", "number", "loco", "id"])
+        key = norm_key(loco_number)
+        fields = blocklist_fields(loco_number, loco)
+        fingerprint = blocklist_fingerprint(fields)
+        entry = saved.get(key)
+
+        if (
+            isinstance(entry, list)
+            and len(entry) == 2
+            and entry[0] == fingerprint
+            and not (blocklist_changed and entry[1])
+        ):
+            reason = entry[1]
+
+            if blocklist_changed:
+                pending[position] = fields
+        else:
+            reason = blocked_reason(fields, blocklist)
+
+        loco_numbers.append(loco_number)
+        keys.append(key)
+        fingerprints.append(fingerprint)
+        reasons.append(reason)
+
+    if pending:
+        matched: set[int] = set()
+
+        for field_position, kind in enumerate(BLOCKLIST_KINDS):
+            if not added_patterns[kind]:
+                continue
+
+            values = {
+                position: fields[field_position]
+                for position, fields in pending.items()
+                if fields[field_position]
+            }
+            indexes: dict[str, Any] = {}
+
+            for pattern in added_patterns[kind]:
+                matched.update(blocklist_pattern_matches(kind, pattern, values, indexes))
 
-    if is_blocked_value(operator, blocklist["blocked_operators"]):
-        return True, "blocked_operator"
+        for position in matched:
+            reasons[position] = blocked_reason(pending[position], blocklist)
 
-    return False, ""
+    changes: dict[str, list[str]] = {"hidden": [], "restored": []}
+    records: dict[str, list[str]] = {}
+    dirty = blocklist_changed or not state
+
+    for loco_number, key, fingerprint, reason in zip(loco_numbers, keys, fingerprints, reasons):
+        if not key:
+            continue
+
+        entry = saved.get(key)
+        records[key] = [fingerprint, reason]
+
+        if entry == records[key]:
+            continue
+
+        dirty = True
+
+        if isinstance(entry, list) and len(entry) == 2 and bool(entry[1]) != bool(reason):
+            changes["hidden" if reason else "restored"].append(display_loco_number(loco_number))
+
+    if dirty or len(records) != len(saved):
+        state_path.write_text(
+            json.dumps(
+                {
+                    "version": BLOCKLIST_STATE_VERSION,
+                    "blocklist": blocklist,
+                    "records": records,
+                },
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ),
+            encoding="utf-8",
+        )
+
+    return reasons, changes
 
 
 # ============================================================
@@ -517,9 +735,16 @@ def make_loco_record_from_train(train: dict[str, Any], now_iso: str) -> dict[str
 def merge_locos(
     existing_locos: list[dict[str, Any]],
     trains: list[dict[str, Any]],
+    sightings: list[tuple] | None = None,
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], int]:
+    """
+    When a sightings list is passed, one
+    (loco, epoch, lat, lon, speed, train_id) tuple is appended to it for
+    every accepted train.
+    """
 
     now_iso = iso_now()
+    now_epoch = int(parse_date_sort(now_iso).timestamp())
     blocklist = load_blocklist()
 
     master: dict[str, dict[str, Any]] = {}
@@ -540,6 +765,8 @@ def merge_locos(
         if not preferred_existing_date(item):
             item["date_time_added"] = now_iso
 
+        normalise_record_dates(item)
+
         master[loco_key] = item
 
     new_added = []
@@ -569,6 +796,18 @@ def merge_locos(
         if not new_record:
             continue
 
+        if sightings is not None:
+            sightings.append(
+                (
+                    new_record["loco_number"],
+                    now_epoch,
+                    new_record["lat"],
+                    new_record["lon"],
+                    train.get("speed", 0),
+                    new_record["train_id"],
+                )
+            )
+
         if loco_key in master:
             existing = master[loco_key]
             original_added = preferred_existing_date(existing) or now_iso
@@ -583,9 +822,13 @@ def merge_locos(
             existing["loco_number"] = display_loco_number(existing.get("loco_number"))
             existing["date_time_added"] = original_added
             existing["last_seen"] = now_iso
+            existing["last_seen_epoch"] = now_epoch
+            normalise_record_dates(existing)
             master[loco_key] = existing
         else:
             new_record["loco_number"] = display_loco_number(new_record.get("loco_number"))
+            new_record["date_time_added_epoch"] = now_epoch
+            new_record["last_seen_epoch"] = now_epoch
             master[loco_key] = new_record
             new_added.append(new_record)
 
@@ -600,15 +843,24 @@ def merge_locos(
     return merged, new_added, seen_this_run
 
 
-def visible_locos(locos: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    blocklist = load_blocklist()
+def visible_locos(
+    locos: list[dict[str, Any]],
+    visibility_changes: dict[str, list[str]] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    When a visibility_changes dict is passed, it is filled with the loco
+    numbers hidden or restored since the last run (see apply_blocklist).
+    """
+    reasons, changes = apply_blocklist(locos, load_blocklist())
     output = []
 
-    for loco in locos:
+    if visibility_changes is not None:
+        visibility_changes.update(changes)
+
+    for loco, reason in zip(locos, reasons):
         loco_number = get_first(loco, ["loco_number", "Loco Number", "number", "loco", "id"])
-        blocked, _ = is_loco_blocked(loco_number, loco, blocklist)
 
-        if not blocked:
+        if not reason:
             loco = dict(loco)
             loco["loco_number"] = display_loco_number(loco_number)
             output.append(loco)
@@ -626,72 +878,12 @@ def visible_locos(locos: list[dict[str, Any]]) -> list[dict[str, Any]]:
 # HTML generation
 # ============================================================
 
-def browser_time_script() -> str:
-    return """
-<script>
-(function () {
-  function formatLocalTime(value) {
-    if (!value) return "";
-
-    var text = String(value).trim();
-    var iso = text;
-
-    if (iso.endsWith("Z") === false && iso.indexOf("+") === -1 && iso.indexOf("T") !== -1) {
-      iso = iso + "Z";
-    }
-
-    var date = new Date(iso);
-
-    if (isNaN(date.getTime())) {
-      return text;
-    }
-
-    return new Intl.DateTimeFormat(navigator.language || "en-AU", {
-      day: "2-digit",
-      month: "short",
-      year: "numeric",
-      hour: "numeric",
-      minute: "2-digit",
-      hour12: true,
-      timeZoneName: "short"
-    }).format(date);
-  }
-
-  function timezoneName() {
-    try {
-      return Intl.DateTimeFormat().resolvedOptions().timeZone || "local time";
-    } catch (err) {
-      return "local time";
-    }
-  }
-
-  document.querySelectorAll(".local-time").forEach(function (el) {
-    var value = el.getAttribute("data-utc");
-    el.textContent = formatLocalTime(value);
-    el.title = "Converted from UTC to your phone/browser timezone: " + timezoneName();
-  });
-
-  document.querySelectorAll(".phone-timezone").forEach(function (el) {
-    el.textContent = timezoneName();
-  });
-})();
-</script>
-"""
-
-
-def html_header(title: str, active: str, count: int, generated_utc: str, added_last_update: int = 0) -> str:
-    def button(label: str, href: str, is_active: bool = False) -> str:
-        cls = "btn active" if is_active else "btn"
-        return f'<a class="{cls}" href="{href}">{html.escape(label)}</a>'
+HTML_WRITE_BUFFER = 1024 * 64
 
-    return f"""<!doctype html>
-<html lang="en">
-<head>
-<meta charset="utf-8">
-<meta name="viewport" content="width=device-width, initial-scale=1">
-<title>{esc(title)}</title>
-<style>
-:root {{
+# The page CSS never changes between runs or pages, so it is built once here
+# instead of inside every html_header() call.
+HTML_STYLE = """<style>
+:root {
   color-scheme: dark;
   --bg:#071222;
   --panel:#102039;
@@ -703,36 +895,36 @@ def html_header(title: str, active: str, count: int, generated_utc: str, added_l
   --pill:#123f68;
   --good:#113f2d;
   --goodline:#2f8f61;
-}}
-* {{ box-sizing:border-box; }}
-html, body {{
+}
+* { box-sizing:border-box; }
+html, body {
   margin:0;
   padding:0;
   background:var(--bg);
   color:var(--text);
   font-family:-apple-system,BlinkMacSystemFont,"Segoe UI",Roboto,Arial,sans-serif;
-}}
-body {{ padding:24px; }}
-.card {{
+}
+body { padding:24px; }
+.card {
   background:linear-gradient(180deg,var(--panel),var(--panel2));
   border:1px solid var(--line);
   border-radius:18px;
   padding:22px;
   margin-bottom:22px;
   box-shadow:0 12px 30px rgba(0,0,0,.25);
-}}
-h1 {{
+}
+h1 {
   font-size:34px;
   line-height:1.1;
   margin:0 0 12px;
-}}
-.subtitle {{
+}
+.subtitle {
   color:var(--muted);
   font-size:22px;
   line-height:1.35;
   margin-bottom:18px;
-}}
-.pill {{
+}
+.pill {
   display:inline-block;
   background:var(--pill);
   border:1px solid #28557f;
@@ -740,23 +932,23 @@ h1 {{
   border-radius:999px;
   margin:4px 8px 10px 0;
   font-size:18px;
-}}
-.pill.good {{
+}
+.pill.good {
   background:var(--good);
   border-color:var(--goodline);
-}}
-.small-note {{
+}
+.small-note {
   color:var(--muted);
   font-size:15px;
   margin-top:4px;
-}}
-.nav {{
+}
+.nav {
   display:flex;
   flex-wrap:wrap;
   gap:12px;
   margin-top:12px;
-}}
-.btn {{
+}
+.btn {
   display:inline-block;
   text-decoration:none;
   color:var(--text);
@@ -765,58 +957,138 @@ h1 {{
   padding:14px 20px;
   font-size:20px;
   background:#081426;
-}}
-.btn.active {{
+}
+.btn.active {
   background:var(--accent);
   color:#03101d;
   font-weight:800;
-}}
-.table-wrap {{
+}
+.table-wrap {
   overflow-x:auto;
   border:1px solid var(--line);
   border-radius:18px;
-}}
-table {{
+}
+table {
   width:100%;
   min-width:900px;
   border-collapse:collapse;
   background:#0d1b31;
-}}
-th, td {{
+}
+th, td {
   border-bottom:1px solid var(--line);
   padding:16px;
   text-align:left;
   vertical-align:top;
   font-size:18px;
-}}
-th {{
+}
+th {
   font-size:20px;
   background:#10213b;
   position:sticky;
   top:0;
   z-index:2;
-}}
-td.muted {{ color:var(--muted); }}
-.raw {{ color:var(--muted); font-size:15px; margin-top:6px; }}
-.numbers {{
+}
+td.muted { color:var(--muted); }
+.raw { color:var(--muted); font-size:15px; margin-top:6px; }
+.numbers {
   columns:5 130px;
   column-gap:32px;
   font-size:20px;
   line-height:1.9;
-}}
-.number-item {{
+}
+.number-item {
   break-inside:avoid;
   border-bottom:1px solid rgba(255,255,255,.08);
-}}
-@media (max-width:700px) {{
-  body {{ padding:14px; }}
-  h1 {{ font-size:28px; }}
-  .subtitle {{ font-size:20px; }}
-  th, td {{ font-size:17px; padding:14px; }}
-  .btn {{ font-size:18px; }}
-}}
+}
+@media (max-width:700px) {
+  body { padding:14px; }
+  h1 { font-size:28px; }
+  .subtitle { font-size:20px; }
+  th, td { font-size:17px; padding:14px; }
+  .btn { font-size:18px; }
+}
 </style>
-</head>
+"""
+
+BROWSER_TIME_SCRIPT = """
+<script>
+(function () {
+  function formatLocalTime(value) {
+    if (!value) return "";
+
+    var text = String(value).trim();
+    var iso = text;
+
+    if (iso.endsWith("Z") === false && iso.indexOf("+") === -1 && iso.indexOf("T") !== -1) {
+      iso = iso + "Z";
+    }
+
+    var date = new Date(iso);
+
+    if (isNaN(date.getTime())) {
+      return text;
+    }
+
+    return new Intl.DateTimeFormat(navigator.language || "en-AU", {
+      day: "2-digit",
+      month: "short",
+      year: "numeric",
+      hour: "numeric",
+      minute: "2-digit",
+      hour12: true,
+      timeZoneName: "short"
+    }).format(date);
+  }
+
+  function timezoneName() {
+    try {
+      return Intl.DateTimeFormat().resolvedOptions().timeZone || "local time";
+    } catch (err) {
+      return "local time";
+    }
+  }
+
+  document.querySelectorAll(".local-time").forEach(function (el) {
+    var value = el.getAttribute("data-utc");
+    el.textContent = formatLocalTime(value);
+    el.title = "Converted from UTC to your phone/browser timezone: " + timezoneName();
+  });
+
+  document.querySelectorAll(".phone-timezone").forEach(function (el) {
+    el.textContent = timezoneName();
+  });
+})();
+</script>
+"""
+
+
+def browser_time_script() -> str:
+    return BROWSER_TIME_SCRIPT
+
+
+@lru_cache(maxsize=4096)
+def esc_repeated(text: str) -> str:
+    """
+    Cached html.escape for values that repeat across many rows,
+    e.g. operators and vehicle descriptions.
+    """
+    return html.escape(text)
+
+
+def html_header(title: str, active: str, count: int, generated_utc: str, added_last_update: int = 0) -> str:
+    def button(label: str, href: str, is_active: bool = False) -> str:
+        cls = "btn active" if is_active else "btn"
+        return f'<a class="{cls}" href="{href}">{html.escape(label)}</a>'
+
+    partitions_button = button("By operator / class", "loco_partitions.html", active == "partitions") if LOCO_PARTITIONS else ""
+
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{esc(title)}</title>
+{HTML_STYLE}</head>
 <body>
 <div class="card">
   <h1>{esc(title)}</h1>
@@ -831,6 +1103,7 @@ td.muted {{ color:var(--muted); }}
     {button("Full database", "loco_database.html", active == "full")}
     {button("Recently added", "recently_added.html", active == "recent")}
     {button("Numbers only", "loco_numbers_only.html", active == "numbers")}
+    {partitions_button}
     {button("Download workbook", "loco_database.xlsx")}
     {button("Download numbers workbook", "loco_numbers_only.xlsx")}
   </div>
@@ -839,21 +1112,35 @@ td.muted {{ color:var(--muted); }}
 
 
 def html_footer() -> str:
-    return browser_time_script() + "\n</body></html>\n"
+    return BROWSER_TIME_SCRIPT + "\n</body></html>\n"
 
 
-def generate_database_html(
-    locos: list[dict[str, Any]],
-    generated_utc: str,
-    added_last_update: int = 0,
-) -> None:
+def write_html_stream(path: Path, head: str, rows: Iterable[str], tail: str) -> None:
+    """
+    Writes head, then each row as it is produced, then tail.
 
-    rows = []
+    Rows go straight to a buffered file handle, so the page is never held
+    in memory as one big string.
+    """
+    with path.open("w", encoding="utf-8", buffering=HTML_WRITE_BUFFER) as handle:
+        handle.write(head)
 
-    for loco in sorted(
-        locos,
-        key=lambda x: loco_sort_key(loco_value(x, ["loco_number", "Loco Number", "number", "loco"])),
-    ):
+        for index, row in enumerate(rows):
+            if index:
+                handle.write("\n")
+            handle.write(row)
+
+        handle.write(tail)
+
+
+def iter_database_rows(locos: list[dict[str, Any]], presorted: bool = False) -> Iterator[str]:
+    if not presorted:
+        locos = sorted(
+            locos,
+            key=lambda x: loco_sort_key(loco_value(x, ["loco_number", "Loco Number", "number", "loco"])),
+        )
+
+    for loco in locos:
         loco_number = loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])
         operator = loco_value(loco, ["current_operator", "Current Operator", "operator"])
         description = loco_value(loco, ["vehicle_description", "Vehicle Description", "description"])
@@ -861,20 +1148,30 @@ def generate_database_html(
         added = loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"])
         last_seen = loco_value(loco, ["last_seen", "Last Seen"])
 
-        rows.append(
-            f"""
+        yield f"""
 <tr>
   <td><strong>{esc(display_loco_number(loco_number))}</strong></td>
-  <td>{esc(operator)}</td>
-  <td>{esc(description)}</td>
+  <td>{esc_repeated(operator)}</td>
+  <td>{esc_repeated(description)}</td>
   <td>{esc(train_id)}</td>
   <td><strong>{html_local_time(added)}</strong><div class="raw">Raw UTC: {esc(added)}</div></td>
   <td>{html_local_time(last_seen)}<div class="raw">Raw UTC: {esc(last_seen)}</div></td>
 </tr>
 """
-        )
 
-    html_text = html_header(
+
+def generate_database_html(
+    locos: list[dict[str, Any]],
+    generated_utc: str,
+    added_last_update: int = 0,
+    presorted: bool = False,
+) -> None:
+    """
+    presorted=True skips the re-sort when locos already come from
+    visible_locos(), which keeps peak memory flat on large databases.
+    """
+
+    head = html_header(
         "RailOps Loco Database",
         "full",
         len(locos),
@@ -882,7 +1179,7 @@ def generate_database_html(
         added_last_update,
     )
 
-    html_text += """
+    head += """
 <div class="card table-wrap">
 <table>
 <thead>
@@ -898,54 +1195,50 @@ def generate_database_html(
 <tbody>
 """
 
-    html_text += "\n".join(rows)
-
-    html_text += """
+    tail = """
 </tbody>
 </table>
 </div>
-"""
-
-    html_text += html_footer()
-
-    LOCO_DATABASE_HTML.write_text(html_text, encoding="utf-8")
-
-
-def generate_recent_html(
-    locos: list[dict[str, Any]],
-    generated_utc: str,
-    added_last_update: int = 0,
-    limit: int = 300,
-) -> None:
+""" + html_footer()
 
-    recent = sorted(
-        locos,
-        key=lambda x: parse_date_sort(
-            loco_value(x, ["date_time_added", "Date/Time Added", "first_seen", "added"])
-        ),
-        reverse=True,
-    )[:limit]
+    write_html_stream(LOCO_DATABASE_HTML, head, iter_database_rows(locos, presorted), tail)
 
-    rows = []
 
+def iter_recent_rows(recent: list[dict[str, Any]]) -> Iterator[str]:
     for loco in recent:
         loco_number = loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])
         operator = loco_value(loco, ["current_operator", "Current Operator", "operator"])
         description = loco_value(loco, ["vehicle_description", "Vehicle Description", "description"])
         added = loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"])
 
-        rows.append(
-            f"""
+        yield f"""
 <tr>
   <td><strong>{esc(display_loco_number(loco_number))}</strong></td>
-  <td>{esc(operator)}</td>
-  <td>{esc(description)}</td>
+  <td>{esc_repeated(operator)}</td>
+  <td>{esc_repeated(description)}</td>
   <td><strong>{html_local_time(added)}</strong><div class="raw">Raw UTC: {esc(added)}</div></td>
 </tr>
 """
-        )
 
-    html_text = html_header(
+
+def select_recent_locos(locos: list[dict[str, Any]], limit: int = 300) -> list[dict[str, Any]]:
+    """
+    Top-k by date_time_added_epoch, set at merge time, instead of
+    parsing and sorting every date on every run.
+    """
+    return heapq.nlargest(limit, locos, key=added_epoch)
+
+
+def generate_recent_html(
+    locos: list[dict[str, Any]],
+    generated_utc: str,
+    added_last_update: int = 0,
+    limit: int = 300,
+) -> None:
+
+    recent = select_recent_locos(locos, limit)
+
+    head = html_header(
         "RailOps Recently Added Locos",
         "recent",
         len(locos),
@@ -953,7 +1246,7 @@ def generate_recent_html(
         added_last_update,
     )
 
-    html_text += """
+    head += """
 <div class="card table-wrap">
 <table>
 <thead>
@@ -967,17 +1260,13 @@ def generate_recent_html(
 <tbody>
 """
 
-    html_text += "\n".join(rows)
-
-    html_text += """
+    tail = """
 </tbody>
 </table>
 </div>
-"""
+""" + html_footer()
 
-    html_text += html_footer()
-
-    RECENTLY_ADDED_HTML.write_text(html_text, encoding="utf-8")
+    write_html_stream(RECENTLY_ADDED_HTML, head, iter_recent_rows(recent), tail)
 
 
 def generate_numbers_html(
@@ -995,12 +1284,12 @@ def generate_numbers_html(
         key=loco_sort_key,
     )
 
-    items = "\n".join(
+    items = (
         f'<div class="number-item">{esc(display_loco_number(number))}</div>'
         for number in numbers
     )
 
-    html_text = html_header(
+    head = html_header(
         "RailOps Loco Numbers Only",
         "numbers",
         len(locos),
@@ -1008,21 +1297,326 @@ def generate_numbers_html(
         added_last_update,
     )
 
-    html_text += f"""
+    head += """
 <div class="card">
   <div class="numbers">
-    {items}
+    """
+
+    tail = """
   </div>
 </div>
-"""
+""" + html_footer()
+
+    write_html_stream(LOCO_NUMBERS_ONLY_HTML, head, items, tail)
+
+
+# ============================================================
+# Virtual (data-driven) full database page
+#
+# LOCO_DATABASE_HTML_MODE=virtual makes loco_database.html ship the rows
+# as one compact JSON payload. The browser only builds DOM for the rows
+# on screen, and only localises times for those rows.
+#
+# Experimental: "static" stays the default until time to interactive
+# on a throttled phone has been measured against it with
+#   python -m benchmarks.loco_page_tti
+# ============================================================
+
+VIRTUAL_ROW_HEIGHT = 64
+
+VIRTUAL_TABLE_STYLE = """
+<style>
+.filters {
+  display:flex;
+  flex-wrap:wrap;
+  gap:12px;
+  margin-bottom:14px;
+}
+.filters input, .filters select {
+  flex:1 1 260px;
+  min-height:52px;
+  border-radius:14px;
+  border:1px solid var(--line);
+  background:#081426;
+  color:var(--text);
+  font-size:19px;
+  padding:10px 14px;
+}
+.vtable { min-width:900px; }
+.vhead, .vrow {
+  display:grid;
+  grid-template-columns:12% 18% 26% 12% 16% 16%;
+}
+.vhead > div {
+  font-size:20px;
+  font-weight:700;
+  background:#10213b;
+  padding:16px;
+  border-bottom:1px solid var(--line);
+}
+.vviewport {
+  position:relative;
+  height:70vh;
+  overflow-y:auto;
+  -webkit-overflow-scrolling:touch;
+}
+.vrow {
+  position:absolute;
+  left:0;
+  right:0;
+  height:__ROW_HEIGHT__px;
+  border-bottom:1px solid var(--line);
+  background:#0d1b31;
+}
+.vrow > div {
+  padding:10px 16px;
+  font-size:18px;
+  overflow:hidden;
+  text-overflow:ellipsis;
+  white-space:nowrap;
+  line-height:__ROW_HEIGHT_INNER__px;
+}
+</style>
+""".replace("__ROW_HEIGHT_INNER__", str(VIRTUAL_ROW_HEIGHT - 20)).replace("__ROW_HEIGHT__", str(VIRTUAL_ROW_HEIGHT))
+
+VIRTUAL_TABLE_SCRIPT = """
+<script>
+(function () {
+  var payload = JSON.parse(document.getElementById("loco-data").textContent);
+  var operators = payload.operators;
+  var descriptions = payload.descriptions;
+  var rows = payload.rows;
+
+  var ROW_HEIGHT = __ROW_HEIGHT__;
+  var OVERSCAN = 6;
+
+  var viewport = document.getElementById("loco-viewport");
+  var spacer = document.getElementById("loco-spacer");
+  var searchBox = document.getElementById("loco-search");
+  var operatorSelect = document.getElementById("loco-operator");
+  var countEl = document.getElementById("loco-count");
+
+  var haystack = rows.map(function (r) {
+    return (r[0] + " " + operators[r[1]] + " " + descriptions[r[2]] + " " + r[3]).toLowerCase();
+  });
+
+  var matches = [];
+  var timeCache = {};
+  var formatter = null;
+  var pending = false;
+
+  function escapeHtml(value) {
+    return String(value)
+      .replace(/&/g, "&amp;")
+      .replace(/</g, "&lt;")
+      .replace(/>/g, "&gt;")
+      .replace(/"/g, "&quot;");
+  }
+
+  function localTime(value) {
+    if (!value) return "";
+    if (Object.prototype.hasOwnProperty.call(timeCache, value)) return timeCache[value];
+
+    var iso = value;
+    if (iso.endsWith("Z") === false && iso.indexOf("+") === -1 && iso.indexOf("T") !== -1) {
+      iso = iso + "Z";
+    }
+
+    var date = new Date(iso);
+    var text = value;
+
+    if (!isNaN(date.getTime())) {
+      formatter = formatter || new Intl.DateTimeFormat(navigator.language || "en-AU", {
+        day: "2-digit",
+        month: "short",
+        year: "numeric",
+        hour: "numeric",
+        minute: "2-digit",
+        hour12: true,
+        timeZoneName: "short"
+      });
+      text = formatter.format(date);
+    }
+
+    timeCache[value] = text;
+    return text;
+  }
+
+  function cell(value, title) {
+    var safe = escapeHtml(value);
+    return "<div title=\\"" + escapeHtml(title || value) + "\\">" + safe + "</div>";
+  }
+
+  function render() {
+    pending = false;
+
+    var top = viewport.scrollTop;
+    var first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(matches.length, Math.ceil((top + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+    var out = [];
+
+    for (var i = first; i < last; i++) {
+      var r = rows[matches[i]];
+      out.push(
+        "<div class=\\"vrow\\" style=\\"top:" + (i * ROW_HEIGHT) + "px\\">" +
+        "<div><strong>" + escapeHtml(r[0]) + "</strong></div>" +
+        cell(operators[r[1]]) +
+        cell(descriptions[r[2]]) +
+        cell(r[3]) +
+        cell(localTime(r[4]), "Raw UTC: " + r[4]) +
+        cell(localTime(r[5]), "Raw UTC: " + r[5]) +
+        "</div>"
+      );
+    }
+
+    spacer.innerHTML = out.join("");
+  }
+
+  function scheduleRender() {
+    if (pending) return;
+    pending = true;
+    window.requestAnimationFrame(render);
+  }
+
+  function applyFilter() {
+    var needle = searchBox.value.trim().toLowerCase();
+    var compact = needle.replace(/[\\s-]/g, "");
+    var operator = operatorSelect.value;
+
+    matches = [];
+
+    for (var i = 0; i < rows.length; i++) {
+      if (operator !== "" && String(rows[i][1]) !== operator) continue;
+      if (needle && haystack[i].indexOf(needle) === -1 && rows[i][0].toLowerCase().indexOf(compact) === -1) continue;
+      matches.push(i);
+    }
+
+    spacer.style.height = (matches.length * ROW_HEIGHT) + "px";
+    countEl.textContent = "Showing " + matches.length + " of " + rows.length;
+    viewport.scrollTop = 0;
+    render();
+  }
 
-    html_text += html_footer()
+  operators
+    .map(function (name, index) { return [name, index]; })
+    .filter(function (pair) { return pair[0]; })
+    .sort(function (a, b) { return a[0].localeCompare(b[0]); })
+    .forEach(function (pair) {
+      var option = document.createElement("option");
+      option.value = String(pair[1]);
+      option.textContent = pair[0];
+      operatorSelect.appendChild(option);
+    });
+
+  viewport.addEventListener("scroll", scheduleRender, { passive: true });
+  window.addEventListener("resize", scheduleRender);
+  searchBox.addEventListener("input", applyFilter);
+  operatorSelect.addEventListener("change", applyFilter);
+
+  applyFilter();
+})();
+</script>
+""".replace("__ROW_HEIGHT__", str(VIRTUAL_ROW_HEIGHT))
+
+
+def virtual_database_payload(locos: list[dict[str, Any]], presorted: bool = False) -> str:
+    """
+    Compact JSON for the virtual page.
+
+    Operators and descriptions repeat a lot, so rows store an index into
+    shared lists instead of the text itself.
+    """
+    if not presorted:
+        locos = sorted(
+            locos,
+            key=lambda x: loco_sort_key(loco_value(x, ["loco_number", "Loco Number", "number", "loco"])),
+        )
+
+    operators: dict[str, int] = {}
+    descriptions: dict[str, int] = {}
+    rows = []
+
+    for loco in locos:
+        operator = loco_value(loco, ["current_operator", "Current Operator", "operator"])
+        description = loco_value(loco, ["vehicle_description", "Vehicle Description", "description"])
+
+        rows.append(
+            [
+                display_loco_number(loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])),
+                operators.setdefault(operator, len(operators)),
+                descriptions.setdefault(description, len(descriptions)),
+                loco_value(loco, ["train_id", "Train ID", "service", "route"]),
+                loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"]),
+                loco_value(loco, ["last_seen", "Last Seen"]),
+            ]
+        )
+
+    payload = {
+        "operators": list(operators),
+        "descriptions": list(descriptions),
+        "rows": rows,
+    }
+
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+    # Keep "</script>" inside a value from closing the data block early.
+    return text.replace("</", "<\\/")
+
+
+def generate_virtual_database_html(
+    locos: list[dict[str, Any]],
+    generated_utc: str,
+    added_last_update: int = 0,
+    presorted: bool = False,
+) -> None:
+    """
+    Experimental data-driven loco_database.html. Smaller to download,
+    but the table needs JavaScript and its load time is unmeasured.
+    """
 
-    LOCO_NUMBERS_ONLY_HTML.write_text(html_text, encoding="utf-8")
+    head = html_header(
+        "RailOps Loco Database",
+        "full",
+        len(locos),
+        generated_utc,
+        added_last_update,
+    )
+
+    body = f"""{VIRTUAL_TABLE_STYLE}
+<div class="card">
+  <div class="filters">
+    <input id="loco-search" type="search" placeholder="Search loco number, operator or description..." autocomplete="off">
+    <select id="loco-operator"><option value="">All operators</option></select>
+  </div>
+  <div class="small-note" id="loco-count">Loading {len(locos)} locos...</div>
+  <noscript><p>This page needs JavaScript. Use the workbook download instead.</p></noscript>
+</div>
+<div class="card table-wrap">
+<div class="vtable">
+  <div class="vhead">
+    <div>Loco Number</div>
+    <div>Current Operator</div>
+    <div>Vehicle Description</div>
+    <div>Train/Service</div>
+    <div>Date/Time Added</div>
+    <div>Last Seen</div>
+  </div>
+  <div class="vviewport" id="loco-viewport">
+    <div id="loco-spacer" style="position:relative"></div>
+  </div>
+</div>
+</div>
+<script id="loco-data" type="application/json">{virtual_database_payload(locos, presorted)}</script>
+{VIRTUAL_TABLE_SCRIPT}"""
+
+    with LOCO_DATABASE_HTML.open("w", encoding="utf-8", buffering=HTML_WRITE_BUFFER) as handle:
+        handle.write(head)
+        handle.write(body)
+        handle.write(html_footer())
 
 
 # ============================================================
-# CSV / XLSX / summary
+# CSV / XLSX / search index / summary
 # ============================================================
 
 def generate_csv(locos: list[dict[str, Any]]) -> None:
@@ -1080,59 +1674,48 @@ def style_sheet(ws) -> None:
         ws.column_dimensions[col_letter].width = max_len + 2
 
 
-def generate_xlsx(locos: list[dict[str, Any]]) -> None:
-    if Workbook is None:
-        print("openpyxl not installed. Skipping workbook generation.")
-        return
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Loco Database"
-
-    headers = [
-        "Loco Number",
-        "Current Operator",
-        "Vehicle Description",
-        "Train/Service",
-        "Route",
-        "Date/Time Added UTC",
-        "Last Seen UTC",
-        "Latitude",
-        "Longitude",
-        "Source",
+XLSX_DATABASE_HEADERS = [
+    "Loco Number",
+    "Current Operator",
+    "Vehicle Description",
+    "Train/Service",
+    "Route",
+    "Date/Time Added UTC",
+    "Last Seen UTC",
+    "Latitude",
+    "Longitude",
+    "Source",
+]
+
+XLSX_NUMBERS_HEADERS = ["Loco Number"]
+
+
+def xlsx_database_values(loco: dict[str, Any]) -> list[str]:
+    raw_loco_number = loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])
+
+    return [
+        display_loco_number(raw_loco_number),
+        loco_value(loco, ["current_operator", "Current Operator", "operator"]),
+        loco_value(loco, ["vehicle_description", "Vehicle Description", "description"]),
+        loco_value(loco, ["train_id", "Train ID", "service"]),
+        loco_value(loco, ["route"]),
+        loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"]),
+        loco_value(loco, ["last_seen", "Last Seen"]),
+        loco_value(loco, ["lat", "latitude"]),
+        loco_value(loco, ["lon", "lng", "longitude"]),
+        loco_value(loco, ["source"]),
     ]
 
-    ws.append(headers)
 
+def xlsx_database_rows(locos: list[dict[str, Any]]) -> Iterator[list[str]]:
     for loco in sorted(
         locos,
         key=lambda x: loco_sort_key(loco_value(x, ["loco_number", "Loco Number", "number", "loco"])),
     ):
-        raw_loco_number = loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])
+        yield xlsx_database_values(loco)
 
-        ws.append(
-            [
-                display_loco_number(raw_loco_number),
-                loco_value(loco, ["current_operator", "Current Operator", "operator"]),
-                loco_value(loco, ["vehicle_description", "Vehicle Description", "description"]),
-                loco_value(loco, ["train_id", "Train ID", "service"]),
-                loco_value(loco, ["route"]),
-                loco_value(loco, ["date_time_added", "Date/Time Added", "first_seen", "added"]),
-                loco_value(loco, ["last_seen", "Last Seen"]),
-                loco_value(loco, ["lat", "latitude"]),
-                loco_value(loco, ["lon", "lng", "longitude"]),
-                loco_value(loco, ["source"]),
-            ]
-        )
-
-    style_sheet(ws)
-    wb.save(LOCO_DATABASE_XLSX)
-
-    wb2 = Workbook()
-    ws2 = wb2.active
-    ws2.title = "Numbers Only"
-    ws2.append(["Loco Number"])
 
+def xlsx_number_rows(locos: list[dict[str, Any]]) -> Iterator[list[str]]:
     numbers = sorted(
         {
             loco_value(loco, ["loco_number", "Loco Number", "number", "loco"])
@@ -1143,12 +1726,156 @@ def generate_xlsx(locos: list[dict[str, Any]]) -> None:
     )
 
     for number in numbers:
-        ws2.append([display_loco_number(number)])
+        yield [display_loco_number(number)]
+
+
+def generate_xlsx_classic(locos: list[dict[str, Any]]) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Loco Database"
+    ws.append(XLSX_DATABASE_HEADERS)
+
+    for values in xlsx_database_rows(locos):
+        ws.append(values)
+
+    style_sheet(ws)
+    wb.save(LOCO_DATABASE_XLSX)
+
+    wb2 = Workbook()
+    ws2 = wb2.active
+    ws2.title = "Numbers Only"
+    ws2.append(XLSX_NUMBERS_HEADERS)
+
+    for values in xlsx_number_rows(locos):
+        ws2.append(values)
 
     style_sheet(ws2)
     wb2.save(LOCO_NUMBERS_ONLY_XLSX)
 
 
+def write_only_styles() -> tuple[NamedStyle, NamedStyle]:
+    """
+    Same look as style_sheet(), registered once per workbook as named
+    styles so every cell shares one style record.
+    """
+    thin = Side(style="thin", color="C7D3E5")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    alignment = Alignment(vertical="top", wrap_text=True)
+
+    header = NamedStyle(
+        name="railops_header",
+        font=Font(color="FFFFFF", bold=True),
+        fill=PatternFill("solid", fgColor="10213B"),
+        border=border,
+        alignment=alignment,
+    )
+    body = NamedStyle(
+        name="railops_body",
+        font=Font(color="111111"),
+        border=border,
+        alignment=alignment,
+    )
+
+    return header, body
+
+
+def xlsx_column_widths(headers: list[str], rows: Iterable[list[str]]) -> list[int]:
+    """
+    Column widths by the same rule as style_sheet(), measured without
+    keeping the rows.
+    """
+    widths = [max(10, min(len(header), 45)) for header in headers]
+
+    for values in rows:
+        for index, value in enumerate(values):
+            size = len(value)
+            if size > widths[index]:
+                widths[index] = min(size, 45)
+
+    return [width + 2 for width in widths]
+
+
+def write_only_xlsx(path: Path, title: str, headers: list[str], rows: Iterable[list[str]], widths: list[int]) -> None:
+    """
+    Streams one sheet with a write-only workbook.
+
+    Column widths have to be set before the first row is written, so
+    they come from a separate xlsx_column_widths() pass and rows go
+    straight to ws.append().
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title)
+
+    header_style, body_style = write_only_styles()
+    wb.add_named_style(header_style)
+    wb.add_named_style(body_style)
+
+    for index, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(index)].width = width
+
+    ws.freeze_panes = "A2"
+
+    def styled(value: str, style_name: str) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style_name
+        return cell
+
+    ws.append([styled(header, "railops_header") for header in headers])
+
+    for values in rows:
+        ws.append([styled(value, "railops_body") for value in values])
+
+    wb.save(path)
+
+
+def generate_xlsx_write_only(locos: list[dict[str, Any]]) -> None:
+    """
+    Builds loco_database.xlsx, then loco_numbers_only.xlsx. Widths are
+    measured on the unsorted records; only the written rows are sorted.
+    """
+    write_only_xlsx(
+        LOCO_DATABASE_XLSX,
+        "Loco Database",
+        XLSX_DATABASE_HEADERS,
+        xlsx_database_rows(locos),
+        xlsx_column_widths(XLSX_DATABASE_HEADERS, (xlsx_database_values(loco) for loco in locos)),
+    )
+
+    write_only_xlsx(
+        LOCO_NUMBERS_ONLY_XLSX,
+        "Numbers Only",
+        XLSX_NUMBERS_HEADERS,
+        xlsx_number_rows(locos),
+        xlsx_column_widths(XLSX_NUMBERS_HEADERS, xlsx_number_rows(locos)),
+    )
+
+
+def generate_xlsx(locos: list[dict[str, Any]]) -> None:
+    if Workbook is None:
+        print("openpyxl not installed. Skipping workbook generation.")
+        return
+
+    if LOCO_XLSX_MODE == "classic":
+        generate_xlsx_classic(locos)
+    else:
+        generate_xlsx_write_only(locos)
+
+
+def generate_search_index(locos: list[dict[str, Any]], generated_utc: str) -> None:
+    """
+    locos must already be in loco_sort_key order.
+    """
+    index = loco_search.build_search_index(
+        [digest_loco_fields(loco)[:SEARCH_FIELDS] for loco in locos],
+        generated_utc,
+    )
+
+    LOCO_SEARCH_INDEX.write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+
 def generate_summary(
     trains_count: int,
     existing_before: int,
@@ -1186,30 +1913,580 @@ Blocklist file: blocklist.json
     LOCO_SUMMARY_FILE.write_text(text, encoding="utf-8")
 
 
+# ============================================================
+# Output manifest
+#
+# Each output gets a hash of every field it renders, including the ones
+# that move on most scrapes (train_id, last_seen, lat/lon), so a skipped
+# output is never stale. Outputs with an unchanged hash are skipped; HTML
+# pages only get their "Generated" time patched in place.
+#
+# Pages and exports that show Last Seen are rebuilt whenever a visible
+# loco is seen again, so most runs skip only the recent, numbers and
+# search index outputs.
+# ============================================================
+
+# Bump when a template changes so every output is rebuilt once.
+OUTPUT_MANIFEST_VERSION = 2
+
+LOCO_NUMBER_KEYS = ["loco_number", "Loco Number", "number", "loco"]
+OPERATOR_KEYS = ["current_operator", "Current Operator", "operator"]
+DESCRIPTION_KEYS = ["vehicle_description", "Vehicle Description", "description"]
+ADDED_KEYS = ["date_time_added", "Date/Time Added", "first_seen", "added"]
+
+
+def load_output_manifest() -> dict[str, Any]:
+    manifest = load_json(LOCO_OUTPUT_MANIFEST, {})
+
+    if not isinstance(manifest, dict) or manifest.get("version") != OUTPUT_MANIFEST_VERSION:
+        return {"version": OUTPUT_MANIFEST_VERSION, "outputs": {}}
+
+    if not isinstance(manifest.get("outputs"), dict):
+        manifest["outputs"] = {}
+
+    return manifest
+
+
+def output_digest(header: list[Any], rows: Iterable[list[Any]]) -> str:
+    digest = hashlib.sha1()
+    digest.update(json.dumps(header, ensure_ascii=False).encode("utf-8"))
+
+    for row in rows:
+        digest.update(b"\n")
+        digest.update(json.dumps(row, ensure_ascii=False).encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+# Slices of digest_loco_fields() per kind of output.
+SEARCH_FIELDS = 5
+PAGE_FIELDS = 6
+
+
+def digest_loco_fields(loco: dict[str, Any]) -> list[str]:
+    """
+    [loco_number, operator, description, train_id, date_time_added,
+    last_seen, route, lat, lon, source]. The search index shows the
+    first SEARCH_FIELDS, the database and partition pages the first
+    PAGE_FIELDS, and the CSV/XLSX exports all of them.
+    """
+    return [
+        display_loco_number(loco_value(loco, LOCO_NUMBER_KEYS)),
+        loco_value(loco, OPERATOR_KEYS),
+        loco_value(loco, DESCRIPTION_KEYS),
+        loco_value(loco, ["train_id", "Train ID", "service", "route"]),
+        loco_value(loco, ADDED_KEYS),
+        loco_value(loco, ["last_seen", "Last Seen"]),
+        loco_value(loco, ["route"]),
+        loco_value(loco, ["lat", "latitude"]),
+        loco_value(loco, ["lon", "lng", "longitude"]),
+        loco_value(loco, ["source"]),
+    ]
+
+
+def output_digests(
+    locos: list[dict[str, Any]],
+    added_last_update: int,
+) -> dict[str, str]:
+    """
+    Hashes the render-relevant fields of the visible set per output type.
+    locos must already be in loco_sort_key order.
+    """
+    header = [len(locos), added_last_update]
+
+    # Shared by the database page, the search index and the CSV/XLSX.
+    rows = [digest_loco_fields(loco) for loco in locos]
+    table_digest = output_digest([], rows)
+
+    numbers = [
+        [display_loco_number(number)]
+        for number in sorted(
+            {loco_value(loco, LOCO_NUMBER_KEYS) for loco in locos if loco_value(loco, LOCO_NUMBER_KEYS)},
+            key=loco_sort_key,
+        )
+    ]
+
+    recent = (
+        [
+            display_loco_number(loco_value(loco, LOCO_NUMBER_KEYS)),
+            loco_value(loco, OPERATOR_KEYS),
+            loco_value(loco, DESCRIPTION_KEYS),
+            loco_value(loco, ADDED_KEYS),
+        ]
+        for loco in select_recent_locos(locos)
+    )
+
+    return {
+        "database_html": output_digest(
+            header + [LOCO_DATABASE_HTML_MODE],
+            (row[:PAGE_FIELDS] for row in rows),
+        ),
+        "recent_html": output_digest(header, recent),
+        "numbers_html": output_digest(header, numbers),
+        "csv": table_digest,
+        "xlsx": table_digest,
+        "search_index": output_digest(
+            ["search", loco_search.SEARCH_INDEX_VERSION],
+            (row[:SEARCH_FIELDS] for row in rows),
+        ),
+    }
+
+
+def output_is_current(state: dict[str, Any], digest: str, paths: list[Path], now: datetime) -> bool:
+    if state.get("hash") != digest:
+        return False
+
+    if not all(path.exists() for path in paths):
+        return False
+
+    if LOCO_OUTPUT_MAX_AGE_MINUTES > 0:
+        rendered = parse_date_sort(state.get("rendered"))
+        age_minutes = (now - rendered).total_seconds() / 60
+
+        if age_minutes >= LOCO_OUTPUT_MAX_AGE_MINUTES:
+            return False
+
+    return True
+
+
+def refresh_generated_time(path: Path, old_generated: str, new_generated: str) -> bool:
+    """
+    Patches the header's Generated time in place without re-rendering
+    the page. iso_now() values are fixed width; anything else (such as
+    a page from before that) is left for a full re-render.
+    """
+    if not old_generated or len(old_generated) != len(new_generated):
+        return False
+
+    old_span = html_local_time(old_generated).encode("utf-8")
+    new_span = html_local_time(new_generated).encode("utf-8")
+
+    try:
+        with path.open("r+b") as handle:
+            head = handle.read(HTML_WRITE_BUFFER)
+            offset = head.find(b"Generated: " + old_span)
+
+            if offset < 0:
+                return False
+
+            handle.seek(offset + len(b"Generated: "))
+            handle.write(new_span)
+    except OSError:
+        return False
+
+    return True
+
+
+def write_outputs(
+    visible: list[dict[str, Any]],
+    generated_iso: str,
+    added_last_update: int,
+) -> dict[str, str]:
+    """
+    Regenerates only the outputs whose content hash changed.
+    Returns {output name: "written" | "refreshed" | "unchanged"}.
+    """
+    manifest = load_output_manifest()
+    digests = output_digests(visible, added_last_update)
+    now = parse_date_sort(generated_iso)
+
+    def render_database_html() -> None:
+        if LOCO_DATABASE_HTML_MODE == "virtual":
+            generate_virtual_database_html(visible, generated_iso, added_last_update, presorted=True)
+        else:
+            generate_database_html(visible, generated_iso, added_last_update, presorted=True)
+
+    outputs = [
+        ("database_html", [LOCO_DATABASE_HTML], render_database_html, True),
+        ("recent_html", [RECENTLY_ADDED_HTML], lambda: generate_recent_html(visible, generated_iso, added_last_update), True),
+        ("numbers_html", [LOCO_NUMBERS_ONLY_HTML], lambda: generate_numbers_html(visible, generated_iso, added_last_update), True),
+        ("csv", [LOCO_EXPORT_FILE], lambda: generate_csv(visible), False),
+        ("xlsx", [LOCO_DATABASE_XLSX, LOCO_NUMBERS_ONLY_XLSX], lambda: generate_xlsx(visible), False),
+        ("search_index", [LOCO_SEARCH_INDEX], lambda: generate_search_index(visible, generated_iso), False),
+    ]
+
+    status = {}
+
+    for name, paths, render, has_generated_time in outputs:
+        state = manifest["outputs"].get(name, {})
+        digest = digests[name]
+
+        if output_is_current(state, digest, paths, now):
+            if has_generated_time and refresh_generated_time(paths[0], state.get("generated", ""), generated_iso):
+                state["generated"] = generated_iso
+                status[name] = "refreshed"
+            else:
+                status[name] = "unchanged"
+            continue
+
+        render()
+
+        manifest["outputs"][name] = {
+            "hash": digest,
+            "rendered": generated_iso,
+            "generated": generated_iso,
+        }
+        status[name] = "written"
+
+    save_json(LOCO_OUTPUT_MANIFEST, manifest)
+
+    return status
+
+
+# ============================================================
+# Split pages
+#
+# Secondary indexes over the visible set (by operator, by class prefix
+# and by month added) drive one small HTML + JSON page per partition in
+# static/downloads/partitions/, plus loco_partitions.html linking them.
+# Partitions are hashed like the main outputs; only changed ones are
+# re-rendered, in parallel, and pages for partitions that no longer
+# exist are removed.
+# ============================================================
+
+PARTITION_KINDS = {
+    "operator": "Operator",
+    "class": "Class",
+    "added": "Month added",
+}
+
+PARTITION_WORKERS = int(os.getenv("LOCO_PARTITION_WORKERS", "4"))
+
+
+def loco_class_prefix(loco_number: str) -> str:
+    """
+    NR82 -> NR, ACD6071 -> ACD, 3V12 -> 3V, 8201 -> Numbers
+    """
+    prefix = ""
+
+    for kind, part in natural_parts(loco_number):
+        prefix += str(part)
+
+        if kind == 0:
+            return prefix
+
+    return "Numbers"
+
+
+def added_month(loco: dict[str, Any]) -> str:
+    epoch = added_epoch(loco)
+
+    if not epoch:
+        return "Unknown"
+
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m")
+
+
+def build_partition_indexes(locos: list[dict[str, Any]]) -> dict[str, dict[str, list[int]]]:
+    """
+    {kind: {value: [positions in locos]}}. Positions keep the order of
+    locos, so each partition stays in loco_sort_key order.
+    """
+    indexes: dict[str, dict[str, list[int]]] = {kind: {} for kind in PARTITION_KINDS}
+
+    for position, loco in enumerate(locos):
+        values = {
+            "operator": loco_value(loco, OPERATOR_KEYS) or "Unknown",
+            "class": loco_class_prefix(loco_value(loco, LOCO_NUMBER_KEYS)),
+            "added": added_month(loco),
+        }
+
+        for kind, value in values.items():
+            indexes[kind].setdefault(value, []).append(position)
+
+    return indexes
+
+
+def partition_slug(kind: str, value: str, used: set[str]) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", value.lower()).strip("-") or "unknown"
+    slug = f"{kind}-{slug}"
+
+    if slug in used:
+        slug += "-" + hashlib.sha1(value.encode("utf-8")).hexdigest()[:6]
+
+    used.add(slug)
+    return slug
+
+
+def partition_header(title: str, count: int, updated_utc: str, link_prefix: str = "") -> str:
+    """
+    Like html_header, but shows when the partition last changed instead
+    of the run time, so unchanged partition files stay byte-identical.
+    """
+    return f"""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{esc(title)}</title>
+{HTML_STYLE}</head>
+<body>
+<div class="card">
+  <h1>{esc(title)}</h1>
+  <div>
+    <span class="pill">Locos: {count}</span>
+    <span class="pill">Updated: {html_local_time(updated_utc)}</span>
+  </div>
+  <div class="small-note">Times are shown in your phone/browser timezone: <span class="phone-timezone">local time</span>.</div>
+  <div class="nav">
+    <a class="btn" href="{link_prefix}loco_database.html">Full database</a>
+    <a class="btn" href="{link_prefix}loco_partitions.html">All partitions</a>
+  </div>
+</div>
+"""
+
+
+def generate_partition_page(
+    slug: str,
+    kind: str,
+    value: str,
+    locos: list[dict[str, Any]],
+    updated_utc: str,
+) -> None:
+    title = f"RailOps Locos - {PARTITION_KINDS[kind]}: {value}"
+
+    head = partition_header(title, len(locos), updated_utc, "../")
+    head += """
+<div class="card table-wrap">
+<table>
+<thead>
+<tr>
+  <th>Loco Number</th>
+  <th>Current Operator</th>
+  <th>Vehicle Description</th>
+  <th>Train/Service</th>
+  <th>Date/Time Added</th>
+  <th>Last Seen</th>
+</tr>
+</thead>
+<tbody>
+"""
+
+    tail = """
+</tbody>
+</table>
+</div>
+""" + html_footer()
+
+    write_html_stream(PARTITIONS_DIR / f"{slug}.html", head, iter_database_rows(locos, presorted=True), tail)
+
+    payload = {
+        "kind": kind,
+        "value": value,
+        "count": len(locos),
+        "updated": updated_utc,
+        "locos": [
+            {
+                "loco_number": display_loco_number(loco_value(loco, LOCO_NUMBER_KEYS)),
+                "current_operator": loco_value(loco, OPERATOR_KEYS),
+                "vehicle_description": loco_value(loco, DESCRIPTION_KEYS),
+                "train_id": loco_value(loco, ["train_id", "Train ID", "service", "route"]),
+                "date_time_added": loco_value(loco, ADDED_KEYS),
+                "last_seen": loco_value(loco, ["last_seen", "Last Seen"]),
+            }
+            for loco in locos
+        ],
+    }
+
+    (PARTITIONS_DIR / f"{slug}.json").write_text(
+        json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+
+def generate_partitions_index(partitions: list[dict[str, Any]], updated_utc: str) -> None:
+    head = partition_header("RailOps Locos by Operator / Class / Month", len(partitions), updated_utc)
+    sections = []
+
+    for kind, label in PARTITION_KINDS.items():
+        links = "\n".join(
+            f'    <a class="btn" href="partitions/{part["slug"]}.html">'
+            f'{esc(part["value"])} ({part["count"]})</a>'
+            for part in partitions
+            if part["kind"] == kind
+        )
+        sections.append(f"""
+<div class="card">
+  <h2>{esc(label)}</h2>
+  <div class="nav">
+{links}
+  </div>
+</div>""")
+
+    LOCO_PARTITIONS_HTML.write_text(head + "\n".join(sections) + "\n" + html_footer(), encoding="utf-8")
+
+
+def write_partitions(visible: list[dict[str, Any]], generated_iso: str) -> dict[str, int]:
+    """
+    Regenerates the changed partition pages. Returns
+    {"written": n, "unchanged": n, "removed": n}.
+    """
+    manifest = load_output_manifest()
+    saved = manifest.get("partitions")
+    saved = saved if isinstance(saved, dict) else {}
+    now = parse_date_sort(generated_iso)
+
+    PARTITIONS_DIR.mkdir(parents=True, exist_ok=True)
+
+    indexes = build_partition_indexes(visible)
+
+    # Every loco sits in one partition per kind, so encode its page
+    # fields once and hash partitions from the encoded rows.
+    encoded = [
+        json.dumps(digest_loco_fields(loco)[:PAGE_FIELDS], ensure_ascii=False).encode("utf-8")
+        for loco in visible
+    ]
+
+    used: set[str] = set()
+    partitions = []
+    state: dict[str, Any] = {}
+    jobs = []
+
+    for kind in PARTITION_KINDS:
+        for value in sorted(indexes[kind], key=loco_sort_key if kind == "class" else str):
+            slug = partition_slug(kind, value, used)
+            positions = indexes[kind][value]
+            digest = hashlib.sha1(
+                json.dumps([kind, value], ensure_ascii=False).encode("utf-8")
+                + b"\n"
+                + b"\n".join(encoded[position] for position in positions)
+            ).hexdigest()
+            paths = [PARTITIONS_DIR / f"{slug}.html", PARTITIONS_DIR / f"{slug}.json"]
+            previous = saved.get(slug, {})
+
+            if output_is_current(previous, digest, paths, now):
+                state[slug] = previous
+            else:
+                state[slug] = {"hash": digest, "rendered": generated_iso}
+                jobs.append((slug, kind, value, [visible[position] for position in positions], generated_iso))
+
+            partitions.append({"slug": slug, "kind": kind, "value": value, "count": len(positions)})
+
+    with ThreadPoolExecutor(max_workers=max(1, PARTITION_WORKERS)) as pool:
+        for future in [pool.submit(generate_partition_page, *job) for job in jobs]:
+            future.result()
+
+    removed = 0
+
+    for path in list(PARTITIONS_DIR.glob("*.html")) + list(PARTITIONS_DIR.glob("*.json")):
+        if path.stem not in state:
+            path.unlink()
+            removed += 1
+
+    index_digest = output_digest([], ([part["slug"], part["value"], part["count"]] for part in partitions))
+    index_state = manifest["outputs"].get("partitions_index", {})
+
+    if jobs or removed or not output_is_current(index_state, index_digest, [LOCO_PARTITIONS_HTML], now):
+        generate_partitions_index(partitions, generated_iso)
+        manifest["outputs"]["partitions_index"] = {"hash": index_digest, "rendered": generated_iso}
+
+    manifest["partitions"] = state
+    save_json(LOCO_OUTPUT_MANIFEST, manifest)
+
+    return {
+        "written": len(jobs),
+        "unchanged": len(state) - len(jobs),
+        "removed": removed,
+    }
+
+
 # ============================================================
 # Main
 # ============================================================
 
-def main() -> None:
+def main(trains: list[Any] | None = None, partition: dict[str, Any] | None = None) -> None:
+    """
+    loco_pipeline.py passes the train_partition result; run on its own,
+    trains.json is read and partitioned here. Only the loco stream is
+    merged.
+    """
     ensure_dirs()
 
     generated_iso = iso_now()
 
-    trains_payload = load_trains_payload()
-    trains = trains_payload.get("trains", [])
+    if partition is None:
+        if trains is None:
+            memory_profile.mark("load_trains")
+            trains_payload = load_trains_payload()
+            trains = trains_payload.get("trains", [])
+
+        if not isinstance(trains, list):
+            trains = []
+
+        partition = train_partition.partition_trains(trains)
+        print(train_partition.describe(partition))
+
+    trains_count = partition["counts"]["total"]
+    trains = partition["loco"]
 
-    if not isinstance(trains, list):
-        trains = []
+    memory_profile.mark("load_locos")
+    store = None
+    imported = None
+
+    if LOCO_STORE_MODE == "sqlite":
+        store = loco_store.get_store(LOCO_STORE_DB)
+        loco_store.init_store(store)
+
+        if loco_store.count_locos(store) == 0:
+            imported = loco_store.import_locos_json(store, LOCOS_FILE)
+            print(f"Imported {imported['added']} locos from {LOCOS_FILE} into {LOCO_STORE_DB}")
+
+        # Read once; upsert_records() diffs against the same rows.
+        stored_rows = loco_store.load_rows(store)
+        existing = loco_store.load_records(store, stored_rows)
+    else:
+        existing = load_existing_locos()
 
-    existing = load_existing_locos()
     existing_before = len(existing)
 
-    merged, new_added, seen_this_run = merge_locos(existing, trains)
-    visible = visible_locos(merged)
+    sightings: list[tuple] | None = [] if LOCO_SIGHTING_LOG else None
+
+    memory_profile.mark("merge")
+    merged, new_added, seen_this_run = merge_locos(existing, trains, sightings)
+    memory_profile.mark("blocklist")
+    visibility_changes: dict[str, list[str]] = {}
+    visible = visible_locos(merged, visibility_changes)
+
+    if visibility_changes["hidden"] or visibility_changes["restored"]:
+        print(
+            f"Blocklist visibility changes: {len(visibility_changes['hidden'])} hidden, "
+            f"{len(visibility_changes['restored'])} restored"
+        )
+
+    memory_profile.mark("save_state")
+    if sightings:
+        logged = sighting_log.append_sightings(sightings)
+        print(f"Appended {logged} sightings to {sighting_log.SIGHTINGS_DIR}")
 
     added_last_update = len(new_added)
 
-    save_json(LOCOS_FILE, visible)
+    locos_changed = True
+
+    if store is not None:
+        # The store keeps blocked locos too, so removing a blocklist
+        # pattern brings them back into the views.
+        store_stats = loco_store.upsert_records(store, merged, stored_rows)
+        store.close()
+        print(
+            f"Loco store: {store_stats['added']} added, {store_stats['updated']} updated, "
+            f"{store_stats['unchanged']} unchanged"
+        )
+
+        # locos.json is a view of the store here, so it only moves when a
+        # record or its visibility did.
+        locos_changed = bool(
+            imported
+            or store_stats["added"]
+            or store_stats["updated"]
+            or visibility_changes["hidden"]
+            or visibility_changes["restored"]
+            or not LOCOS_FILE.exists()
+        )
+
+    if locos_changed:
+        save_json(LOCOS_FILE, visible)
+    else:
+        print(f"Unchanged: {LOCOS_FILE}")
 
     history = load_json(LOCO_HISTORY_FILE, [])
 
@@ -1220,7 +2497,7 @@ def main() -> None:
         0,
         {
             "generated": generated_iso,
-            "source_trains": len(trains),
+            "source_trains": trains_count,
             "seen_this_run": seen_this_run,
             "existing_before": existing_before,
             "new_added": added_last_update,
@@ -1234,17 +2511,29 @@ def main() -> None:
         },
     )
 
+    if visibility_changes["hidden"]:
+        history[0]["blocklist_hidden"] = visibility_changes["hidden"]
+
+    if visibility_changes["restored"]:
+        history[0]["blocklist_restored"] = visibility_changes["restored"]
+
     history = history[:500]
     save_json(LOCO_HISTORY_FILE, history)
 
-    generate_database_html(visible, generated_iso, added_last_update)
-    generate_recent_html(visible, generated_iso, added_last_update)
-    generate_numbers_html(visible, generated_iso, added_last_update)
-    generate_csv(visible)
-    generate_xlsx(visible)
+    memory_profile.mark("outputs")
+    output_status = write_outputs(visible, generated_iso, added_last_update)
+
+    if LOCO_PARTITIONS:
+        memory_profile.mark("partitions")
+        partition_status = write_partitions(visible, generated_iso)
+        print(
+            f"Partition pages: {partition_status['written']} written, "
+            f"{partition_status['unchanged']} unchanged, {partition_status['removed']} removed"
+        )
 
+    memory_profile.mark("summary")
     generate_summary(
-        trains_count=len(trains),
+        trains_count=trains_count,
         existing_before=existing_before,
         merged_count=len(visible),
         new_added_count=added_last_update,
@@ -1253,7 +2542,7 @@ def main() -> None:
     )
 
     print("RailOps loco database generated.")
-    print(f"Source trains: {len(trains)}")
+    print(f"Source trains: {trains_count}")
     print(f"Existing locos before merge: {existing_before}")
     print(f"Seen this run: {seen_this_run}")
     print(f"New locos added this run: {added_last_update}")
@@ -1262,12 +2551,24 @@ def main() -> None:
     print("Display format: no spaces in loco numbers")
     print("HTML display time: phone/browser local timezone")
     print(f"Wrote: {LOCOS_FILE}")
-    print(f"Wrote: {RECENTLY_ADDED_HTML}")
-    print(f"Wrote: {LOCO_DATABASE_HTML}")
-    print(f"Wrote: {LOCO_NUMBERS_ONLY_HTML}")
-    print(f"Wrote: {LOCO_DATABASE_XLSX}")
-    print(f"Wrote: {LOCO_NUMBERS_ONLY_XLSX}")
+
+    for name, paths in [
+        ("recent_html", [RECENTLY_ADDED_HTML]),
+        ("database_html", [LOCO_DATABASE_HTML]),
+        ("numbers_html", [LOCO_NUMBERS_ONLY_HTML]),
+        ("csv", [LOCO_EXPORT_FILE]),
+        ("xlsx", [LOCO_DATABASE_XLSX, LOCO_NUMBERS_ONLY_XLSX]),
+        ("search_index", [LOCO_SEARCH_INDEX]),
+    ]:
+        label = {
+            "written": "Wrote",
+            "refreshed": "Refreshed generated time",
+            "unchanged": "Unchanged",
+        }[output_status[name]]
+
+        for path in paths:
+            print(f"{label}: {path}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    memory_profile.run("railops_loco_database", main)
\ No newline at end of file
@@ -18,23 +18,41 @@ DATABASE_FILES = [
 
     # Locomotive database files
     "locos.json",
+    "locos.db",
     "locos_master.json",
     "loco_history.json",
     "loco_export.csv",
     "loco_summary.txt",
+    "loco_tracker.json",
+    "loco_tracker_history.json",
+    "loco_tracker_export.csv",
+    "loco_tracker_summary.txt",
     "blocklist.json",
+    "blocklist_state.json",
+    "loco_outputs_manifest.json",
+    "sightings",
     "static/downloads/loco_database.html",
     "static/downloads/recently_added.html",
     "static/downloads/loco_numbers_only.html",
     "static/downloads/loco_database.xlsx",
     "static/downloads/loco_numbers_only.xlsx",
+    "static/downloads/loco_search_index.json",
+    "static/downloads/loco_partitions.html",
+    "static/downloads/partitions",
 
     # V/Line regional passenger service database files
+    "vline_store.json",
     "vline_services.json",
     "vline_services.csv",
     "static/downloads/vline_services.html",
+    "static/downloads/vline_services_data.json",
 ]
 
+# PROFILE_MEMORY=true runs the generators with --profile-memory. Their JSON
+# artefacts are written to logs/ in the work tree and echoed into the run log.
+PROFILE_MEMORY = os.getenv("PROFILE_MEMORY", "false").strip().lower() == "true"
+MEMORY_PROFILE_DIR = "logs"
+
 
 def log(message: str) -> None:
     print(message, flush=True)
@@ -193,6 +211,15 @@ def run_scraper(repo_dir: Path) -> bool:
     return False
 
 
+def generator_command(generator: str) -> list[str]:
+    command = [sys.executable, generator]
+
+    if PROFILE_MEMORY:
+        command.append("--profile-memory")
+
+    return command
+
+
 def run_vline_generator(repo_dir: Path) -> bool:
     """
     Builds the separate V/Line regional passenger service database before
@@ -206,12 +233,16 @@ def run_vline_generator(repo_dir: Path) -> bool:
     generator = os.getenv("VLINE_GENERATOR_SCRIPT", "vline_database.py").strip()
     generator_path = repo_dir / generator
 
+    if database_generator_script() == "loco_pipeline.py" and generator == "vline_database.py":
+        log("loco_pipeline.py builds the V/Line database from its train partition. Skipping separate V/Line step.")
+        return True
+
     if not generator_path.exists():
         log(f"V/Line database generator not found: {generator}. Skipping V/Line database.")
         return True
 
     code = run(
-        [sys.executable, generator],
+        generator_command(generator),
         generator,
         cwd=repo_dir,
         allow_fail=True,
@@ -224,8 +255,12 @@ def run_vline_generator(repo_dir: Path) -> bool:
     return True
 
 
+def database_generator_script() -> str:
+    return os.getenv("DATABASE_GENERATOR_SCRIPT", "loco_pipeline.py").strip()
+
+
 def run_database_generator(repo_dir: Path) -> bool:
-    generator = os.getenv("DATABASE_GENERATOR_SCRIPT", "railops_loco_database.py").strip()
+    generator = database_generator_script()
     generator_path = repo_dir / generator
 
     if not generator_path.exists():
@@ -233,7 +268,7 @@ def run_database_generator(repo_dir: Path) -> bool:
         return False
 
     code = run(
-        [sys.executable, generator],
+        generator_command(generator),
         generator,
         cwd=repo_dir,
         allow_fail=True,
@@ -246,6 +281,18 @@ def run_database_generator(repo_dir: Path) -> bool:
     return True
 
 
+def show_memory_profiles(repo_dir: Path) -> None:
+    profile_dir = repo_dir / MEMORY_PROFILE_DIR
+
+    if not PROFILE_MEMORY or not profile_dir.exists():
+        return
+
+    for path in sorted(profile_dir.glob("memory_*.json")):
+        log("")
+        log(f"=== MEMORY PROFILE {path.name} ===")
+        log(path.read_text(encoding="utf-8"))
+
+
 def show_file_summary(repo_dir: Path) -> None:
     log("")
     log("=== GENERATED FILE SUMMARY ===")
@@ -391,6 +438,7 @@ def main() -> int:
             return 0
 
     show_file_summary(repo_dir)
+    show_memory_profiles(repo_dir)
 
     add_database_files(repo_dir)
 
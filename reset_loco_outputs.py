@@ -1,4 +1,5 @@
 import json
+import shutil
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -9,6 +10,18 @@ FILES_TO_DELETE = [
     BASE_DIR / "loco_history.json",
     BASE_DIR / "loco_export.csv",
     BASE_DIR / "loco_summary.txt",
+    BASE_DIR / "locos.db",
+    BASE_DIR / "locos.db-wal",
+    BASE_DIR / "locos.db-shm",
+    BASE_DIR / "blocklist_state.json",
+    BASE_DIR / "loco_outputs_manifest.json",
+    BASE_DIR / "vline_store.json",
+    BASE_DIR / "vline_services.json",
+    BASE_DIR / "vline_services.csv",
+    BASE_DIR / "loco_tracker.json",
+    BASE_DIR / "loco_tracker_history.json",
+    BASE_DIR / "loco_tracker_export.csv",
+    BASE_DIR / "loco_tracker_summary.txt",
     BASE_DIR / "debug_sources.json",
     BASE_DIR / "trains.json",
     BASE_DIR / "live_trains.json",
@@ -17,6 +30,16 @@ FILES_TO_DELETE = [
     DOWNLOADS_DIR / "loco_numbers_only.html",
     DOWNLOADS_DIR / "loco_database.xlsx",
     DOWNLOADS_DIR / "loco_numbers_only.xlsx",
+    DOWNLOADS_DIR / "loco_search_index.json",
+    DOWNLOADS_DIR / "loco_partitions.html",
+    DOWNLOADS_DIR / "vline_services.html",
+    DOWNLOADS_DIR / "vline_services_data.json",
+]
+
+# State the pipeline reads back in on the next run.
+DIRS_TO_DELETE = [
+    BASE_DIR / "sightings",
+    DOWNLOADS_DIR / "partitions",
 ]
 
 def main():
@@ -36,9 +59,22 @@ def main():
         except Exception as exc:
             print(f"Failed deleting {path}: {exc}", flush=True)
 
+    for path in DIRS_TO_DELETE:
+        try:
+            if path.exists():
+                shutil.rmtree(path)
+                print(f"Deleted: {path}/", flush=True)
+                deleted += 1
+            else:
+                print(f"Not found, skipped: {path}/", flush=True)
+        except Exception as exc:
+            print(f"Failed deleting {path}: {exc}", flush=True)
+
     # recreate clean starter files
-    (BASE_DIR / "locos.json").write_text("{}\n", encoding="utf-8")
-    (BASE_DIR / "loco_history.json").write_text('{"locos": {}, "updates": []}\n', encoding="utf-8")
+    # Same shapes railops_loco_database.py writes: a list of locos and a
+    # list of run entries.
+    (BASE_DIR / "locos.json").write_text("[]\n", encoding="utf-8")
+    (BASE_DIR / "loco_history.json").write_text("[]\n", encoding="utf-8")
     (BASE_DIR / "loco_export.csv").write_text("", encoding="utf-8")
     (BASE_DIR / "loco_summary.txt").write_text("Fresh reset completed.\n", encoding="utf-8")
     (BASE_DIR / "live_trains.json").write_text(
@@ -53,7 +89,7 @@ def main():
         encoding="utf-8"
     )
 
-    print(f"Reset complete. Deleted {deleted} existing files.", flush=True)
+    print(f"Reset complete. Deleted {deleted} existing files and folders.", flush=True)
     print("=== RESET LOCO OUTPUTS COMPLETE ===", flush=True)
 
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+
+# ============================================================
+# RailOps append-only sighting log
+#
+# One compact NDJSON record per sighting:
+#   ["NR82", 1777777777, -33.81769, 151.1933, 62, "5PM5"]
+#    loco    epoch       lat        lon       speed train_id
+#
+# Records are appended to numbered segment files. Each segment has a
+# small sidecar index {loco: [byte offsets]}. Only the active segment's
+# index is rewritten, so appending a run costs O(sightings in the run),
+# not O(history). Sealed segments and their indexes never change; the
+# oldest ones are deleted once there are more than
+# SIGHTING_LOG_MAX_SEGMENTS, so the committed folder stays bounded.
+#
+# Read one loco's track:
+#   python sighting_log.py NR82
+# ============================================================
+
+
+BASE_DIR = Path(__file__).resolve().parent
+
+SIGHTINGS_DIR = BASE_DIR / "sightings"
+
+# A new segment is started once the active one reaches this size.
+SEGMENT_MAX_BYTES = 1024 * 1024
+
+# Segments kept, newest first (about 1 MB each). 0 keeps everything.
+SIGHTING_LOG_MAX_SEGMENTS = int(os.getenv("SIGHTING_LOG_MAX_SEGMENTS", "30"))
+
+
+# ============================================================
+# Helpers
+# ============================================================
+
+def segment_path(log_dir: Path, number: int) -> Path:
+    return log_dir / f"segment-{number:05d}.ndjson"
+
+
+def index_path(log_dir: Path, number: int) -> Path:
+    return log_dir / f"segment-{number:05d}.idx.json"
+
+
+def segment_numbers(log_dir: Path) -> list[int]:
+    numbers = []
+
+    for path in log_dir.glob("segment-*.ndjson"):
+        try:
+            numbers.append(int(path.stem.split("-", 1)[1]))
+        except ValueError:
+            continue
+
+    return sorted(numbers)
+
+
+def load_index(log_dir: Path, number: int) -> dict[str, list[int]]:
+    path = index_path(log_dir, number)
+
+    if not path.exists():
+        return {}
+
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+    return payload if isinstance(payload, dict) else {}
+
+
+def to_float(value: Any):
+    try:
+        return round(float(value), 6)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_speed(value: Any):
+    try:
+        speed = float(value)
+    except (TypeError, ValueError):
+        return 0
+
+    return int(speed) if speed.is_integer() else round(speed, 1)
+
+
+def epoch_to_iso(epoch: int) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# ============================================================
+# Write
+# ============================================================
+
+def append_sightings(sightings: Iterable[tuple], log_dir: Path | None = None) -> int:
+    """
+    Appends (loco, epoch, lat, lon, speed, train_id) tuples to the active
+    segment and updates that segment's index. Returns records written.
+    """
+    log_dir = log_dir or SIGHTINGS_DIR
+
+    records = [
+        [str(loco), int(epoch), to_float(lat), to_float(lon), to_speed(speed), str(train_id or "")]
+        for loco, epoch, lat, lon, speed, train_id in sightings
+        if loco
+    ]
+
+    if not records:
+        return 0
+
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    numbers = segment_numbers(log_dir)
+    number = numbers[-1] if numbers else 1
+
+    if segment_path(log_dir, number).exists() and segment_path(log_dir, number).stat().st_size >= SEGMENT_MAX_BYTES:
+        number += 1
+
+    index = load_index(log_dir, number)
+
+    with segment_path(log_dir, number).open("ab") as handle:
+        offset = handle.seek(0, 2)
+
+        for record in records:
+            line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+            index.setdefault(record[0], []).append(offset)
+            handle.write(line)
+            offset += len(line)
+
+    index_path(log_dir, number).write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+    prune_segments(log_dir)
+
+    return len(records)
+
+
+def prune_segments(log_dir: Path | None = None, max_segments: int | None = None) -> int:
+    """
+    Deletes the oldest sealed segments and their indexes beyond
+    max_segments. Returns segments removed.
+    """
+    log_dir = log_dir or SIGHTINGS_DIR
+    max_segments = SIGHTING_LOG_MAX_SEGMENTS if max_segments is None else max_segments
+
+    if max_segments <= 0:
+        return 0
+
+    numbers = segment_numbers(log_dir)
+    removed = 0
+
+    for number in numbers[:-max_segments]:
+        segment_path(log_dir, number).unlink(missing_ok=True)
+        index_path(log_dir, number).unlink(missing_ok=True)
+        removed += 1
+
+    return removed
+
+
+# ============================================================
+# Read
+# ============================================================
+
+def read_loco_track(
+    loco: str,
+    log_dir: Path | None = None,
+    since_epoch: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Returns one loco's sightings, oldest first, reading only the lines
+    listed for it in each segment index.
+    """
+    log_dir = log_dir or SIGHTINGS_DIR
+    loco = str(loco).strip().upper()
+    track = []
+
+    if not log_dir.exists():
+        return track
+
+    for number in segment_numbers(log_dir):
+        offsets = load_index(log_dir, number).get(loco)
+
+        if not offsets:
+            continue
+
+        with segment_path(log_dir, number).open("rb") as handle:
+            for offset in offsets:
+                handle.seek(offset)
+                record = json.loads(handle.readline())
+
+                if since_epoch is not None and record[1] < since_epoch:
+                    continue
+
+                track.append(
+                    {
+                        "loco": record[0],
+                        "epoch": record[1],
+                        "timestamp": epoch_to_iso(record[1]),
+                        "lat": record[2],
+                        "lon": record[3],
+                        "speed": record[4],
+                        "train_id": record[5],
+                    }
+                )
+
+    return track
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def main(argv: list[str]) -> int:
+    if not argv:
+        print("Usage: python sighting_log.py LOCO_NUMBER")
+        return 2
+
+    track = read_loco_track(argv[0])
+    print(json.dumps(track, indent=2, ensure_ascii=False))
+    print(f"Sightings: {len(track)}", file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
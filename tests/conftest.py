@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+
+# The modules under test are flat files at the repo root.
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def tmp_repo(tmp_path, monkeypatch):
+    """
+    Points a module's file paths (Path or str constants under the repo
+    root) at tmp_path and runs the test from there, so generators read
+    and write a scratch tree instead of the real one.
+
+        railops = tmp_repo(railops_loco_database)
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def redirect(module):
+        for name, value in list(vars(module).items()):
+            if not name.isupper():
+                continue
+            if isinstance(value, Path) and value.is_relative_to(ROOT):
+                monkeypatch.setattr(module, name, tmp_path / value.relative_to(ROOT))
+            elif isinstance(value, str) and value.startswith(str(ROOT)):
+                monkeypatch.setattr(module, name, str(tmp_path) + value[len(str(ROOT)):])
+            elif isinstance(value, list) and value and all(isinstance(item, Path) for item in value):
+                monkeypatch.setattr(
+                    module,
+                    name,
+                    [tmp_path / item.relative_to(ROOT) if item.is_relative_to(ROOT) else item for item in value],
+                )
+        return module
+
+    return redirect
@@ -0,0 +1,116 @@
+import copy
+import os
+import random
+
+import pytest
+
+import railops_loco_database as railops
+
+
+LOCOS = [
+    {"loco_number": "NR82", "current_operator": "Pacific National", "vehicle_description": "NR class", "route": "Dynon"},
+    {"loco_number": "NR121", "current_operator": "Pacific National", "vehicle_description": "NR class"},
+    {"loco_number": "8201", "current_operator": "Aurizon", "vehicle_description": "Coal"},
+    {"loco_number": "G515", "current_operator": "SSR", "vehicle_description": "G class", "origin": "Islington"},
+    {"loco_number": "CF4401", "current_operator": "Qube", "vehicle_description": "Light engine"},
+    {"loco_number": "TT01", "current_operator": "Pacific National", "vehicle_description": "test train"},
+    {"loco_number": "MM-101M", "current_operator": "Metro", "vehicle_description": "Hurstbridge Line"},
+    {"loco_number": "ACD6001", "current_operator": "Aurizon Steel", "vehicle_description": "ACD class"},
+]
+
+EMPTY = {kind: [] for kind in railops.BLOCKLIST_KINDS}
+
+
+def full_reasons(locos, blocklist):
+    return [
+        railops.blocked_reason(
+            railops.blocklist_fields(railops.get_first(loco, ["loco_number"]), loco),
+            blocklist,
+        )
+        for loco in locos
+    ]
+
+
+def edit(blocklist, **patterns):
+    edited = copy.deepcopy(blocklist)
+    for kind, values in patterns.items():
+        edited[kind] = values
+    return edited
+
+
+# ============================================================
+# Incremental result matches a full recompute
+# ============================================================
+
+def test_edits_match_full_recompute(tmp_path):
+    state = tmp_path / "blocklist_state.json"
+    steps = [
+        EMPTY,
+        edit(EMPTY, blocked_locos=["NR1*"]),
+        edit(EMPTY, blocked_locos=["NR1*", "MM*M"], blocked_descriptions=["test train"]),
+        edit(EMPTY, blocked_locos=["MM*M"], blocked_operators=["Aurizon"]),
+        edit(EMPTY, blocked_routes=["Islington"], blocked_operators=["Aurizon"]),
+        EMPTY,
+    ]
+
+    for blocklist in steps:
+        reasons, _changes = railops.apply_blocklist(LOCOS, blocklist, state)
+        assert reasons == full_reasons(LOCOS, blocklist)
+
+
+def test_hidden_and_restored_changes(tmp_path):
+    state = tmp_path / "blocklist_state.json"
+    railops.apply_blocklist(LOCOS, EMPTY, state)
+
+    _reasons, changes = railops.apply_blocklist(LOCOS, edit(EMPTY, blocked_operators=["Aurizon"]), state)
+    assert changes == {"hidden": ["8201", "ACD6001"], "restored": []}
+
+    _reasons, changes = railops.apply_blocklist(LOCOS, edit(EMPTY, blocked_operators=["Aurizon Steel"]), state)
+    assert changes == {"hidden": [], "restored": ["8201"]}
+
+
+def test_changed_loco_fields_are_rechecked(tmp_path):
+    state = tmp_path / "blocklist_state.json"
+    blocklist = edit(EMPTY, blocked_descriptions=["placeholder"])
+    railops.apply_blocklist(LOCOS, blocklist, state)
+
+    locos = copy.deepcopy(LOCOS)
+    locos[0]["vehicle_description"] = "placeholder"
+    reasons, changes = railops.apply_blocklist(locos, blocklist, state)
+
+    assert reasons[0] == "blocked_description"
+    assert changes["hidden"] == ["NR82"]
+
+
+def test_unchanged_run_does_not_rewrite_state(tmp_path):
+    state = tmp_path / "blocklist_state.json"
+    blocklist = edit(EMPTY, blocked_locos=["MM*M"])
+    railops.apply_blocklist(LOCOS, blocklist, state)
+    os.utime(state, ns=(0, 0))
+
+    railops.apply_blocklist(LOCOS, blocklist, state)
+
+    assert state.stat().st_mtime_ns == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_edit_sequences(tmp_path, seed):
+    rng = random.Random(seed)
+    state = tmp_path / "blocklist_state.json"
+    pool = {
+        "blocked_locos": ["NR*", "NR1*", "8*", "G5?5", "*M", "CF4401"],
+        "blocked_routes": ["Dynon", "Islington"],
+        "blocked_descriptions": ["class", "test train", "coal"],
+        "blocked_operators": ["Aurizon", "SSR", "Qube"],
+    }
+    locos = copy.deepcopy(LOCOS)
+
+    for _ in range(20):
+        blocklist = {kind: [p for p in patterns if rng.random() < 0.3] for kind, patterns in pool.items()}
+
+        if rng.random() < 0.3:
+            loco = rng.choice(locos)
+            loco["vehicle_description"] = rng.choice(["coal", "NR class", "Light engine"])
+
+        reasons, _changes = railops.apply_blocklist(locos, blocklist, state)
+        assert reasons == full_reasons(locos, blocklist)
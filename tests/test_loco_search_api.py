@@ -0,0 +1,129 @@
+import os
+
+import pytest
+
+pytest.importorskip("flask")
+
+import app as railops_app
+import railops_loco_database
+
+
+# In loco_sort_key order, as generate_search_index() expects.
+LOCOS = [
+    {"loco_number": "8201", "current_operator": "Aurizon", "vehicle_description": "Coal"},
+    {"loco_number": "NR82", "current_operator": "Pacific National", "vehicle_description": "NR class", "train_id": "2MP9"},
+    {"loco_number": "NR83", "current_operator": "Pacific National", "vehicle_description": "NR class", "train_id": "5MP1"},
+    {"loco_number": "NR121", "current_operator": "Pacific National", "vehicle_description": "NR class"},
+    {"loco_number": "G515", "current_operator": "SSR", "vehicle_description": "G class"},
+]
+
+
+@pytest.fixture
+def client(tmp_repo, monkeypatch):
+    tmp_repo(railops_loco_database).DOWNLOADS_DIR.mkdir(parents=True)
+    tmp_repo(railops_app)
+    monkeypatch.setattr(railops_app, "_search_cache", {"mtime": None, "index": None})
+    return railops_app.app.test_client()
+
+
+def write_index(locos, generated="2026-05-03T10:00:00.000000Z"):
+    railops_loco_database.generate_search_index(locos, generated)
+
+
+def search(client, **args):
+    response = client.get("/api/locos/search", query_string=args)
+    return response.status_code, response.get_json()
+
+
+def numbers_and_matches(payload):
+    return [(row["loco_number"], row["match"]) for row in payload["results"]]
+
+
+# ============================================================
+# Errors
+# ============================================================
+
+def test_missing_index_is_503(client):
+    status, payload = search(client, q="NR82")
+
+    assert status == 503
+    assert payload["error"] == "search_index_not_found"
+
+
+def test_missing_query_is_400(client):
+    write_index(LOCOS)
+    status, payload = search(client, q="  ")
+
+    assert status == 400
+    assert payload["error"] == "missing_query"
+
+
+def test_options_preflight(client):
+    response = client.options("/api/locos/search")
+
+    assert response.status_code == 204
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+# ============================================================
+# Matching
+# ============================================================
+
+def test_exact_then_fuzzy(client):
+    write_index(LOCOS)
+    status, payload = search(client, q="nr 82")
+
+    assert status == 200
+    assert numbers_and_matches(payload)[0] == ("NR82", "exact")
+    assert ("NR83", "fuzzy") in numbers_and_matches(payload)
+    assert payload["results"][0]["current_operator"] == "Pacific National"
+    assert payload["results"][0]["train_id"] == "2MP9"
+
+
+def test_prefix_in_loco_order(client):
+    write_index(LOCOS)
+    _status, payload = search(client, q="NR", fuzzy="0")
+
+    assert numbers_and_matches(payload) == [("NR82", "prefix"), ("NR83", "prefix"), ("NR121", "prefix")]
+
+
+def test_operator_and_description_text(client):
+    write_index(LOCOS)
+
+    assert numbers_and_matches(search(client, q="aurizon")[1]) == [("8201", "text")]
+    assert numbers_and_matches(search(client, q="g class", fuzzy="0")[1]) == [("G515", "text")]
+
+
+def test_fuzzy_off(client):
+    write_index(LOCOS)
+    _status, payload = search(client, q="NR82", fuzzy="false")
+
+    assert numbers_and_matches(payload) == [("NR82", "exact")]
+
+
+# ============================================================
+# Paging and reload
+# ============================================================
+
+def test_paging(client):
+    write_index(LOCOS)
+    _status, payload = search(client, q="NR", fuzzy="0", page="2", per_page="2")
+
+    assert payload["total"] == 3
+    assert (payload["page"], payload["per_page"]) == (2, 2)
+    assert numbers_and_matches(payload) == [("NR121", "prefix")]
+
+    _status, payload = search(client, q="NR", per_page="1000", page="x")
+    assert (payload["page"], payload["per_page"]) == (1, railops_app.SEARCH_MAX_PER_PAGE)
+
+
+def test_index_reloaded_when_rewritten(client):
+    write_index(LOCOS)
+    assert search(client, q="CF4401")[1]["total"] == 0
+
+    write_index(LOCOS + [{"loco_number": "CF4401", "current_operator": "Qube"}], "2026-05-03T10:30:00.000000Z")
+    os.utime(railops_app.LOCO_SEARCH_INDEX, (1, 1))
+
+    _status, payload = search(client, q="CF4401")
+    assert payload["index_generated"] == "2026-05-03T10:30:00.000000Z"
+    assert numbers_and_matches(payload) == [("CF4401", "exact")]
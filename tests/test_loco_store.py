@@ -0,0 +1,145 @@
+import json
+import shutil
+
+import pytest
+
+import loco_store
+import railops_loco_database
+import sighting_log
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = loco_store.get_store(tmp_path / "locos.db")
+    loco_store.init_store(conn)
+    yield conn
+    conn.close()
+
+
+def trace_statements(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+# ============================================================
+# upsert_records
+# ============================================================
+
+def test_upsert_counts_and_stored_rows(conn):
+    records = [
+        {"loco_number": "NR82", "current_operator": "Pacific National", "last_seen": "a"},
+        {"loco_number": "8201", "current_operator": "Aurizon", "last_seen": "a"},
+    ]
+
+    assert loco_store.upsert_records(conn, records) == {"added": 2, "updated": 0, "unchanged": 0}
+
+    stored = loco_store.load_rows(conn)
+    assert sorted(stored) == ["8201", "NR82"]
+
+    changed = [dict(records[0], last_seen="b"), records[1], {"loco_number": "G 515"}, {"operator": "no number"}]
+    assert loco_store.upsert_records(conn, changed, stored) == {"added": 1, "updated": 1, "unchanged": 1}
+
+    # The passed rows track the table, so the next diff needs no read.
+    assert stored == loco_store.load_rows(conn)
+    by_key = {json.loads(record)["loco_number"]: json.loads(record) for record in stored.values()}
+    assert by_key["NR82"]["last_seen"] == "b"
+    assert "G515" in stored
+
+    row = conn.execute("SELECT current_operator, last_seen FROM locos WHERE loco_key = 'NR82'").fetchone()
+    assert tuple(row) == ("Pacific National", "b")
+
+
+def test_upsert_with_stored_rows_reads_nothing(conn):
+    loco_store.upsert_records(conn, [{"loco_number": "NR82"}])
+    stored = loco_store.load_rows(conn)
+
+    statements = trace_statements(conn)
+    loco_store.upsert_records(conn, [{"loco_number": "NR82", "last_seen": "b"}], stored)
+
+    assert not [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        [{"loco_number": "NR82", "current_operator": "Pacific National"}],
+        {"locos": [{"loco_number": "NR82", "current_operator": "Pacific National"}]},
+        {"NR82": {"current_operator": "Pacific National", "first_seen": "2026-01-01T00:00:00Z", "last_train_number": "2MP9"}},
+    ],
+)
+def test_import_accepts_every_locos_json_shape(conn, tmp_path, payload):
+    path = tmp_path / "locos.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+    assert loco_store.import_locos_json(conn, path)["added"] == 1
+
+    record = loco_store.load_records(conn)[0]
+    assert record["loco_number"] == "NR82"
+    assert record["current_operator"] == "Pacific National"
+
+
+def test_tracker_shape_matches_railops_loader(tmp_repo):
+    railops = tmp_repo(railops_loco_database)
+    payload = {"NR82": {"current_operator": "PN", "last_description": "NR class", "first_seen": "x", "last_seen": "y"}}
+    railops.LOCOS_FILE.write_text(json.dumps(payload), encoding="utf-8")
+
+    assert railops.load_existing_locos() == loco_store.records_from_payload(payload)
+    assert railops.load_existing_locos()[0]["vehicle_description"] == "NR class"
+
+
+# ============================================================
+# railops_loco_database in sqlite mode
+# ============================================================
+
+TRAINS = [
+    {"loco": "NR82", "operator": "Pacific National", "train_id": "2MP9"},
+    {"loco": "8201", "operator": "Aurizon", "train_id": "5MB4"},
+    {"loco": "MM-123M", "operator": "Metro"},
+]
+
+
+@pytest.fixture
+def railops(tmp_repo):
+    tmp_repo(sighting_log)
+    module = tmp_repo(railops_loco_database)
+    shutil.copy(ROOT / "blocklist.json", module.BLOCKLIST_FILE)
+    return module
+
+
+def run(railops, monkeypatch, mode, now, trains):
+    monkeypatch.setattr(railops, "LOCO_STORE_MODE", mode)
+    monkeypatch.setattr(railops, "iso_now", lambda: now)
+    railops.main(trains=[dict(train) for train in trains])
+    return railops.LOCOS_FILE.read_text(encoding="utf-8")
+
+
+def test_sqlite_mode_matches_json_mode(railops, monkeypatch, tmp_path):
+    steps = [("2026-05-03T10:00:00.000000Z", TRAINS), ("2026-05-03T10:30:00.000000Z", TRAINS[1:2])]
+
+    from_sqlite = [run(railops, monkeypatch, "sqlite", now, trains) for now, trains in steps]
+
+    railops.LOCOS_FILE.unlink()
+    for name in ["locos.db", "locos.db-wal", "locos.db-shm", "blocklist_state.json"]:
+        (tmp_path / name).unlink(missing_ok=True)
+
+    from_json = [run(railops, monkeypatch, "json", now, trains) for now, trains in steps]
+
+    assert from_sqlite == from_json
+
+
+def test_sqlite_mode_leaves_unchanged_locos_json(railops, monkeypatch, capsys):
+    run(railops, monkeypatch, "sqlite", "2026-05-03T10:00:00.000000Z", TRAINS)
+    before = railops.LOCOS_FILE.stat().st_mtime_ns
+    capsys.readouterr()
+
+    run(railops, monkeypatch, "sqlite", "2026-05-03T10:30:00.000000Z", [])
+
+    assert f"Unchanged: {railops.LOCOS_FILE}" in capsys.readouterr().out
+    assert railops.LOCOS_FILE.stat().st_mtime_ns == before
+
+    run(railops, monkeypatch, "sqlite", "2026-05-03T11:00:00.000000Z", TRAINS[:1])
+    locos = {loco["loco_number"]: loco for loco in json.loads(railops.LOCOS_FILE.read_text(encoding="utf-8"))}
+    assert locos["NR82"]["last_seen"] == "2026-05-03T11:00:00.000000Z"
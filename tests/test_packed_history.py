@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+import packed_history
+
+
+LEGACY = {
+    "locos": {
+        "NR82": [
+            {"timestamp": "2026-05-03T10:00:00Z", "lat": -37.812345, "lon": 144.961234, "speed": 62.5},
+            {"timestamp": "2026-05-03T10:30:00Z", "lat": None, "lon": None, "speed": 0},
+        ],
+        "8201": [
+            {"timestamp": "2026-05-03T10:00:00Z", "lat": -34.9, "lon": 138.6, "speed": 0},
+        ],
+    },
+    "updates": [
+        {"timestamp": "2026-05-03T10:00:00Z", "trains_seen": 876, "locos_seen": 214, "blocked_skipped": 12},
+    ],
+}
+
+
+# ============================================================
+# Round trip
+# ============================================================
+
+@pytest.mark.parametrize("history_format", ["packed", "json"])
+def test_legacy_round_trip(tmp_path, history_format):
+    path = tmp_path / "loco_history.json"
+    path.write_text(json.dumps(LEGACY), encoding="utf-8")
+
+    packed_history.save_history(str(path), packed_history.load_history(str(path)), history_format)
+
+    assert packed_history.history_to_legacy(packed_history.load_history(str(path))) == LEGACY
+
+
+def test_ring_keeps_newest_in_order_after_wrapping(tmp_path, monkeypatch):
+    monkeypatch.setattr(packed_history, "POSITION_CAPACITY", 3)
+    history = packed_history.new_history()
+
+    for epoch in range(1, 6):
+        packed_history.append_position(history, "NR82", epoch, -37.8, 144.9, epoch)
+
+    path = tmp_path / "loco_history.json"
+    packed_history.save_history(str(path), history)
+    rows = packed_history.ring_rows(packed_history.load_history(str(path))["locos"]["NR82"])
+
+    assert [row["epoch"] for row in rows] == [3, 4, 5]
+    assert [row["speed"] for row in rows] == [30, 40, 50]
+
+
+# ============================================================
+# Scaling
+# ============================================================
+
+@pytest.mark.parametrize(
+    "value",
+    [None, "", "north", float("nan"), float("inf"), float("-inf"), 1e300, 2148, -2148, -2147.483648],
+)
+def test_unstorable_coordinates_are_missing(value):
+    assert packed_history.scale(value, packed_history.COORD_SCALE, packed_history.MISSING) == packed_history.MISSING
+
+
+def test_int32_edges():
+    assert packed_history.scale(2147.483647, packed_history.COORD_SCALE, packed_history.MISSING) == 2 ** 31 - 1
+    assert packed_history.scale(-2147.483647, packed_history.COORD_SCALE, packed_history.MISSING) == -(2 ** 31) + 1
+    assert packed_history.scale(float("inf"), packed_history.SPEED_SCALE, 0) == 0
+
+
+def test_bad_values_do_not_break_a_save(tmp_path):
+    history = packed_history.new_history()
+    packed_history.append_position(history, "NR82", 100, float("inf"), 1e12, float("nan"))
+
+    path = tmp_path / "loco_history.json"
+    packed_history.save_history(str(path), history)
+
+    assert packed_history.history_to_legacy(packed_history.load_history(str(path)))["locos"]["NR82"] == [
+        {"timestamp": "1970-01-01T00:01:40Z", "lat": None, "lon": None, "speed": 0}
+    ]
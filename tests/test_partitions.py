@@ -0,0 +1,111 @@
+import copy
+import json
+
+import pytest
+
+import railops_loco_database
+
+
+NOW = "2026-05-03T10:00:00.000000Z"
+LATER = "2026-05-03T10:30:00.000000Z"
+
+LOCOS = [
+    {"loco_number": "NR82", "current_operator": "Pacific National", "date_time_added": "2026-04-30T08:00:00Z"},
+    {"loco_number": "NR121", "current_operator": "Pacific National", "date_time_added": "2026-05-01T08:00:00Z"},
+    {"loco_number": "8201", "current_operator": "Aurizon", "date_time_added": "2026-05-02T08:00:00Z"},
+    {"loco_number": "G515", "current_operator": "SSR", "date_time_added": ""},
+]
+
+
+@pytest.fixture
+def railops(tmp_repo):
+    return tmp_repo(railops_loco_database)
+
+
+def partition_json(railops, slug):
+    return json.loads((railops.PARTITIONS_DIR / f"{slug}.json").read_text(encoding="utf-8"))
+
+
+def page_slugs(railops):
+    return sorted(path.stem for path in railops.PARTITIONS_DIR.glob("*.html"))
+
+
+# ============================================================
+# Grouping
+# ============================================================
+
+@pytest.mark.parametrize(
+    "loco_number, prefix",
+    [("NR82", "NR"), ("ACD6071", "ACD"), ("3V12", "3V"), ("8201", "Numbers")],
+)
+def test_class_prefix(loco_number, prefix):
+    assert railops_loco_database.loco_class_prefix(loco_number) == prefix
+
+
+def test_pages_per_operator_class_and_month(railops):
+    assert railops.write_partitions(LOCOS, NOW) == {"written": 9, "unchanged": 0, "removed": 0}
+
+    assert page_slugs(railops) == [
+        "added-2026-04",
+        "added-2026-05",
+        "added-unknown",
+        "class-g",
+        "class-nr",
+        "class-numbers",
+        "operator-aurizon",
+        "operator-pacific-national",
+        "operator-ssr",
+    ]
+
+    nr = partition_json(railops, "class-nr")
+    assert [loco["loco_number"] for loco in nr["locos"]] == ["NR82", "NR121"]
+    assert partition_json(railops, "added-2026-05")["count"] == 2
+
+    index = railops.LOCO_PARTITIONS_HTML.read_text(encoding="utf-8")
+    assert 'href="partitions/operator-ssr.html">SSR (1)</a>' in index
+
+
+def test_colliding_slugs_get_a_suffix(railops):
+    locos = [
+        {"loco_number": "NR82", "current_operator": "A/B"},
+        {"loco_number": "NR83", "current_operator": "A B"},
+    ]
+    railops.write_partitions(locos, NOW)
+
+    operator_pages = [slug for slug in page_slugs(railops) if slug.startswith("operator-")]
+    assert len(operator_pages) == 2
+    assert "operator-a-b" in operator_pages
+
+
+# ============================================================
+# Incremental writes
+# ============================================================
+
+def test_unchanged_rerun_writes_nothing(railops):
+    railops.write_partitions(LOCOS, NOW)
+    before = {path.name: path.read_bytes() for path in railops.PARTITIONS_DIR.iterdir()}
+
+    assert railops.write_partitions(LOCOS, LATER) == {"written": 0, "unchanged": 9, "removed": 0}
+    assert {path.name: path.read_bytes() for path in railops.PARTITIONS_DIR.iterdir()} == before
+
+
+def test_only_changed_partitions_are_rewritten(railops):
+    railops.write_partitions(LOCOS, NOW)
+
+    locos = copy.deepcopy(LOCOS)
+    locos[3]["current_operator"] = "Aurizon"
+
+    assert railops.write_partitions(locos, LATER) == {"written": 3, "unchanged": 5, "removed": 2}
+
+    assert "operator-ssr" not in page_slugs(railops)
+    assert partition_json(railops, "operator-aurizon")["updated"] == LATER
+    assert partition_json(railops, "class-g")["updated"] == LATER
+    assert partition_json(railops, "class-nr")["updated"] == NOW
+
+
+def test_deleted_page_is_rewritten(railops):
+    railops.write_partitions(LOCOS, NOW)
+    (railops.PARTITIONS_DIR / "class-g.html").unlink()
+
+    assert railops.write_partitions(LOCOS, LATER)["written"] == 1
+    assert (railops.PARTITIONS_DIR / "class-g.html").exists()
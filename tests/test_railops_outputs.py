@@ -0,0 +1,127 @@
+import csv
+import json
+import shutil
+
+import pytest
+
+import railops_loco_database
+import sighting_log
+
+from conftest import ROOT
+
+
+TRAINS = [
+    {"loco": "NR82", "operator": "Pacific National", "train_id": "2MP9", "lat": -37.8, "lon": 144.9},
+    {"loco": "8201", "operator": "Aurizon", "train_id": "5MB4", "lat": -34.9, "lon": 138.6},
+    {"loco": "G515", "operator": "SSR", "train_id": "9303", "lat": -36.7, "lon": 144.3},
+]
+
+TABLE_OUTPUTS = ["database_html", "csv", "xlsx"]
+NUMBER_OUTPUTS = ["recent_html", "numbers_html", "search_index"]
+
+
+@pytest.fixture
+def railops(tmp_repo):
+    tmp_repo(sighting_log)
+    module = tmp_repo(railops_loco_database)
+    shutil.copy(ROOT / "blocklist.json", module.BLOCKLIST_FILE)
+    return module
+
+
+def run(railops, monkeypatch, now, trains):
+    monkeypatch.setattr(railops, "iso_now", lambda: now)
+    railops.main(trains=[dict(train) for train in trains])
+    return json.loads(railops.LOCO_OUTPUT_MANIFEST.read_text(encoding="utf-8"))["outputs"]
+
+
+def csv_rows(railops):
+    with railops.LOCO_EXPORT_FILE.open(encoding="utf-8", newline="") as handle:
+        return {row["loco_number"]: row for row in csv.DictReader(handle)}
+
+
+# ============================================================
+# Output manifest
+# ============================================================
+
+def settled(railops, monkeypatch):
+    """
+    Two runs at the same time, so "Added last update" is back to 0.
+    """
+    run(railops, monkeypatch, "2026-05-03T10:00:00.000000Z", TRAINS)
+    return run(railops, monkeypatch, "2026-05-03T10:00:00.000000Z", TRAINS)
+
+
+def test_rerun_with_same_data_skips_everything(railops, monkeypatch):
+    first = settled(railops, monkeypatch)
+    second = run(railops, monkeypatch, "2026-05-03T10:00:00.000000Z", TRAINS)
+
+    for name in TABLE_OUTPUTS + NUMBER_OUTPUTS:
+        assert second[name]["hash"] == first[name]["hash"]
+        assert second[name]["rendered"] == "2026-05-03T10:00:00.000000Z"
+
+
+def test_last_seen_change_rebuilds_outputs_that_show_it(railops, monkeypatch):
+    first = settled(railops, monkeypatch)
+    second = run(railops, monkeypatch, "2026-05-03T10:30:00.000000Z", TRAINS[:1])
+
+    for name in TABLE_OUTPUTS:
+        assert second[name]["hash"] != first[name]["hash"], name
+        assert second[name]["rendered"] == "2026-05-03T10:30:00.000000Z", name
+
+    for name in NUMBER_OUTPUTS:
+        assert second[name]["hash"] == first[name]["hash"], name
+        assert second[name]["rendered"] == "2026-05-03T10:00:00.000000Z", name
+
+    # Patched in place, not re-rendered.
+    assert second["recent_html"]["generated"] == "2026-05-03T10:30:00.000000Z"
+    assert "2026-05-03T10:30:00.000000Z" in railops.RECENTLY_ADDED_HTML.read_text(encoding="utf-8")
+
+    rows = csv_rows(railops)
+    assert rows["NR82"]["last_seen"] == "2026-05-03T10:30:00.000000Z"
+    assert rows["8201"]["last_seen"] == "2026-05-03T10:00:00.000000Z"
+    assert "2026-05-03T10:30:00.000000Z" in railops.LOCO_DATABASE_HTML.read_text(encoding="utf-8")
+
+
+def test_position_change_changes_export_digests(railops):
+    locos = [
+        {"loco_number": "NR82", "current_operator": "Pacific National", "last_seen": "x", "lat": "-37.8", "lon": "144.9"},
+    ]
+    moved = [dict(locos[0], lat="-36.1")]
+
+    before = railops.output_digests(locos, 0)
+    after = railops.output_digests(moved, 0)
+
+    assert after["csv"] != before["csv"]
+    assert after["xlsx"] != before["xlsx"]
+    assert after["database_html"] == before["database_html"]
+    assert after["search_index"] == before["search_index"]
+
+
+def test_output_matches_full_render_after_skips(railops, monkeypatch):
+    settled(railops, monkeypatch)
+    run(railops, monkeypatch, "2026-05-03T10:30:00.000000Z", TRAINS[1:])
+    incremental = {
+        path: path.read_bytes()
+        for path in [railops.LOCO_DATABASE_HTML, railops.LOCO_EXPORT_FILE, railops.RECENTLY_ADDED_HTML]
+    }
+
+    railops.LOCO_OUTPUT_MANIFEST.unlink()
+    run(railops, monkeypatch, "2026-05-03T10:30:00.000000Z", [])
+
+    for path, content in incremental.items():
+        assert path.read_bytes() == content, path.name
+
+
+def test_refresh_generated_time_needs_same_width(tmp_path):
+    page = tmp_path / "page.html"
+    page.write_text(
+        railops_loco_database.html_header("t", "full", 1, "2026-05-03T10:00:00.000000Z") + "<p>rest</p>",
+        encoding="utf-8",
+    )
+    before = page.read_text(encoding="utf-8")
+
+    assert railops_loco_database.refresh_generated_time(
+        page, "2026-05-03T10:00:00.000000Z", "2026-05-03T10:05:07.001234Z"
+    )
+    assert page.read_text(encoding="utf-8") == before.replace("2026-05-03T10:00:00.000000Z", "2026-05-03T10:05:07.001234Z")
+    assert not railops_loco_database.refresh_generated_time(page, "2026-05-03T10:05:07Z", "2026-05-03T10:05:07.001234Z")
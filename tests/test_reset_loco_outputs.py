@@ -0,0 +1,93 @@
+import json
+import shutil
+
+import pytest
+
+import loco_pipeline
+import railops_loco_database
+import reset_loco_outputs
+import sighting_log
+import vline_database
+
+from conftest import ROOT
+
+
+TRAINS_BEFORE = [
+    {"loco": "NR82", "operator": "Pacific National", "train_id": "2MP9", "lat": -37.8, "lon": 144.9},
+    {"loco": "8201", "operator": "Aurizon", "train_id": "5MB4"},
+    {"loco": "VLINE 8004", "train_id": "8004"},
+]
+TRAINS_AFTER = [
+    {"loco": "G515", "operator": "SSR", "train_id": "9303"},
+    {"loco": "VLINE 8101", "train_id": "8101"},
+]
+
+
+@pytest.fixture
+def tree(tmp_repo, tmp_path, monkeypatch):
+    for module in [railops_loco_database, sighting_log, vline_database, reset_loco_outputs]:
+        tmp_repo(module)
+    monkeypatch.setattr(railops_loco_database, "iso_now", lambda: "2026-05-03T10:00:00.000000Z")
+    shutil.copy(ROOT / "blocklist.json", tmp_path / "blocklist.json")
+    return tmp_path
+
+
+def run_pipeline(tree, trains):
+    (tree / "trains.json").write_text(json.dumps({"trains": trains}), encoding="utf-8")
+    assert loco_pipeline.main() == 0
+
+
+def snapshot(tree):
+    # live_trains.json is a reset starter file, not pipeline output.
+    skip = {"trains.json", "blocklist.json", "live_trains.json"}
+    return {
+        str(path.relative_to(tree)): path.read_bytes()
+        for path in sorted(tree.rglob("*"))
+        if path.is_file() and path.name not in skip and "generated" not in path.name
+    }
+
+
+def strip_times(files):
+    # vline_database stamps real wall-clock times.
+    return {
+        name: content
+        for name, content in files.items()
+        if not name.startswith(("vline_", "static/downloads/vline_"))
+    }
+
+
+def vline_services(tree):
+    store = json.loads((tree / "vline_store.json").read_text(encoding="utf-8"))
+    return sorted(store["services"])
+
+
+def test_reset_clears_everything_the_pipeline_reads_back(tree):
+    run_pipeline(tree, TRAINS_BEFORE)
+
+    for path in reset_loco_outputs.FILES_TO_DELETE + reset_loco_outputs.DIRS_TO_DELETE:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not path.exists():
+            path.write_text("stale", encoding="utf-8") if path.suffix else path.mkdir()
+
+    reset_loco_outputs.main()
+
+    assert json.loads((tree / "locos.json").read_text(encoding="utf-8")) == []
+    assert json.loads((tree / "loco_history.json").read_text(encoding="utf-8")) == []
+    for path in reset_loco_outputs.DIRS_TO_DELETE:
+        assert not path.exists()
+
+    run_pipeline(tree, TRAINS_AFTER)
+    after_reset = snapshot(tree)
+    vline_after_reset = vline_services(tree)
+
+    for path in list(tree.iterdir()):
+        if path.name != "blocklist.json":
+            shutil.rmtree(path) if path.is_dir() else path.unlink()
+
+    run_pipeline(tree, TRAINS_AFTER)
+    fresh = snapshot(tree)
+
+    assert sorted(after_reset) == sorted(fresh)
+    assert strip_times(after_reset) == strip_times(fresh)
+    assert vline_after_reset == vline_services(tree) == ["VLINE8101"]
+
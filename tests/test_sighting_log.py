@@ -0,0 +1,78 @@
+import json
+
+import sighting_log
+
+
+def sighting(loco, epoch, train_id="2MP9"):
+    return (loco, epoch, -37.8, 144.9, 62, train_id)
+
+
+# ============================================================
+# Offset index
+# ============================================================
+
+def test_index_offsets_point_at_each_locos_lines(tmp_path):
+    sighting_log.append_sightings([sighting("NR82", 100), sighting("8201", 100)], tmp_path)
+    sighting_log.append_sightings([sighting("NR82", 200, "5MP1")], tmp_path)
+
+    index = sighting_log.load_index(tmp_path, 1)
+    raw = sighting_log.segment_path(tmp_path, 1).read_bytes()
+
+    assert sorted(index) == ["8201", "NR82"]
+    for loco, offsets in index.items():
+        for offset in offsets:
+            assert json.loads(raw[offset:].split(b"\n", 1)[0])[0] == loco
+
+    track = sighting_log.read_loco_track("nr82", tmp_path)
+    assert [(row["epoch"], row["train_id"]) for row in track] == [(100, "2MP9"), (200, "5MP1")]
+    assert sighting_log.read_loco_track("NR82", tmp_path, since_epoch=150)[0]["epoch"] == 200
+
+
+def test_read_spans_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(sighting_log, "SEGMENT_MAX_BYTES", 1)
+
+    for epoch in [100, 200, 300]:
+        sighting_log.append_sightings([sighting("NR82", epoch), sighting("8201", epoch)], tmp_path)
+
+    assert sighting_log.segment_numbers(tmp_path) == [1, 2, 3]
+    assert [row["epoch"] for row in sighting_log.read_loco_track("NR82", tmp_path)] == [100, 200, 300]
+
+
+def test_default_dir_follows_sightings_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sighting_log, "SIGHTINGS_DIR", tmp_path / "sightings")
+
+    sighting_log.append_sightings([sighting("NR82", 100)])
+
+    assert sighting_log.segment_numbers(tmp_path / "sightings") == [1]
+    assert len(sighting_log.read_loco_track("NR82")) == 1
+
+
+# ============================================================
+# Pruning
+# ============================================================
+
+def test_oldest_segments_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(sighting_log, "SEGMENT_MAX_BYTES", 1)
+    monkeypatch.setattr(sighting_log, "SIGHTING_LOG_MAX_SEGMENTS", 2)
+
+    for epoch in [100, 200, 300, 400]:
+        sighting_log.append_sightings([sighting("NR82", epoch)], tmp_path)
+
+    assert sighting_log.segment_numbers(tmp_path) == [3, 4]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "segment-00003.idx.json",
+        "segment-00003.ndjson",
+        "segment-00004.idx.json",
+        "segment-00004.ndjson",
+    ]
+    assert [row["epoch"] for row in sighting_log.read_loco_track("NR82", tmp_path)] == [300, 400]
+
+
+def test_prune_disabled_keeps_everything(tmp_path, monkeypatch):
+    monkeypatch.setattr(sighting_log, "SEGMENT_MAX_BYTES", 1)
+    monkeypatch.setattr(sighting_log, "SIGHTING_LOG_MAX_SEGMENTS", 0)
+
+    for epoch in [100, 200, 300]:
+        sighting_log.append_sightings([sighting("NR82", epoch)], tmp_path)
+
+    assert sighting_log.segment_numbers(tmp_path) == [1, 2, 3]
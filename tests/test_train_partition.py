@@ -0,0 +1,80 @@
+import json
+from pathlib import Path
+
+import pytest
+
+import railops_loco_database
+import train_partition
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def stream_of(partition, item):
+    return next(stream for stream in train_partition.STREAMS if item in partition[stream])
+
+
+@pytest.mark.parametrize(
+    "item, stream",
+    [
+        ({"id": "arrowMarkersSource_3"}, "marker"),
+        ({"operator": "Pacific National"}, "marker"),
+        ({"train_id": "8004", "operator": "V/Line"}, "marker"),
+        ({"loco": "VLINE 8004"}, "vline"),
+        ({"loco": "1234", "train_id": "V/Line 8123"}, "vline"),
+        ({"loco": "MM-123M"}, "ignore"),
+        ({"name": "QLD7 123"}, "ignore"),
+        ({"loco": "TNSW123"}, "ignore"),
+        ({"loco": "N451", "operator": "V/Line"}, "loco"),
+        ({"loco": "8201", "description": "V/Line hire"}, "loco"),
+        ({"unit": "NR82"}, "loco"),
+        # Extracted as A12, which blocklist.json does not block either.
+        ({"loco": "TNSW-A12"}, "loco"),
+    ],
+)
+def test_classify_train(item, stream):
+    assert train_partition.classify_train(item) == stream
+
+
+def test_partition_counts_and_mentions():
+    trains = [
+        {"loco": "N451", "operator": "V/Line"},
+        {"loco": "VLINE 8004"},
+        {"loco": "MM-123M"},
+        {"properties": {"loco": "NR82"}, "type": "Feature"},
+        "not a train",
+        {"train_id": "8004", "route": "Geelong V/Line"},
+    ]
+
+    partition = train_partition.partition_trains(trains)
+
+    assert partition["counts"] == {
+        "marker": 1,
+        "vline": 1,
+        "ignore": 1,
+        "loco": 2,
+        "vline_mentions": 2,
+        "invalid": 1,
+        "total": 6,
+    }
+    assert {"loco": "NR82", "type": "Feature"} in partition["loco"]
+    # Mentions stay in their own stream and are never the vline stream.
+    assert partition["vline_mentions"] == [trains[0], trains[5]]
+    assert stream_of(partition, trains[0]) == "loco"
+
+
+def test_extract_loco_number_is_shared():
+    for item in [{"loco": "Loco: NR 82 | Pacific National"}, {"name": "8201 • SSR"}, {"label": "g515"}]:
+        assert railops_loco_database.extract_loco_number(item) == train_partition.extract_loco_number(item)
+
+    assert train_partition.extract_loco_number({"loco": "Loco: NR 82 | PN"}) == "NR82"
+
+
+def test_ignore_patterns_are_blocked_by_railops():
+    blocked = json.loads((ROOT / "blocklist.json").read_text(encoding="utf-8"))["blocked_locos"]
+
+    for loco_number in ["TNSW123", "QLD7123", "MM123M"]:
+        assert train_partition.is_ignored_loco(loco_number)
+        assert railops_loco_database.is_blocked_value(loco_number, blocked, wildcard=True)
+
+    assert not train_partition.is_ignored_loco("NR82")
@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+pytest.importorskip("openpyxl")
+
+import update_trains
+
+
+@pytest.fixture
+def conn(tmp_repo):
+    tmp_repo(update_trains)
+    update_trains.init_db()
+    conn = update_trains.get_db()
+    yield conn
+    conn.close()
+
+
+def rows(conn):
+    return {
+        row["loco_number"]: (row["current_operator"], row["vehicle_description"], row["date_time_added"])
+        for row in conn.execute("SELECT * FROM locos")
+    }
+
+
+def counts(stats):
+    return [stats[key] for key in ["added", "updated", "unchanged", "skipped_blocked", "skipped_blank"]]
+
+
+# ============================================================
+# Counters
+# ============================================================
+
+def test_add_then_unchanged_then_update(conn):
+    scraped = [
+        {"loco_number": "nr84", "current_operator": "Pacific National", "vehicle_description": "NR Class"},
+        {"loco_number": "DL43", "current_operator": "Aurizon", "vehicle_description": "DL Class"},
+    ]
+
+    assert counts(update_trains.upsert_locos(scraped, conn)) == [2, 0, 0, 0, 0]
+    added = rows(conn)
+    assert sorted(added) == ["DL43", "NR84"]
+
+    assert counts(update_trains.upsert_locos(scraped, conn)) == [0, 0, 2, 0, 0]
+
+    scraped[1] = dict(scraped[1], current_operator=" Aurizon Bulk ")
+    assert counts(update_trains.upsert_locos(scraped, conn)) == [0, 1, 1, 0, 0]
+
+    updated = rows(conn)
+    assert updated["DL43"][:2] == ("Aurizon Bulk", "DL Class")
+    # date_time_added is kept on update.
+    assert updated["DL43"][2] == added["DL43"][2]
+
+
+def test_blank_blocked_and_duplicates(conn, tmp_path):
+    (tmp_path / "blocked_locos.txt").write_text("gwb106\n", encoding="utf-8")
+    scraped = [
+        {"loco_number": "", "current_operator": "Nobody"},
+        {"loco_number": "GWB106", "current_operator": "Aurizon"},
+        {"loco_number": "NR84", "current_operator": "Old"},
+        {"loco_number": "nr84", "current_operator": "Pacific National"},
+    ]
+
+    assert counts(update_trains.upsert_locos(scraped, conn)) == [1, 0, 0, 1, 1]
+    assert rows(conn)["NR84"][0] == "Pacific National"
+
+
+def test_data_version_only_moves_on_writes(conn):
+    scraped = [{"loco_number": "NR84", "current_operator": "Pacific National"}]
+
+    update_trains.upsert_locos(scraped, conn)
+    version = update_trains.get_meta(conn, "data_version")
+
+    update_trains.upsert_locos(scraped, conn)
+    assert update_trains.get_meta(conn, "data_version") == version
+
+    update_trains.upsert_locos([dict(scraped[0], vehicle_description="NR Class")], conn)
+    assert int(update_trains.get_meta(conn, "data_version")) == int(version) + 1
+
+
+def test_own_connection(conn):
+    assert counts(update_trains.upsert_locos([{"loco_number": "NR84"}])) == [1, 0, 0, 0, 0]
+    assert list(rows(conn)) == ["NR84"]
+
+
+# ============================================================
+# Matches a row-by-row upsert
+# ============================================================
+
+def reference_upsert(table, scraped):
+    stats = {"added": 0, "updated": 0, "unchanged": 0}
+    staged = {}
+
+    for row in scraped:
+        number = update_trains.normalise_loco(row.get("loco_number"))
+        if number:
+            staged[number] = (
+                update_trains.clean_text(row.get("current_operator")),
+                update_trains.clean_text(row.get("vehicle_description")),
+            )
+
+    for number, values in staged.items():
+        if number not in table:
+            stats["added"] += 1
+        elif table[number] != values:
+            stats["updated"] += 1
+        else:
+            stats["unchanged"] += 1
+        table[number] = values
+
+    return stats
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_batches_match_reference(conn, seed):
+    rng = random.Random(seed)
+    table = {}
+
+    for _ in range(10):
+        scraped = [
+            {
+                "loco_number": f"NR{rng.randint(1, 40)}",
+                "current_operator": rng.choice(["Pacific National", "Aurizon", None]),
+                "vehicle_description": rng.choice(["NR Class", "", None]),
+            }
+            for _ in range(rng.randint(0, 30))
+        ]
+
+        stats = update_trains.upsert_locos(scraped, conn)
+        expected = reference_upsert(table, scraped)
+
+        assert {key: stats[key] for key in expected} == expected
+        assert {number: values[:2] for number, values in rows(conn).items()} == table
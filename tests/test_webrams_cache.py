@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import webrams_scraper
+
+
+RUN = datetime(2026, 5, 3, 10, 0, tzinfo=timezone.utc)
+
+
+def cached_entry(fetched_at, status="Running"):
+    return {
+        "status": status,
+        "sections": {
+            section: {"fetched_at": fetched_at.isoformat(), "data": {}}
+            for section in webrams_scraper.SECTION_TTLS
+        },
+    }
+
+
+@pytest.mark.parametrize("minutes_late", [0, 5, 20])
+def test_next_cron_run_reuses_every_section(minutes_late):
+    entry = cached_entry(RUN)
+    next_run = RUN + timedelta(minutes=30 + minutes_late)
+
+    assert webrams_scraper.stale_sections(entry, {"status": "Running"}, next_run) == []
+
+
+def test_run_after_next_refreshes_progress_and_incidents():
+    entry = cached_entry(RUN)
+
+    assert webrams_scraper.stale_sections(entry, {"status": "Running"}, RUN + timedelta(minutes=60)) == [
+        "progress",
+        "incidents",
+    ]
+
+
+def test_status_change_refetches_everything():
+    entry = cached_entry(RUN)
+
+    assert webrams_scraper.stale_sections(entry, {"status": "Arrived"}, RUN + timedelta(minutes=30)) == list(
+        webrams_scraper.SECTION_TTLS
+    )
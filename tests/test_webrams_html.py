@@ -0,0 +1,302 @@
+import json
+import shutil
+import subprocess
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+
+import webrams_html
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "webrams"
+PAGES = ["search_results.html", "train_progress.html", "train_consist.html", "train_incidents.html"]
+
+
+def load_page(name):
+    return webrams_html.parse_page((FIXTURES / name).read_text(encoding="utf-8"))
+
+
+# ============================================================
+# parse_page
+# ============================================================
+
+def test_parse_page_skips_head_and_scripts():
+    page = load_page("train_incidents.html")
+
+    assert "WebRAMS - Train 2MP9" not in page["text"]
+    assert "not a row" not in page["text"]
+    assert page["text"].startswith("Rail Access Management System")
+    assert [table["heading"] for table in page["tables"]] == ["Rail Access Management System", "Incidents"]
+
+
+def test_parse_page_normalises_cells():
+    page = load_page("train_progress.html")
+    schedule = page["tables"][-1]
+
+    assert schedule["rows"][0] == [["h", "Location"], ["h", "Arrive Time"], ["h", "Depart Time"], ["h", ""]]
+    assert schedule["rows"][1] == [["d", "Dynon"], ["d", ""], ["d", "21:05"], ["d", "Departed"]]
+    assert "  " not in page["text"]
+    assert "\xa0" not in page["text"]
+
+
+def test_parse_page_rows_belong_to_innermost_table():
+    page = load_page("train_progress.html")
+    layout, summary, schedule = page["tables"]
+
+    assert layout["rows"] == [[["d", ""]]]
+    assert len(summary["rows"]) == 3
+    assert summary["rows"][0][0] == ["d", "Train ID:"]
+    assert schedule["heading"] == "Schedule"
+
+
+@pytest.mark.parametrize("name", PAGES)
+def test_parse_page_offsets_point_at_table_text(name):
+    page = load_page(name)
+
+    for table in page["tables"]:
+        first = next((value for row in table["rows"] for _tag, value in row if value), None)
+        if first is None:
+            continue
+        assert page["text"][table["offset"]:].lstrip().startswith(first)
+
+
+def test_parse_page_forms_and_links():
+    page = load_page("search_results.html")
+    form = page["forms"][0]
+
+    assert form["method"] == "post"
+    assert form["action"] == "./TrainProgress.aspx"
+
+    names = [field["name"] for field in form["fields"]]
+    assert "__VIEWSTATE" in names
+    assert "ctl00$Main$ddlStatus" in names
+    assert "ctl00$Main$gvResults$ctl03$btnView" in names
+
+    status = next(field for field in form["fields"] if field["name"] == "ctl00$Main$ddlStatus")
+    assert webrams_html.option_value(status, "Terminated") == "2"
+
+    _form, button = webrams_html.find_button(page, "Search")
+    data = webrams_html.form_data(form, button)
+    assert data["ctl00$Main$ddlStatus"] == "1"
+    assert data["ctl00$Main$btnSearch"] == "Search"
+    assert "ctl00$Main$gvResults$ctl02$btnView" not in data
+
+    link = webrams_html.find_link(page, "Train Progress")
+    assert "__doPostBack('ctl00$Nav$lnkTrainProgress'" in link["href"]
+
+
+# ============================================================
+# Table helpers
+# ============================================================
+
+def test_find_table_by_heading():
+    page = load_page("search_results.html")
+
+    assert webrams_html.find_table(page, "Search Results") is page["tables"][1]
+    assert webrams_html.find_table(page, "Train Progress") is page["tables"][0]
+    assert webrams_html.find_table(page, "Nothing like this") is None
+
+
+def test_find_table_falls_back_to_page_text():
+    page = webrams_html.parse_page(
+        "<body><table><tr><td>before</td></tr></table>"
+        "<p>Results below</p>"
+        "<table><tr><th>A</th></tr><tr><td>1</td></tr></table></body>"
+    )
+
+    table = webrams_html.find_table(page, "Results below")
+    assert table is page["tables"][1]
+    assert webrams_html.find_table(page, "before") is page["tables"][1]
+    assert webrams_html.find_table(page, "1") is None
+
+
+def test_table_rows_from_th_headers():
+    page = load_page("train_progress.html")
+    rows = webrams_html.table_rows(webrams_html.find_table(page, "Schedule"))
+
+    assert rows == [
+        {"location": "Dynon", "arrive_time": "", "depart_time": "21:05", "col_4": "Departed"},
+        {"location": "Tottenham", "arrive_time": "21:32", "depart_time": "21:40", "col_4": ""},
+        {"location": "Ararat", "arrive_time": "23:51", "depart_time": "00:02", "col_4": "On time"},
+    ]
+
+
+def test_table_rows_from_td_headers():
+    page = load_page("train_consist.html")
+    rows = webrams_html.table_rows(webrams_html.find_table(page, "Consist"))
+
+    assert rows[0] == {"seq": "1", "vehicle_no": "NR44", "vehicle_type": "Locomotive", "gross_mass_t": "132"}
+    assert [row["vehicle_no"] for row in rows] == ["NR44", "NR107", "RRAY 1234"]
+
+
+def test_table_rows_empty():
+    assert webrams_html.table_rows(None) == []
+    assert webrams_html.table_rows({"heading": "", "offset": 0, "rows": []}) == []
+
+
+def test_summary_pairs():
+    page = load_page("train_progress.html")
+
+    assert webrams_html.summary_pairs(page) == {
+        "train_id": "2MP9",
+        "operator": "Pacific National",
+        "train_date": "18/10/2026",
+        "origin": "Melbourne (Dynon)",
+        "destination": "Perth (Kewdale)",
+    }
+
+
+def test_train_list_rows():
+    page = load_page("search_results.html")
+
+    assert webrams_html.train_list_rows(page) == [
+        {
+            "train_id": "2MP9",
+            "train_date": "18/10/2026",
+            "origin": "Melbourne (Dynon)",
+            "destination": "Perth (Kewdale)",
+            "operator": "Pacific National",
+            "status": "Running",
+        },
+        {
+            "train_id": "7SM2",
+            "train_date": "19/10/2026",
+            "origin": "Sydney (Chullora)",
+            "destination": "Melbourne (Dynon)",
+            "operator": "SCT Logistics",
+            "status": "Running",
+        },
+    ]
+
+
+def test_train_list_rows_without_results():
+    assert webrams_html.train_list_rows(load_page("train_progress.html")) == []
+
+
+# ============================================================
+# Section parsers
+# ============================================================
+
+def test_progress_section():
+    section = webrams_html.progress_section(load_page("train_progress.html"))
+
+    assert section["summary"]["train_id"] == "2MP9"
+    assert [row["location"] for row in section["schedule"]] == ["Dynon", "Tottenham", "Ararat"]
+
+
+def test_consist_section():
+    section = webrams_html.consist_section(load_page("train_consist.html"))
+
+    assert section["summary"] == {
+        "train_id": "2MP9",
+        "operator": "Pacific National",
+        "train_date": "18/10/2026",
+        "status": "Running",
+    }
+    assert len(section["consist"]) == 3
+    assert section["consist"][2]["gross_mass_t"] == "68.5"
+
+
+def test_incidents_section():
+    section = webrams_html.incidents_section(load_page("train_incidents.html"))
+
+    assert section["summary"] == {"train_id": "2MP9", "origin": "Melbourne (Dynon)"}
+    assert section["total_delay"] == "37"
+    assert section["incidents"] == [
+        {"location": "Ararat", "cause": "Signal failure", "delay_mins": "25"},
+        {"location": "Serviceton", "cause": "Crew change", "delay_mins": "12"},
+    ]
+
+
+def test_incidents_section_without_total():
+    section = webrams_html.incidents_section(load_page("search_results.html"))
+
+    assert section["total_delay"] == ""
+    assert section["incidents"] == []
+
+
+# ============================================================
+# EXTRACT_PAGE_SCRIPT vs PageParser
+#
+# The script runs in node over a minimal DOM built from the same
+# fixture, so both sides see the same tree.
+# ============================================================
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+DOM_SHIM = """
+const Node = {ELEMENT_NODE: 1, TEXT_NODE: 3};
+function build(n) {
+  if (typeof n === "string") return {nodeType: 3, nodeValue: n};
+  const el = {nodeType: 1, tagName: n.t, childNodes: n.c.map(build)};
+  Object.defineProperty(el, "textContent", {
+    get() { return el.childNodes.map(c => c.nodeType === 3 ? c.nodeValue : c.textContent).join(""); }
+  });
+  return el;
+}
+const document = {body: build(JSON.parse(require("fs").readFileSync(0, "utf8")))};
+console.log((function () { %s })());
+"""
+
+
+class TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.body = None
+        self.stack = []
+
+    def handle_starttag(self, tag, attrs):
+        element = {"t": tag.upper(), "c": []}
+        if tag == "body":
+            self.body = element
+            self.stack = [element]
+            return
+        if not self.stack:
+            return
+        self.stack[-1]["c"].append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        if self.stack:
+            self.stack[-1]["c"].append({"t": tag.upper(), "c": []})
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i]["t"] == tag.upper():
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self.stack:
+            self.stack[-1]["c"].append(data)
+
+
+def run_page_script(html_text):
+    builder = TreeBuilder()
+    builder.feed(html_text)
+    builder.close()
+
+    result = subprocess.run(
+        ["node", "-e", DOM_SHIM % webrams_html.EXTRACT_PAGE_SCRIPT],
+        input=json.dumps(builder.body),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+@pytest.mark.parametrize("name", PAGES)
+def test_page_script_matches_parser(name):
+    html_text = (FIXTURES / name).read_text(encoding="utf-8")
+    from_script = run_page_script(html_text)
+    from_parser = webrams_html.parse_page(html_text)
+
+    assert from_script["text"] == from_parser["text"]
+    assert [(t["heading"], t["offset"]) for t in from_script["tables"]] == [
+        (t["heading"], t["offset"]) for t in from_parser["tables"]
+    ]
+    assert [t["rows"] for t in from_script["tables"]] == [t["rows"] for t in from_parser["tables"]]
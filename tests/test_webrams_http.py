@@ -0,0 +1,212 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("requests")
+
+from werkzeug.serving import make_server
+
+import webrams_http
+import webrams_standin
+
+from conftest import ROOT
+from test_webrams_html import FIXTURES
+
+
+# Top-level keys of each record in data/webrams_consists.json, less the
+# "cache_entry" that webrams_scraper.main() pops before writing.
+RECORD_KEYS = [
+    "account_label",
+    "scraped_at",
+    "train_id",
+    "train_date",
+    "operator",
+    "origin",
+    "destination",
+    "status",
+    "progress",
+    "consist",
+    "incidents_total_delay",
+    "incidents",
+]
+RECORD_TEXT_KEYS = [key for key in RECORD_KEYS if key not in {"progress", "consist", "incidents"}]
+ALL_SECTIONS = ["progress", "consist", "incidents"]
+
+
+def serve(app):
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture(scope="module")
+def standin():
+    app = webrams_standin.create_app(train_count=6, seed=3)
+    server = serve(app)
+    yield app, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def client(standin, monkeypatch):
+    _app, base_url = standin
+    monkeypatch.setattr(webrams_http, "BASE_URL", base_url)
+
+    client = webrams_http.start_client("tester", "secret")
+    yield client
+    webrams_http.close_client(client)
+
+
+def assert_record_schema(record):
+    assert list(record) == RECORD_KEYS
+
+    for key in RECORD_TEXT_KEYS:
+        assert isinstance(record[key], str), key
+
+    for key in ["progress", "consist", "incidents"]:
+        assert isinstance(record[key], list), key
+        for row in record[key]:
+            assert isinstance(row, dict)
+            assert all(isinstance(name, str) and isinstance(value, str) for name, value in row.items())
+
+
+# ============================================================
+# Client against the stand-in
+# ============================================================
+
+def test_start_client_lands_on_train_progress(client):
+    assert "/TrainProgress.aspx" in client["url"]
+    form, button = webrams_http.webrams_html.find_button(client["page"], "Search")
+    assert form is not None and button is not None
+
+
+def test_login_needs_credentials(standin, monkeypatch):
+    _app, base_url = standin
+    monkeypatch.setattr(webrams_http, "BASE_URL", base_url)
+
+    with pytest.raises(RuntimeError):
+        webrams_http.start_client("tester", "")
+
+
+def test_running_trains(standin, client):
+    app, _base_url = standin
+    trains = app.config["STANDIN_TRAINS"]
+
+    stubs = webrams_http.running_trains(client)
+
+    assert [stub["train_id"] for stub in stubs] == list(trains)
+    for stub in stubs:
+        expected = trains[stub["train_id"]]
+        assert stub == {key: expected[key] for key in ["train_id", "train_date", "origin", "destination", "operator", "status"]}
+
+
+def test_fetch_train_sections(standin, client):
+    app, _base_url = standin
+    stub = webrams_http.running_trains(client)[2]
+    train = app.config["STANDIN_TRAINS"][stub["train_id"]]
+
+    sections = webrams_http.fetch_train_sections(client, stub, ALL_SECTIONS)
+
+    assert sorted(sections) == sorted(ALL_SECTIONS)
+    assert sections["progress"]["summary"]["train_id"] == stub["train_id"]
+    assert sections["progress"]["schedule"] == train["schedule"]
+    assert [row["vehicle"] for row in sections["consist"]["consist"]] == [row["vehicle"] for row in train["consist"]]
+    assert sections["incidents"]["total_delay"] == str(sum(int(row["minutes"]) for row in train["incidents"]))
+    assert sections["incidents"]["incidents"] == train["incidents"]
+
+
+def test_fetch_only_stale_sections(client):
+    stub = webrams_http.running_trains(client)[0]
+
+    sections = webrams_http.fetch_train_sections(client, stub, ["consist"])
+
+    assert list(sections) == ["consist"]
+
+
+def test_replays_recorded_pages(tmp_path, monkeypatch):
+    for view in ALL_SECTIONS:
+        shutil.copy(FIXTURES / f"train_{view}.html", tmp_path / f"train_2MP9_{view}.html")
+
+    server = serve(webrams_standin.create_app(recordings_dir=tmp_path))
+    monkeypatch.setattr(webrams_http, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+
+    try:
+        client = webrams_http.start_client("tester", "secret")
+        try:
+            stubs = webrams_http.running_trains(client)
+            sections = webrams_http.fetch_train_sections(client, stubs[0], ALL_SECTIONS)
+        finally:
+            webrams_http.close_client(client)
+    finally:
+        server.shutdown()
+
+    assert [stub["train_id"] for stub in stubs] == ["2MP9"]
+    assert stubs[0]["operator"] == "Pacific National"
+    assert [row["location"] for row in sections["progress"]["schedule"]] == ["Dynon", "Tottenham", "Ararat"]
+    assert [row["vehicle_no"] for row in sections["consist"]["consist"]] == ["NR44", "NR107", "RRAY 1234"]
+    assert sections["incidents"]["total_delay"] == "37"
+
+
+# ============================================================
+# webrams_scraper records in http mode
+# ============================================================
+
+@pytest.fixture
+def scraper(monkeypatch):
+    pytest.importorskip("dotenv")
+    import webrams_scraper
+
+    monkeypatch.setattr(webrams_scraper, "MODE", "http")
+    return webrams_scraper
+
+
+def test_scrape_one_train_record_schema(scraper, client):
+    stubs = webrams_http.running_trains(client)
+
+    for stub in stubs:
+        record = scraper.scrape_one_train(client, stub, "Test account")
+        entry = record.pop("cache_entry")
+
+        assert_record_schema(record)
+        assert record["account_label"] == "Test account"
+        assert record["train_id"] == stub["train_id"]
+        assert record["operator"] == stub["operator"]
+        assert record["consist"]
+        assert entry["hits"] == []
+        assert sorted(entry["entry"]["sections"]) == sorted(ALL_SECTIONS)
+
+
+def test_scrape_one_train_from_cache(scraper, client):
+    stub = webrams_http.running_trains(client)[1]
+
+    first = scraper.scrape_one_train(client, stub, "Test account")
+    cached = first.pop("cache_entry")["entry"]
+    second = scraper.scrape_one_train(client, stub, "Test account", cached)
+    entry = second.pop("cache_entry")
+
+    assert_record_schema(second)
+    assert sorted(entry["hits"]) == sorted(ALL_SECTIONS)
+    assert {key: second[key] for key in RECORD_KEYS if key != "scraped_at"} == {
+        key: first[key] for key in RECORD_KEYS if key != "scraped_at"
+    }
+
+
+def test_scraper_imports_without_selenium(scraper):
+    code = "import sys; sys.modules['selenium'] = None; import webrams_scraper; print(webrams_scraper.MODE)"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={**os.environ, "WEBRAMS_MODE": "http", "PYTHONPATH": os.pathsep.join(sys.path)},
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "http"
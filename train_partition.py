@@ -0,0 +1,230 @@
+import fnmatch
+import re
+import time
+from typing import Any
+
+
+# ============================================================
+# RailOps train partitioner
+#
+# One pass over trains.json that classifies every train once and hands
+# each stream to its consumer:
+#
+#   marker  map marker ghosts (arrowMarkersSource_N, markerSource_N) or
+#           trains with no identifying field at all
+#   vline   V/Line services by train ID or service number
+#                                             -> vline_database.py
+#   ignore  metro and light rail sets (TNSW..., QLD7..., MM...M)
+#   loco    everything else                   -> railops_loco_database.py,
+#                                                update_locos.py
+#
+# The same pass also lists "vline_mentions": trains outside the vline
+# stream with V/Line in their description, route or operator. They can
+# still carry a real loco (V/Line hires and runs them), so they stay in
+# their own stream and vline_database.py reads them from this list.
+#
+# Trains are ignored by the loco number railops_loco_database.py would
+# extract, and only by patterns blocklist.json already blocks, so no
+# loco the railops view would show is dropped here.
+# ============================================================
+
+
+STREAMS = ["marker", "vline", "ignore", "loco"]
+
+# Same keys, same order as extract_loco_number() reads them.
+ID_KEYS = [
+    "loco_number",
+    "locoNumber",
+    "loco",
+    "locomotive",
+    "locomotive_number",
+    "unit",
+    "vehicle",
+    "vehicle_id",
+    "trKey",
+    "name",
+    "train_name",
+    "trainName",
+    "label",
+    "id",
+    "ID",
+]
+
+# The ID keys vline_database.py has always read services from.
+VLINE_ID_KEYS = ["loco_number", "loco", "trKey", "train_name", "trainName", "name", "id", "ID"]
+SERVICE_KEYS = ["train_id", "trainId", "train_number", "trainNumber", "service", "service_number"]
+DESCRIPTION_KEYS = ["vehicle_description", "description", "desc"]
+ROUTE_KEYS = ["route", "service_name", "serviceName"]
+OPERATOR_KEYS = ["current_operator", "operator", "owner"]
+
+# "VLINE", "V/LINE" or "V-LINE" anywhere, or a value that starts with
+# VLINE once spaces and dashes are dropped ("V LINE 8004").
+VLINE_RE = re.compile(r"V[/-]?LINE|^[ -]*V[ -]*L[ -]*I[ -]*N[ -]*E", re.IGNORECASE)
+
+MARKER_RE = re.compile(r"MARKERS?SOURCE", re.IGNORECASE)
+
+# Sydney Trains / Metro sets, Queensland Rail, Metro Trains Melbourne.
+# All three are also in blocklist.json's blocked_locos.
+IGNORE_LOCO_PATTERNS = ["TNSW*", "QLD7*", "MM*M"]
+
+
+def clean_text(value: Any) -> str:
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def first_value(item: dict[str, Any], keys: list[str]) -> str:
+    for key in keys:
+        value = item.get(key)
+        if value not in [None, ""]:
+            return clean_text(value)
+    return ""
+
+
+def flatten_train(item: Any) -> dict[str, Any]:
+    """
+    Same as railops_loco_database.maybe_properties(): GeoJSON features
+    are flattened onto their properties.
+    """
+    if not isinstance(item, dict):
+        return {}
+
+    if isinstance(item.get("properties"), dict):
+        merged = dict(item["properties"])
+
+        for key, value in item.items():
+            if key != "properties" and key not in merged:
+                merged[key] = value
+
+        return merged
+
+    return item
+
+
+def extract_loco_number(item: dict[str, Any]) -> str:
+    """
+    The loco number a train would be filed under. railops_loco_database.py
+    uses this too, so the ignore stream matches its blocklist exactly.
+    """
+    raw = first_value(item, ID_KEYS)
+
+    if not raw:
+        return ""
+
+    text = raw.strip()
+
+    if "•" in text:
+        text = text.split("•", 1)[0].strip()
+
+    if "|" in text:
+        text = text.split("|", 1)[0].strip()
+
+    text = re.sub(r"^(LOCO|Loco|loco)\s*[:#-]?\s*", "", text).strip()
+
+    match = re.search(r"[A-Z]{1,8}[- ]?\d{1,5}[A-Z]?", text.upper())
+
+    if match:
+        return match.group(0).replace(" ", "").replace("-", "")
+
+    match = re.search(r"\b\d{3,6}\b", text)
+
+    if match:
+        return match.group(0)
+
+    return text.upper().replace(" ", "").replace("-", "")
+
+
+def is_ignored_loco(loco_number: str) -> bool:
+    return any(fnmatch.fnmatchcase(loco_number.upper(), pattern) for pattern in IGNORE_LOCO_PATTERNS)
+
+
+def is_vline_train(item: dict[str, Any]) -> bool:
+    """
+    A V/Line service by its own ID or service number, so never a loco.
+    """
+    for keys in [ID_KEYS, SERVICE_KEYS]:
+        value = first_value(item, keys)
+        if value and VLINE_RE.search(value):
+            return True
+    return False
+
+
+def mentions_vline(item: dict[str, Any]) -> bool:
+    """
+    vline_database.py's wider test: V/Line in the ID, service,
+    description, route or operator. Run once per train by
+    partition_trains() for its "vline_mentions" list.
+    """
+    for keys in [VLINE_ID_KEYS, SERVICE_KEYS, DESCRIPTION_KEYS, ROUTE_KEYS, OPERATOR_KEYS]:
+        value = first_value(item, keys)
+        if value and VLINE_RE.search(value):
+            return True
+    return False
+
+
+def classify_train(item: dict[str, Any]) -> str:
+    train_key = first_value(item, ID_KEYS)
+
+    if not train_key or MARKER_RE.search(train_key):
+        return "marker"
+
+    if is_vline_train(item):
+        return "vline"
+
+    if is_ignored_loco(extract_loco_number(item)):
+        return "ignore"
+
+    return "loco"
+
+
+def partition_trains(trains: list[Any]) -> dict[str, Any]:
+    """
+    Returns {"marker": [...], "vline": [...], "ignore": [...],
+    "loco": [...], "vline_mentions": [...], "counts": {...},
+    "seconds": {...}}. Trains are flattened first; items that are not
+    dicts are dropped (counted as "invalid").
+    """
+    streams: dict[str, list[dict[str, Any]]] = {stream: [] for stream in STREAMS}
+    vline_mentions: list[dict[str, Any]] = []
+    seconds = dict.fromkeys(STREAMS, 0.0)
+    invalid = 0
+    clock = time.perf_counter
+
+    for raw in trains:
+        item = flatten_train(raw)
+
+        if not item:
+            invalid += 1
+            continue
+
+        started = clock()
+        stream = classify_train(item)
+
+        if stream != "vline" and mentions_vline(item):
+            vline_mentions.append(item)
+
+        seconds[stream] += clock() - started
+        streams[stream].append(item)
+
+    counts = {stream: len(items) for stream, items in streams.items()}
+    counts["vline_mentions"] = len(vline_mentions)
+    counts["invalid"] = invalid
+    counts["total"] = len(trains)
+
+    return {
+        **streams,
+        "vline_mentions": vline_mentions,
+        "counts": counts,
+        "seconds": {stream: round(value, 4) for stream, value in seconds.items()},
+    }
+
+
+def describe(partition: dict[str, Any]) -> str:
+    counts = partition["counts"]
+    parts = [
+        f"{stream} {counts[stream]} ({partition['seconds'][stream] * 1000:.1f}ms)"
+        for stream in STREAMS
+    ]
+    parts.append(f"vline mentions {counts['vline_mentions']}")
+    return f"Train partition of {counts['total']}: " + ", ".join(parts)
@@ -2,16 +2,35 @@ import os
 import json
 import datetime
 import csv
-from typing import Dict, Any, Set, List, Tuple
+from typing import Dict, Any, Set, List, Optional, Tuple
+
+import loco_index
+import memory_profile
+import packed_history
+import sighting_log
 
 TRAINS_FILE = "trains.json"
-LOCOS_FILE = "locos.json"
-HISTORY_FILE = "loco_history.json"
-EXPORT_FILE = "loco_export.csv"
-SUMMARY_FILE = "loco_summary.txt"
+LOCOS_FILE = "loco_tracker.json"
+HISTORY_FILE = "loco_tracker_history.json"
+EXPORT_FILE = "loco_tracker_export.csv"
+SUMMARY_FILE = "loco_tracker_summary.txt"
+
+# This tracker used to write the same file names as railops_loco_database.py
+# and the two kept overwriting each other. Dict-shaped tracker state still
+# sitting in these files is migrated on the first run.
+LEGACY_LOCOS_FILE = "locos.json"
+LEGACY_HISTORY_FILE = "loco_history.json"
 BLOCKED_FILE = "blocked_locos.txt"
 BLOCKED_DESCRIPTIONS_FILE = "blocked_descriptions.txt"
 
+# "packed" writes loco_history.json as packed ring-buffer columns (default).
+# "json" writes the original {"locos": {id: [...]}, "updates": [...]} shape.
+# Both shapes are read.
+HISTORY_FORMAT = os.getenv("LOCO_HISTORY_FORMAT", "packed").strip().lower()
+
+# Also append every sighting to the compact append-only log in sightings/.
+SIGHTING_LOG_ENABLED = os.getenv("LOCO_SIGHTING_LOG", "true").strip().lower() == "true"
+
 SKIP_PREFIXES = (
     "ARROWMARKERSSOURCE_",
     "MARKERSOURCE_",
@@ -55,6 +74,33 @@ def save_json(filename, data):
         print(f"❌ Failed to save {filename}: {e}")
 
 
+def is_tracker_locos(payload: Any) -> bool:
+    return isinstance(payload, dict) and bool(payload) and all(isinstance(v, dict) for v in payload.values())
+
+
+def load_tracker_locos() -> Dict[str, Any]:
+    if os.path.exists(LOCOS_FILE):
+        locos = load_json(LOCOS_FILE)
+        return locos if isinstance(locos, dict) else {}
+
+    legacy = load_json(LEGACY_LOCOS_FILE)
+    if is_tracker_locos(legacy):
+        print(f"🔁 Migrating tracker locos from {LEGACY_LOCOS_FILE} to {LOCOS_FILE}")
+        return legacy
+
+    return {}
+
+
+def load_tracker_history() -> Dict[str, Any]:
+    if not os.path.exists(HISTORY_FILE):
+        legacy = load_json(LEGACY_HISTORY_FILE)
+        if isinstance(legacy, dict) and (isinstance(legacy.get("locos"), dict) or "format" in legacy):
+            print(f"🔁 Migrating tracker history from {LEGACY_HISTORY_FILE} to {HISTORY_FILE}")
+            return packed_history.load_history(LEGACY_HISTORY_FILE)
+
+    return packed_history.load_history(HISTORY_FILE)
+
+
 def normalize_loco(value: Any) -> str:
     if value is None:
         return ""
@@ -99,6 +145,28 @@ def loco_is_blocked(loco_id: Any, blocked_exact: Set[str], blocked_prefixes: Lis
     return any(loco.startswith(prefix) for prefix in blocked_prefixes)
 
 
+def blocked_loco_ids(loco_ids, blocked_exact: Set[str], blocked_prefixes: List[str]) -> List[Any]:
+    """
+    Same result as calling loco_is_blocked on every id, but each prefix
+    rule is looked up in a sorted prefix index instead of scanning all ids.
+    """
+    loco_ids = list(loco_ids)
+    index = loco_index.build_prefix_index(
+        (position, normalize_loco(loco_id)) for position, loco_id in enumerate(loco_ids)
+    )
+
+    blocked_positions = {
+        position
+        for value, position in index
+        if value and value in blocked_exact
+    }
+
+    for prefix in blocked_prefixes:
+        blocked_positions.update(position for _value, position in loco_index.prefix_ids(index, prefix))
+
+    return [loco_ids[position] for position in sorted(blocked_positions)]
+
+
 def load_blocked_descriptions() -> Set[str]:
     blocked: Set[str] = set()
     if not os.path.exists(BLOCKED_DESCRIPTIONS_FILE):
@@ -153,18 +221,27 @@ def purge_blocked_records(
     removed_from_history = 0
     blocked_history_ids = set()
 
-    for loco_id in list(locos.keys()):
-        data = locos.get(loco_id, {}) if isinstance(locos.get(loco_id), dict) else {}
-        description = data.get("vehicle_description") or data.get("last_description") or ""
-        if loco_is_blocked(loco_id, blocked_exact, blocked_prefixes) or description_is_blocked(description, blocked_descriptions):
-            blocked_history_ids.add(normalize_loco(loco_id))
-            del locos[loco_id]
-            removed_from_locos += 1
+    for loco_id in blocked_loco_ids(locos.keys(), blocked_exact, blocked_prefixes):
+        blocked_history_ids.add(normalize_loco(loco_id))
+        del locos[loco_id]
+        removed_from_locos += 1
+
+    if blocked_descriptions:
+        for loco_id in list(locos.keys()):
+            data = locos.get(loco_id, {}) if isinstance(locos.get(loco_id), dict) else {}
+            description = data.get("vehicle_description") or data.get("last_description") or ""
+            if description_is_blocked(description, blocked_descriptions):
+                blocked_history_ids.add(normalize_loco(loco_id))
+                del locos[loco_id]
+                removed_from_locos += 1
 
     history_locos = history.get("locos", {}) if isinstance(history, dict) else {}
     if isinstance(history_locos, dict):
+        for loco_id in blocked_loco_ids(history_locos.keys(), blocked_exact, blocked_prefixes):
+            blocked_history_ids.add(normalize_loco(loco_id))
+
         for loco_id in list(history_locos.keys()):
-            if loco_is_blocked(loco_id, blocked_exact, blocked_prefixes) or normalize_loco(loco_id) in blocked_history_ids:
+            if normalize_loco(loco_id) in blocked_history_ids:
                 del history_locos[loco_id]
                 removed_from_history += 1
 
@@ -265,23 +342,33 @@ def create_summary(locos):
         print(f"❌ Failed to create summary: {e}")
 
 
-def update_loco_database():
+def update_loco_database(
+    trains: Optional[List[Dict[str, Any]]] = None,
+    log_sightings: bool = SIGHTING_LOG_ENABLED,
+):
+    """
+    loco_pipeline.py passes the already-parsed trains, and turns off
+    sighting logging because the railops view logs the same sightings.
+    """
     print("=" * 60)
     print("🚂 LOCO DATABASE UPDATER")
     print("=" * 60)
 
-    if not os.path.exists(TRAINS_FILE):
-        print(f"❌ {TRAINS_FILE} not found")
-        return
+    if trains is None:
+        if not os.path.exists(TRAINS_FILE):
+            print(f"❌ {TRAINS_FILE} not found")
+            return
 
-    try:
-        with open(TRAINS_FILE, "r", encoding="utf-8") as f:
-            train_data = json.load(f)
-    except Exception as e:
-        print(f"❌ Failed to read {TRAINS_FILE}: {e}")
-        return
+        memory_profile.mark("load_trains")
+        try:
+            with open(TRAINS_FILE, "r", encoding="utf-8") as f:
+                train_data = json.load(f)
+        except Exception as e:
+            print(f"❌ Failed to read {TRAINS_FILE}: {e}")
+            return
+
+        trains = train_data.get("trains", [])
 
-    trains = train_data.get("trains", [])
     now_utc = utc_now()
     timestamp = utc_iso_now()
     date = now_utc.strftime("%Y-%m-%d")
@@ -289,8 +376,9 @@ def update_loco_database():
 
     print(f"\n📊 Processing {len(trains)} trains...")
 
-    locos = load_json(LOCOS_FILE)
-    history = load_json(HISTORY_FILE)
+    memory_profile.mark("load_state")
+    locos = load_tracker_locos()
+    history = load_tracker_history()
     blocked_exact, blocked_prefixes = load_blocked_loco_rules()
     blocked_descriptions = load_blocked_descriptions()
     print(f"🚫 Blocked exact locos loaded: {len(blocked_exact)}")
@@ -300,23 +388,19 @@ def update_loco_database():
     if not isinstance(locos, dict):
         locos = {}
 
-    if not history or not isinstance(history, dict):
-        history = {"locos": {}, "updates": []}
-
-    if "locos" not in history or not isinstance(history["locos"], dict):
-        history["locos"] = {}
-    if "updates" not in history or not isinstance(history["updates"], list):
-        history["updates"] = []
-
+    memory_profile.mark("purge_blocked")
     removed_locos, removed_history = purge_blocked_records(
         locos, history, blocked_exact, blocked_prefixes, blocked_descriptions
     )
     if removed_locos or removed_history:
-        print(f"🧹 Removed blocked records: {removed_locos} from locos.json, {removed_history} from history")
+        print(f"🧹 Removed blocked records: {removed_locos} from {LOCOS_FILE}, {removed_history} from history")
 
+    memory_profile.mark("ingest")
     new_locos = 0
     updated_locos = 0
     skipped_blocked = 0
+    sightings = []
+    epoch = int(now_utc.timestamp())
 
     for train in trains:
         raw_loco_id = train.get("train_name") or train.get("train_number") or train.get("id")
@@ -367,31 +451,33 @@ def update_loco_database():
 
         locos[loco_id] = loco_data
 
-        if loco_id not in history["locos"]:
-            history["locos"][loco_id] = []
-
-        history["locos"][loco_id].append({
-            "timestamp": timestamp,
-            "lat": train.get("lat"),
-            "lon": train.get("lon"),
-            "speed": train.get("speed", 0)
-        })
-
-        if len(history["locos"][loco_id]) > 100:
-            history["locos"][loco_id] = history["locos"][loco_id][-100:]
-
-    history["updates"].append({
-        "timestamp": timestamp,
-        "trains_seen": len(trains),
-        "locos_seen": len(locos),
-        "blocked_skipped": skipped_blocked
-    })
-
-    if len(history["updates"]) > 1000:
-        history["updates"] = history["updates"][-1000:]
-
+        packed_history.append_position(
+            history,
+            loco_id,
+            epoch,
+            train.get("lat"),
+            train.get("lon"),
+            train.get("speed", 0),
+        )
+
+        sightings.append((
+            loco_id,
+            epoch,
+            train.get("lat"),
+            train.get("lon"),
+            train.get("speed", 0),
+            clean_text(train.get("train_number")),
+        ))
+
+    packed_history.append_update(history, epoch, len(trains), len(locos), skipped_blocked)
+
+    memory_profile.mark("save_state")
     save_json(LOCOS_FILE, dict(sorted(locos.items(), key=lambda x: x[0])))
-    save_json(HISTORY_FILE, history)
+    packed_history.save_history(HISTORY_FILE, history, HISTORY_FORMAT)
+
+    if log_sightings:
+        logged = sighting_log.append_sightings(sightings)
+        print(f"📝 Appended {logged} sightings to {sighting_log.SIGHTINGS_DIR}")
 
     print(f"\n📊 Statistics:")
     print(f"   New locos: {new_locos}")
@@ -399,6 +485,7 @@ def update_loco_database():
     print(f"   Skipped blocked sightings: {skipped_blocked}")
     print(f"   Total visible locos tracked: {len(locos)}")
 
+    memory_profile.mark("exports")
     print("\n📝 Updating export files...")
     export_to_csv(locos)
     create_summary(locos)
@@ -412,4 +499,4 @@ def update_loco_database():
 
 
 if __name__ == "__main__":
-    update_loco_database()
+    memory_profile.run("update_locos", update_loco_database)
@@ -1,9 +1,11 @@
 import os
 import json
+import hashlib
 import sqlite3
 from datetime import datetime
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
 
@@ -24,10 +26,15 @@ os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 def get_db():
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
     return conn
 
-def init_db():
-    conn = get_db()
+def init_db(conn=None):
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
+
     cur = conn.cursor()
 
     cur.execute("""
@@ -40,8 +47,30 @@ def init_db():
         )
     """)
 
+    # data_version is bumped whenever upsert_locos writes. PRAGMA
+    # data_version only sees commits from other connections, so it
+    # cannot tell one run from the next.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', '0')")
+
     conn.commit()
-    conn.close()
+    if own_conn:
+        conn.close()
+
+def get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else default
+
+def set_meta(conn, key, value):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value)
+    )
 
 # =========================
 # Blocked list
@@ -105,22 +134,27 @@ def scrape_latest_locos():
 # =========================
 # Insert / update logic
 # =========================
-def upsert_locos(scraped_locos):
-    conn = get_db()
-    cur = conn.cursor()
+def upsert_locos(scraped_locos, conn=None):
+    """
+    Bulk upsert. Rows are cleaned in Python, staged into a temp table
+    with executemany, then applied with one INSERT ... ON CONFLICT that
+    only touches rows whose operator/description changed. New locos get
+    date_time_added; existing ones keep theirs. If a loco appears more
+    than once in scraped_locos, the last row wins.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
 
     blocked = load_blocked_locos()
     now_str = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
 
-    added_count = 0
-    updated_count = 0
     skipped_blocked = 0
     skipped_blank = 0
+    staged = {}
 
     for row in scraped_locos:
         loco_number = normalise_loco(row.get("loco_number"))
-        current_operator = clean_text(row.get("current_operator"))
-        vehicle_description = clean_text(row.get("vehicle_description"))
 
         if not loco_number:
             skipped_blank += 1
@@ -130,41 +164,64 @@ def upsert_locos(scraped_locos):
             skipped_blocked += 1
             continue
 
-        cur.execute(
-            "SELECT id, current_operator, vehicle_description, date_time_added FROM locos WHERE loco_number = ?",
-            (loco_number,)
+        staged[loco_number] = (
+            loco_number,
+            clean_text(row.get("current_operator")),
+            clean_text(row.get("vehicle_description")),
         )
-        existing = cur.fetchone()
-
-        if existing:
-            # Update operator/description if changed, but keep original date_time_added
-            if (
-                clean_text(existing["current_operator"]) != current_operator
-                or clean_text(existing["vehicle_description"]) != vehicle_description
-            ):
-                cur.execute("""
-                    UPDATE locos
-                    SET current_operator = ?, vehicle_description = ?
-                    WHERE loco_number = ?
-                """, (current_operator, vehicle_description, loco_number))
-                updated_count += 1
-        else:
-            cur.execute("""
-                INSERT INTO locos (
-                    loco_number,
-                    current_operator,
-                    vehicle_description,
-                    date_time_added
-                ) VALUES (?, ?, ?, ?)
-            """, (loco_number, current_operator, vehicle_description, now_str))
-            added_count += 1
 
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS staged_locos (
+                loco_number TEXT PRIMARY KEY,
+                current_operator TEXT NOT NULL,
+                vehicle_description TEXT NOT NULL
+            )
+        """)
+        conn.execute("DELETE FROM staged_locos")
+        conn.executemany(
+            "INSERT INTO staged_locos (loco_number, current_operator, vehicle_description) VALUES (?, ?, ?)",
+            staged.values()
+        )
+
+        # ids are AUTOINCREMENT, so rows above the current max are new.
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM locos").fetchone()[0]
+        changes_before = conn.total_changes
+
+        # "WHERE true" keeps SQLite from reading ON CONFLICT as a join clause.
+        conn.execute("""
+            INSERT INTO locos (
+                loco_number,
+                current_operator,
+                vehicle_description,
+                date_time_added
+            )
+            SELECT loco_number, current_operator, vehicle_description, ?
+            FROM staged_locos
+            WHERE true
+            ON CONFLICT(loco_number) DO UPDATE SET
+                current_operator = excluded.current_operator,
+                vehicle_description = excluded.vehicle_description
+            WHERE COALESCE(locos.current_operator, '') != excluded.current_operator
+               OR COALESCE(locos.vehicle_description, '') != excluded.vehicle_description
+        """, (now_str,))
+
+        written = conn.total_changes - changes_before
+        added_count = conn.execute("SELECT COUNT(*) FROM locos WHERE id > ?", (last_id,)).fetchone()[0]
+        updated_count = written - added_count
+
+        if written:
+            conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'data_version'")
+
+        conn.execute("DELETE FROM staged_locos")
+
+    if own_conn:
+        conn.close()
 
     return {
         "added": added_count,
         "updated": updated_count,
+        "unchanged": len(staged) - added_count - updated_count,
         "skipped_blocked": skipped_blocked,
         "skipped_blank": skipped_blank
     }
@@ -172,27 +229,115 @@ def upsert_locos(scraped_locos):
 # =========================
 # Export spreadsheet
 # =========================
-def export_loco_spreadsheet():
-    conn = get_db()
-    cur = conn.cursor()
+LOCO_HEADERS = [
+    "Loco Number",
+    "Current Operator",
+    "Vehicle Description",
+    "Date/Time Added",
+]
+
+LOCO_WIDTHS = {
+    1: 18,
+    2: 24,
+    3: 38,
+    4: 22,
+}
+
+INSTRUCTIONS = [
+    "How to use this file:",
+    "",
+    "1. Locos sheet = your current live loco database.",
+    "2. Blocked sheet = locos you never want re-added.",
+    "3. Print View sheet = clean printable version.",
+    "4. To permanently exclude a loco, add its number to blocked_locos.txt in the backend.",
+    "5. This workbook is automatically rebuilt by the updater.",
+]
+
+# Shared by every header cell.
+HEADER_FONT = Font(bold=True)
+HEADER_ALIGNMENT = Alignment(horizontal="center")
+
+def blocked_file_hash():
+    if not os.path.exists(BLOCKED_PATH):
+        return ""
 
-    cur.execute("""
-        SELECT
-            loco_number,
-            current_operator,
-            vehicle_description,
-            date_time_added
-        FROM locos
-        ORDER BY loco_number COLLATE NOCASE ASC
-    """)
-    rows = cur.fetchall()
-    conn.close()
+    with open(BLOCKED_PATH, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+def export_version(conn):
+    """
+    What the workbook is built from: the DB data_version plus the
+    blocked_locos.txt contents.
+    """
+    return f"{get_meta(conn, 'data_version', '0')}:{blocked_file_hash()}"
 
-    wb = Workbook()
+def xlsx_file_state():
+    """
+    Size and mtime of the saved workbook, so a file replaced by
+    something else (e.g. railops_loco_database.py) is rebuilt.
+    """
+    if not os.path.exists(XLSX_PATH):
+        return None
+
+    stat = os.stat(XLSX_PATH)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def header_cells(ws, headers, centred=True):
+    cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = HEADER_FONT
+        if centred:
+            cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+def write_loco_sheet(ws, rows):
+    for col_idx, width in LOCO_WIDTHS.items():
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
 
-    # Remove default sheet and create proper ones
-    default_ws = wb.active
-    wb.remove(default_ws)
+    # Freeze top row
+    ws.freeze_panes = "A2"
+
+    ws.append(header_cells(ws, LOCO_HEADERS))
+
+    for row in rows:
+        ws.append(row)
+
+def export_loco_spreadsheet(conn=None, force=False):
+    """
+    Rebuilds static/downloads/loco_database.xlsx when export_version()
+    has moved since the last export (or the file is missing/replaced).
+    Returns True if the workbook was written.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db()
+        init_db(conn)
+
+    version = export_version(conn)
+    saved = json.loads(get_meta(conn, "xlsx_export", "null") or "null")
+
+    if not force and saved and saved.get("version") == version and saved.get("file") == xlsx_file_state():
+        print(f"Spreadsheet unchanged (data version {version}), skipped rebuild")
+        if own_conn:
+            conn.close()
+        return False
+
+    rows = [
+        tuple(row)
+        for row in conn.execute("""
+            SELECT
+                loco_number,
+                current_operator,
+                vehicle_description,
+                date_time_added
+            FROM locos
+            ORDER BY loco_number COLLATE NOCASE ASC
+        """)
+    ]
+
+    wb = Workbook(write_only=True)
 
     ws_locos = wb.create_sheet("Locos")
     ws_blocked = wb.create_sheet("Blocked")
@@ -202,117 +347,62 @@ def export_loco_spreadsheet():
     # -------------------------
     # Locos sheet
     # -------------------------
-    loco_headers = [
-        "Loco Number",
-        "Current Operator",
-        "Vehicle Description",
-        "Date/Time Added",
-    ]
-    ws_locos.append(loco_headers)
-
-    for cell in ws_locos[1]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal="center")
-
-    for row in rows:
-        ws_locos.append([
-            row["loco_number"],
-            row["current_operator"],
-            row["vehicle_description"],
-            row["date_time_added"],
-        ])
-
-    # Set widths
-    widths = {
-        1: 18,
-        2: 24,
-        3: 38,
-        4: 22,
-    }
-    for col_idx, width in widths.items():
-        ws_locos.column_dimensions[get_column_letter(col_idx)].width = width
-
-    # Freeze top row
-    ws_locos.freeze_panes = "A2"
+    write_loco_sheet(ws_locos, rows)
 
     # -------------------------
     # Blocked sheet
     # -------------------------
-    ws_blocked.append(["Blocked Loco Number"])
-    ws_blocked["A1"].font = Font(bold=True)
     ws_blocked.column_dimensions["A"].width = 22
+    ws_blocked.append(header_cells(ws_blocked, ["Blocked Loco Number"], centred=False))
 
-    blocked = sorted(load_blocked_locos())
-    for loco in blocked:
+    for loco in sorted(load_blocked_locos()):
         ws_blocked.append([loco])
 
     # -------------------------
     # Print View sheet
     # -------------------------
-    print_headers = [
-        "Loco Number",
-        "Current Operator",
-        "Vehicle Description",
-        "Date/Time Added",
-    ]
-    ws_print.append(print_headers)
-
-    for cell in ws_print[1]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal="center")
-
-    for row in rows:
-        ws_print.append([
-            row["loco_number"],
-            row["current_operator"],
-            row["vehicle_description"],
-            row["date_time_added"],
-        ])
-
-    for col_idx, width in widths.items():
-        ws_print.column_dimensions[get_column_letter(col_idx)].width = width
-
-    ws_print.freeze_panes = "A2"
-
     # Print settings
     ws_print.page_setup.orientation = "landscape"
     ws_print.page_setup.fitToWidth = 1
     ws_print.page_setup.fitToHeight = False
     ws_print.print_title_rows = "1:1"
 
+    write_loco_sheet(ws_print, rows)
+
     # -------------------------
     # Instructions sheet
     # -------------------------
-    instructions = [
-        "How to use this file:",
-        "",
-        "1. Locos sheet = your current live loco database.",
-        "2. Blocked sheet = locos you never want re-added.",
-        "3. Print View sheet = clean printable version.",
-        "4. To permanently exclude a loco, add its number to blocked_locos.txt in the backend.",
-        "5. This workbook is automatically rebuilt by the updater.",
-    ]
-    for line in instructions:
-        ws_info.append([line])
     ws_info.column_dimensions["A"].width = 90
+    for line in INSTRUCTIONS:
+        ws_info.append([line])
 
-    # OpenPyXL saves xlsx workbooks directly to disk.
+    # Write-only workbooks stream each sheet straight to disk.
     wb.save(XLSX_PATH)
 
+    with conn:
+        set_meta(conn, "xlsx_export", json.dumps({"version": version, "file": xlsx_file_state()}))
+
+    if own_conn:
+        conn.close()
+
+    return True
+
 # =========================
 # Main run
 # =========================
 def main():
-    init_db()
+    conn = get_db()
+    init_db(conn)
 
     # 1. Scrape latest locos
     scraped_locos = scrape_latest_locos()
 
     # 2. Update DB
-    stats = upsert_locos(scraped_locos)
+    stats = upsert_locos(scraped_locos, conn)
 
-    # 3. Export spreadsheet
-    export_loco_spreadsheet()
+    # 3. Export spreadsheet (skipped when nothing changed)
+    stats["spreadsheet_rebuilt"] = export_loco_spreadsheet(conn)
+    conn.close()
 
     # 4. Console log
     print("Loco update complete")
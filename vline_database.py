@@ -1,10 +1,13 @@
 import csv
-import html
+import hashlib
 import json
 import re
 from datetime import datetime, timezone
 from pathlib import Path
 
+import memory_profile
+import train_partition
+
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -13,10 +16,33 @@ TRAINS_FILE = BASE_DIR / "trains.json"
 VLINE_JSON_FILE = BASE_DIR / "vline_services.json"
 VLINE_CSV_FILE = BASE_DIR / "vline_services.csv"
 
+# Every V/Line service ever seen, keyed by train ID, with first_seen,
+# last_seen and active (seen in the latest scrape). The JSON/CSV/HTML
+# outputs above are views of it.
+VLINE_STORE_FILE = BASE_DIR / "vline_store.json"
+VLINE_STORE_VERSION = 1
+
+# Fields that trigger an output rebuild when they change. lat/lon move
+# every scrape; they are kept up to date in the store and written out
+# with the next rebuild.
+VLINE_TRACKED_FIELDS = [
+    "train_id",
+    "service_number",
+    "route",
+    "origin",
+    "destination",
+    "current_operator",
+    "vehicle_description",
+    "date_time_added",
+    "active",
+]
+
 DOWNLOADS_DIR = BASE_DIR / "static" / "downloads"
 VLINE_HTML_FILE = DOWNLOADS_DIR / "vline_services.html"
 
-VLINE_PREFIX_RE = re.compile(r"^VLINE", re.IGNORECASE)
+# Compact rows fetched by the (static) vline_services.html page. Its
+# "version" is also the ETag app.py serves it with.
+VLINE_DATA_FILE = DOWNLOADS_DIR / "vline_services_data.json"
 
 
 def load_json(path: Path, default):
@@ -55,28 +81,6 @@ def normalise_train_id(value):
     return value
 
 
-def looks_like_vline(item):
-    fields = [
-        first_value(item, ["loco_number", "loco", "trKey", "train_name", "trainName", "name", "id", "ID"]),
-        first_value(item, ["train_id", "trainId", "train_number", "trainNumber", "service", "service_number"]),
-        first_value(item, ["vehicle_description", "description", "desc"]),
-        first_value(item, ["route", "service_name", "serviceName"]),
-        first_value(item, ["current_operator", "operator", "owner"]),
-    ]
-
-    joined = " ".join(fields).upper()
-
-    if "VLINE" in joined or "V/LINE" in joined or "V-LINE" in joined:
-        return True
-
-    for value in fields:
-        cleaned = normalise_train_id(value)
-        if VLINE_PREFIX_RE.match(cleaned):
-            return True
-
-    return False
-
-
 def parse_generated_time(item):
     value = first_value(
         item,
@@ -200,49 +204,123 @@ def service_sort_key(row):
     return (1, train_id)
 
 
-def generate_html(rows, generated_iso):
-    escaped_rows = []
+def service_key(service):
+    return service.get("train_id") or service.get("service_number")
+
+
+def seed_store_from_outputs():
+    """
+    First run with the store: start from the last vline_services.json so
+    services already published keep their place.
+    """
+    payload = load_json(VLINE_JSON_FILE, {})
+    services = payload.get("services", []) if isinstance(payload, dict) else []
+    generated = clean_text(payload.get("generated")) if isinstance(payload, dict) else ""
+    seeded = {}
+
+    for service in services:
+        if not isinstance(service, dict) or not service_key(service):
+            continue
+
+        record = dict(service)
+        record.setdefault("first_seen", generated)
+        record.setdefault("last_seen", generated)
+        record.setdefault("active", True)
+        seeded[service_key(service)] = record
+
+    return seeded
+
+
+def load_store():
+    payload = load_json(VLINE_STORE_FILE, None)
+
+    if isinstance(payload, dict) and payload.get("version") == VLINE_STORE_VERSION:
+        return payload
+
+    return {
+        "version": VLINE_STORE_VERSION,
+        "outputs_digest": "",
+        "services": seed_store_from_outputs(),
+    }
+
+
+def merge_services(store, found, now_iso):
+    """
+    Merges this run's services into the store in place. Returns the
+    changed-rows summary.
+    """
+    services = store["services"]
+    summary = {
+        "added": [],
+        "updated": [],
+        "reactivated": [],
+        "deactivated": [],
+        "unchanged": 0,
+    }
+
+    for key, service in found.items():
+        existing = services.get(key)
+
+        if existing is None:
+            record = dict(service)
+            record["first_seen"] = now_iso
+            record["last_seen"] = now_iso
+            record["active"] = True
+            services[key] = record
+            summary["added"].append(key)
+            continue
+
+        before = [existing.get(field) for field in VLINE_TRACKED_FIELDS]
+        was_active = existing.get("active", False)
+
+        for field, value in service.items():
+            # Keep the first sighting's added time, like the loco database.
+            if field == "date_time_added" and existing.get(field):
+                continue
+
+            if value not in [None, ""]:
+                existing[field] = value
+
+        existing["last_seen"] = now_iso
+        existing["active"] = True
+
+        if not was_active:
+            summary["reactivated"].append(key)
+        elif before != [existing.get(field) for field in VLINE_TRACKED_FIELDS]:
+            summary["updated"].append(key)
+        else:
+            summary["unchanged"] += 1
+
+    for key, record in services.items():
+        if key not in found and record.get("active"):
+            record["active"] = False
+            summary["deactivated"].append(key)
+
+    return summary
+
+
+def outputs_digest(rows):
+    digest = hashlib.sha256()
 
     for row in rows:
-        escaped_rows.append(
-            {
-                key: html.escape(clean_text(value))
-                for key, value in row.items()
-            }
-        )
+        digest.update(json.dumps([row.get(field) for field in VLINE_TRACKED_FIELDS], ensure_ascii=False).encode("utf-8"))
+        digest.update(b"\n")
 
-    table_rows = ""
-
-    if escaped_rows:
-        for row in escaped_rows:
-            table_rows += f"""
-<tr>
-  <td><strong>{row.get("train_id", "")}</strong></td>
-  <td>{row.get("service_number", "")}</td>
-  <td>{row.get("route", "")}</td>
-  <td>{row.get("current_operator", "")}</td>
-  <td>{row.get("vehicle_description", "")}</td>
-  <td>
-    <strong class="time-local" data-raw="{row.get("date_time_added", "")}">{row.get("date_time_added", "")}</strong>
-    <div class="raw">Raw: {row.get("date_time_added", "")}</div>
-  </td>
-</tr>
-"""
-    else:
-        table_rows = """
-<tr>
-  <td colspan="6">No V/Line services found yet.</td>
-</tr>
-"""
+    return digest.hexdigest()
+
+
+def outputs_missing():
+    return not all(path.exists() for path in [VLINE_JSON_FILE, VLINE_CSV_FILE, VLINE_DATA_FILE])
 
-    return f"""<!doctype html>
+
+VLINE_PAGE_TEMPLATE = """<!doctype html>
 <html lang="en">
 <head>
 <meta charset="utf-8">
 <meta name="viewport" content="width=device-width, initial-scale=1">
 <title>RailOps V/Line Services</title>
 <style>
-:root {{
+:root {
   --bg: #041326;
   --panel: #0b1f3a;
   --panel2: #102b4f;
@@ -251,60 +329,60 @@ def generate_html(rows, generated_iso):
   --muted: #a9bfdc;
   --blue: #5ab6ff;
   --green: #35b46f;
-}}
+}
 
-* {{
+* {
   box-sizing: border-box;
-}}
+}
 
-html, body {{
+html, body {
   margin: 0;
   padding: 0;
   background: radial-gradient(circle at top, #0a2b54 0%, #041326 48%, #020b16 100%);
   color: var(--text);
   font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Arial, sans-serif;
-}}
+}
 
-body {{
+body {
   padding: 18px;
-}}
+}
 
-.wrap {{
+.wrap {
   width: min(1180px, 100%);
   margin: 0 auto;
-}}
+}
 
-.card {{
+.card {
   background: rgba(11,31,58,.92);
   border: 1px solid rgba(90,182,255,.22);
   border-radius: 26px;
   padding: 22px;
   margin-bottom: 22px;
   box-shadow: 0 14px 34px rgba(0,0,0,.28);
-}}
+}
 
-h1 {{
+h1 {
   margin: 0 0 10px;
   font-size: clamp(34px, 6vw, 62px);
   line-height: 1.05;
   letter-spacing: -.04em;
-}}
+}
 
-p {{
+p {
   color: var(--muted);
   font-size: clamp(18px, 4vw, 28px);
   line-height: 1.35;
   margin: 0 0 18px;
-}}
+}
 
-.pills {{
+.pills {
   display: flex;
   flex-wrap: wrap;
   gap: 10px;
   margin-top: 14px;
-}}
+}
 
-.pill {{
+.pill {
   display: inline-flex;
   align-items: center;
   min-height: 42px;
@@ -314,21 +392,21 @@ p {{
   border: 1px solid rgba(90,182,255,.35);
   font-weight: 800;
   font-size: 16px;
-}}
+}
 
-.pill.green {{
+.pill.green {
   background: rgba(53,180,111,.18);
   border-color: rgba(53,180,111,.42);
-}}
+}
 
-.actions {{
+.actions {
   display: flex;
   flex-wrap: wrap;
   gap: 12px;
   margin-top: 18px;
-}}
+}
 
-button, a.btn {{
+button, a.btn {
   display: inline-flex;
   justify-content: center;
   align-items: center;
@@ -341,14 +419,14 @@ button, a.btn {{
   font-size: 17px;
   font-weight: 800;
   cursor: pointer;
-}}
+}
 
-button.active {{
+button.active {
   background: linear-gradient(180deg, #5ab6ff, #2f8fff);
   color: #06111f;
-}}
+}
 
-.search {{
+.search {
   width: 100%;
   min-height: 56px;
   border-radius: 18px;
@@ -359,61 +437,71 @@ button.active {{
   padding: 12px 16px;
   outline: none;
   margin-top: 16px;
-}}
+}
 
-.table-wrap {{
+.table-wrap {
   overflow: auto;
   border: 1px solid rgba(90,182,255,.22);
   border-radius: 24px;
   background: rgba(6,18,34,.60);
-}}
+}
 
-table {{
+table {
   width: 100%;
   border-collapse: collapse;
   min-width: 980px;
-}}
+}
 
-th, td {{
+th, td {
   text-align: left;
   vertical-align: top;
   padding: 16px;
   border-bottom: 1px solid rgba(90,182,255,.18);
   font-size: 18px;
-}}
+}
 
-th {{
+th {
   background: rgba(90,182,255,.11);
   font-size: 19px;
   font-weight: 900;
   position: sticky;
   top: 0;
   z-index: 2;
-}}
+}
 
-.raw {{
+.raw {
   color: var(--muted);
   font-size: 14px;
   margin-top: 6px;
-}}
+}
+
+tr.inactive td {
+  opacity: .55;
+}
 
-@media(max-width: 760px) {{
-  body {{
+.status {
+  color: var(--muted);
+  font-size: 16px;
+  margin-top: 14px;
+}
+
+@media(max-width: 760px) {
+  body {
     padding: 12px;
-  }}
+  }
 
-  .card {{
+  .card {
     padding: 18px;
-  }}
+  }
 
-  .actions {{
+  .actions {
     display: grid;
-  }}
+  }
 
-  button, a.btn {{
+  button, a.btn {
     width: 100%;
-  }}
-}}
+  }
+}
 </style>
 </head>
 <body>
@@ -423,21 +511,24 @@ th {{
     <p>V/Line regional passenger train IDs separated from the locomotive database.</p>
 
     <div class="pills">
-      <span class="pill green">Visible V/Line services: {len(rows)}</span>
-      <span class="pill">Generated: <span class="time-local" data-raw="{html.escape(generated_iso)}">{html.escape(generated_iso)}</span></span>
+      <span class="pill green">Active V/Line services: <span id="activeCount">-</span></span>
+      <span class="pill">Known services: <span id="knownCount">-</span></span>
+      <span class="pill">Generated: <span id="generated">-</span></span>
       <span class="pill">Times shown in your phone/browser timezone</span>
     </div>
 
     <input class="search" id="searchBox" placeholder="Search V/Line ID, route, service number..." autocomplete="off">
 
     <div class="actions">
-      <button id="allBtn" class="active" type="button">All</button>
-      <button id="bendigoBtn" type="button">Bendigo</button>
-      <button id="ballaratBtn" type="button">Ballarat</button>
-      <button id="geelongBtn" type="button">Geelong</button>
-      <button id="gippslandBtn" type="button">Gippsland</button>
-      <button id="clearBtn" type="button">Clear Filter</button>
+      <button id="allBtn" class="active" type="button" data-filter="">All</button>
+      <button type="button" data-filter="Bendigo">Bendigo</button>
+      <button type="button" data-filter="Ballarat">Ballarat</button>
+      <button type="button" data-filter="Geelong">Geelong</button>
+      <button type="button" data-filter="Gippsland">Gippsland</button>
+      <button id="clearBtn" type="button" data-filter="">Clear Filter</button>
     </div>
+
+    <div class="status" id="status">Loading services...</div>
   </section>
 
   <section class="card">
@@ -451,96 +542,186 @@ th {{
             <th>Operator</th>
             <th>Description</th>
             <th>Date/Time Added</th>
+            <th>Last Seen</th>
           </tr>
         </thead>
-        <tbody>
-          {table_rows}
-        </tbody>
+        <tbody></tbody>
       </table>
     </div>
   </section>
 </div>
 
 <script>
-function formatLocalTimes() {{
-  document.querySelectorAll(".time-local").forEach(el => {{
-    const raw = el.dataset.raw || el.textContent;
-    const d = new Date(raw);
-    if (Number.isNaN(d.getTime())) return;
-
-    el.textContent = new Intl.DateTimeFormat(navigator.language || "en-AU", {{
-      day: "2-digit",
-      month: "short",
-      year: "numeric",
-      hour: "numeric",
-      minute: "2-digit",
-      hour12: true,
-      timeZoneName: "short"
-    }}).format(d);
-  }});
-}}
-
-function setActive(button) {{
-  document.querySelectorAll(".actions button").forEach(btn => btn.classList.remove("active"));
-  button.classList.add("active");
-}}
-
-function filterTable(text) {{
+// Rows come from vline_services_data.json. "no-cache" makes the browser
+// revalidate with If-None-Match, so an unchanged list is a 304.
+const DATA_URL = "vline_services_data.json";
+
+const timeFormat = new Intl.DateTimeFormat(navigator.language || "en-AU", {
+  day: "2-digit",
+  month: "short",
+  year: "numeric",
+  hour: "numeric",
+  minute: "2-digit",
+  hour12: true,
+  timeZoneName: "short"
+});
+
+function localTime(raw) {
+  const d = new Date(raw);
+  return Number.isNaN(d.getTime()) ? (raw || "") : timeFormat.format(d);
+}
+
+function cell(tr, text, strong, extraText) {
+  const td = document.createElement("td");
+  const main = document.createElement(strong ? "strong" : "span");
+  main.textContent = text || "";
+  td.appendChild(main);
+
+  if (extraText) {
+    const extra = document.createElement("div");
+    extra.className = "raw";
+    extra.textContent = extraText;
+    td.appendChild(extra);
+  }
+
+  tr.appendChild(td);
+}
+
+function render(data) {
+  const body = document.querySelector("#serviceTable tbody");
+  const fragment = document.createDocumentFragment();
+  const operators = data.operators || [];
+  const descriptions = data.descriptions || [];
+
+  // [train_id, service_number, route, operator id, description id,
+  //  date_time_added, last_seen, active]
+  (data.rows || []).forEach(row => {
+    const tr = document.createElement("tr");
+    if (!row[7]) tr.className = "inactive";
+
+    cell(tr, row[0], true);
+    cell(tr, row[1]);
+    cell(tr, row[2]);
+    cell(tr, operators[row[3]]);
+    cell(tr, descriptions[row[4]]);
+    cell(tr, localTime(row[5]), true, "Raw: " + (row[5] || ""));
+    cell(tr, row[7] ? "Active" : "Not seen", true, row[6] ? localTime(row[6]) : "");
+
+    fragment.appendChild(tr);
+  });
+
+  if (!fragment.childNodes.length) {
+    const tr = document.createElement("tr");
+    const td = document.createElement("td");
+    td.colSpan = 7;
+    td.textContent = "No V/Line services found yet.";
+    tr.appendChild(td);
+    fragment.appendChild(tr);
+  }
+
+  body.replaceChildren(fragment);
+
+  document.getElementById("activeCount").textContent = data.active;
+  document.getElementById("knownCount").textContent = data.count;
+  document.getElementById("generated").textContent = localTime(data.generated);
+  document.getElementById("status").textContent = "";
+
+  filterTable(document.getElementById("searchBox").value);
+}
+
+function filterTable(text) {
   const needle = String(text || "").toLowerCase();
 
-  document.querySelectorAll("#serviceTable tbody tr").forEach(row => {{
+  document.querySelectorAll("#serviceTable tbody tr").forEach(row => {
     const haystack = row.textContent.toLowerCase();
     row.style.display = haystack.includes(needle) ? "" : "none";
-  }});
-}}
+  });
+}
+
+function setActive(button) {
+  document.querySelectorAll(".actions button").forEach(btn => btn.classList.remove("active"));
+  button.classList.add("active");
+}
 
-document.getElementById("searchBox").addEventListener("input", e => {{
+document.getElementById("searchBox").addEventListener("input", e => {
   filterTable(e.target.value);
-}});
-
-document.getElementById("allBtn").addEventListener("click", e => {{
-  setActive(e.target);
-  document.getElementById("searchBox").value = "";
-  filterTable("");
-}});
-
-document.getElementById("bendigoBtn").addEventListener("click", e => {{
-  setActive(e.target);
-  document.getElementById("searchBox").value = "Bendigo";
-  filterTable("Bendigo");
-}});
-
-document.getElementById("ballaratBtn").addEventListener("click", e => {{
-  setActive(e.target);
-  document.getElementById("searchBox").value = "Ballarat";
-  filterTable("Ballarat");
-}});
-
-document.getElementById("geelongBtn").addEventListener("click", e => {{
-  setActive(e.target);
-  document.getElementById("searchBox").value = "Geelong";
-  filterTable("Geelong");
-}});
-
-document.getElementById("gippslandBtn").addEventListener("click", e => {{
-  setActive(e.target);
-  document.getElementById("searchBox").value = "Gippsland";
-  filterTable("Gippsland");
-}});
-
-document.getElementById("clearBtn").addEventListener("click", e => {{
-  setActive(document.getElementById("allBtn"));
-  document.getElementById("searchBox").value = "";
-  filterTable("");
-}});
-
-formatLocalTimes();
+});
+
+document.querySelectorAll(".actions button").forEach(button => {
+  button.addEventListener("click", () => {
+    setActive(button.id === "clearBtn" ? document.getElementById("allBtn") : button);
+    document.getElementById("searchBox").value = button.dataset.filter;
+    filterTable(button.dataset.filter);
+  });
+});
+
+fetch(DATA_URL, { cache: "no-cache" })
+  .then(response => {
+    if (!response.ok) throw new Error("HTTP " + response.status);
+    return response.json();
+  })
+  .then(render)
+  .catch(error => {
+    document.getElementById("status").textContent = "Could not load V/Line services: " + error.message;
+  });
 </script>
 </body>
 </html>
 """
 
 
+def services_payload(rows, generated_iso, version):
+    """
+    Compact data for the V/Line page. Operators and descriptions repeat,
+    so rows store an index into shared lists instead of the text.
+    """
+    operators = {}
+    descriptions = {}
+    compact_rows = []
+
+    for row in rows:
+        compact_rows.append(
+            [
+                clean_text(row.get("train_id")),
+                clean_text(row.get("service_number")),
+                clean_text(row.get("route")),
+                operators.setdefault(clean_text(row.get("current_operator")), len(operators)),
+                descriptions.setdefault(clean_text(row.get("vehicle_description")), len(descriptions)),
+                clean_text(row.get("date_time_added")),
+                # Only kept for services no longer seen; for active ones
+                # it would go stale between rebuilds.
+                "" if row.get("active", True) else clean_text(row.get("last_seen")),
+                1 if row.get("active", True) else 0,
+            ]
+        )
+
+    return {
+        "version": version,
+        "generated": generated_iso,
+        "count": len(compact_rows),
+        "active": sum(row[7] for row in compact_rows),
+        "operators": list(operators),
+        "descriptions": list(descriptions),
+        "rows": compact_rows,
+    }
+
+
+def write_page_template():
+    """
+    The page never changes between runs, so it is only written when
+    missing or when VLINE_PAGE_TEMPLATE itself changed.
+    """
+    try:
+        if VLINE_HTML_FILE.read_text(encoding="utf-8") == VLINE_PAGE_TEMPLATE:
+            return False
+    except OSError:
+        pass
+
+    VLINE_HTML_FILE.parent.mkdir(parents=True, exist_ok=True)
+    VLINE_HTML_FILE.write_text(VLINE_PAGE_TEMPLATE, encoding="utf-8")
+    return True
+
+
 def write_csv(rows):
     VLINE_CSV_FILE.parent.mkdir(parents=True, exist_ok=True)
 
@@ -556,6 +737,9 @@ def write_csv(rows):
         "lat",
         "lon",
         "source",
+        "first_seen",
+        "last_seen",
+        "active",
     ]
 
     with VLINE_CSV_FILE.open("w", newline="", encoding="utf-8") as handle:
@@ -565,57 +749,109 @@ def write_csv(rows):
             writer.writerow({field: row.get(field, "") for field in fields})
 
 
-def main():
+def main(partition=None):
+    """
+    loco_pipeline.py passes the train_partition result; run on its own,
+    trains.json is read and partitioned here.
+    """
     print("=== RAILOPS VLINE DATABASE START ===", flush=True)
 
-    payload = load_json(TRAINS_FILE, {})
-    trains = payload.get("trains", payload if isinstance(payload, list) else [])
+    if partition is None:
+        memory_profile.mark("load_trains")
+        payload = load_json(TRAINS_FILE, {})
+        trains = payload.get("trains", payload if isinstance(payload, list) else [])
 
-    if not isinstance(trains, list):
-        trains = []
+        if not isinstance(trains, list):
+            trains = []
 
-    found = {}
+        partition = train_partition.partition_trains(trains)
+        print(train_partition.describe(partition), flush=True)
 
-    for item in trains:
-        if not isinstance(item, dict):
-            continue
+    memory_profile.mark("extract")
+    found = {}
 
-        if not looks_like_vline(item):
-            continue
+    # The vline stream plus V/Line-operated or -described trains the
+    # partitioner left in the other streams.
+    candidates = partition["vline"] + partition["vline_mentions"]
 
+    for item in candidates:
         service = extract_vline_service(item)
-        key = service.get("train_id") or service.get("service_number")
+        key = service_key(service)
 
         if not key:
             continue
 
         found[key] = service
 
-    rows = sorted(found.values(), key=service_sort_key)
-
+    memory_profile.mark("merge")
     generated_iso = datetime.now(timezone.utc).isoformat()
+    store = load_store()
+    summary = merge_services(store, found, generated_iso)
+
+    rows = sorted(store["services"].values(), key=service_sort_key)
+    active_count = sum(1 for row in rows if row.get("active"))
+    digest = outputs_digest(rows)
+
+    print(f"V/Line services seen this run: {len(found)}", flush=True)
+    print(
+        f"V/Line store: {len(summary['added'])} added, {len(summary['updated'])} updated, "
+        f"{len(summary['reactivated'])} reactivated, {len(summary['deactivated'])} no longer seen, "
+        f"{summary['unchanged']} unchanged",
+        flush=True,
+    )
 
-    output = {
+    for label in ["added", "updated", "reactivated", "deactivated"]:
+        if summary[label]:
+            print(f"  {label}: {', '.join(summary[label])}", flush=True)
+
+    memory_profile.mark("outputs")
+    rebuild = digest != store.get("outputs_digest") or outputs_missing()
+
+    if rebuild:
+        output = {
+            "generated": generated_iso,
+            "count": len(rows),
+            "active_count": active_count,
+            "source": "trains.json",
+            "services": rows,
+        }
+
+        save_json(VLINE_JSON_FILE, output)
+        write_csv(rows)
+
+        DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        VLINE_DATA_FILE.write_text(
+            json.dumps(services_payload(rows, generated_iso, digest[:16]), ensure_ascii=False, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        store["outputs_digest"] = digest
+
+    page_written = write_page_template()
+
+    store["last_run"] = {
         "generated": generated_iso,
-        "count": len(rows),
-        "source": "trains.json",
-        "services": rows,
+        "seen": len(found),
+        "active": active_count,
+        "added": len(summary["added"]),
+        "updated": len(summary["updated"]),
+        "reactivated": len(summary["reactivated"]),
+        "deactivated": len(summary["deactivated"]),
+        "outputs_rebuilt": rebuild,
     }
+    save_json(VLINE_STORE_FILE, store)
+
+    print(f"V/Line services known: {len(rows)} ({active_count} active)", flush=True)
+    print(f"Wrote: {VLINE_STORE_FILE}", flush=True)
 
-    save_json(VLINE_JSON_FILE, output)
-    write_csv(rows)
+    for path in [VLINE_JSON_FILE, VLINE_CSV_FILE, VLINE_DATA_FILE]:
+        print(f"{'Wrote' if rebuild else 'Unchanged'}: {path}", flush=True)
 
-    DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
-    VLINE_HTML_FILE.write_text(generate_html(rows, generated_iso), encoding="utf-8")
+    print(f"{'Wrote' if page_written else 'Unchanged'}: {VLINE_HTML_FILE}", flush=True)
 
-    print(f"V/Line services found: {len(rows)}", flush=True)
-    print(f"Wrote: {VLINE_JSON_FILE}", flush=True)
-    print(f"Wrote: {VLINE_CSV_FILE}", flush=True)
-    print(f"Wrote: {VLINE_HTML_FILE}", flush=True)
     print("=== RAILOPS VLINE DATABASE DONE ===", flush=True)
 
     return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(memory_profile.run("vline_database", main))
@@ -0,0 +1,550 @@
+import json
+import re
+import sys
+from html.parser import HTMLParser
+
+
+# ============================================================
+# WebRAMS page extraction
+#
+# Turns a whole WebRAMS page into one plain dict, so the scraper reads
+# tables and label/value pairs without a WebDriver round trip per row
+# or cell:
+#
+#   {
+#     "text":   normalised page text,
+#     "tables": [{"heading": last h1/h2/h3 before the table,
+#                 "offset":  position in "text" where the table starts,
+#                 "rows":    [[["d" or "h", cell text], ...], ...]}, ...]
+#   }
+#
+# webrams_scraper.py builds it in the browser with EXTRACT_PAGE_SCRIPT
+# (one execute_script call), or from driver.page_source with
+# parse_page() when scripting fails. Both produce the same shape.
+# Rows belong to their innermost table.
+#
+# parse_page() also returns "forms" (action, method, fields with their
+# text offset) and "links" (text, href, offset), which webrams_http.py
+# uses to drive the site without a browser.
+#
+# Check a saved page:
+#   python webrams_html.py saved_page.html
+# ============================================================
+
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "head", "title"}
+HEADING_TAGS = {"h1", "h2", "h3"}
+BREAK_TAGS = {"br", "p", "div", "tr", "li", "table", "h1", "h2", "h3", "h4", "td", "th"}
+
+SUMMARY_LABELS = {"train_id", "operator", "train_date", "origin", "destination", "status"}
+TOTAL_DELAY_RE = re.compile(r"Total Delay:\s*([0-9]+)", re.IGNORECASE)
+
+
+def clean_text(value):
+    if value is None:
+        return ""
+    value = value.replace("\xa0", " ")
+    value = re.sub(r"\s+", " ", value)
+    return value.strip()
+
+
+def norm_key(value):
+    value = clean_text(value).lower()
+    value = value.replace("/", "_")
+    value = re.sub(r"[^a-z0-9]+", "_", value)
+    value = re.sub(r"_+", "_", value).strip("_")
+    return value
+
+
+# Runs in the page. Mirrors PageParser below: same text normalisation,
+# same table offsets and headings.
+EXTRACT_PAGE_SCRIPT = r"""
+const SKIP = new Set(["SCRIPT", "STYLE", "NOSCRIPT", "TEMPLATE", "HEAD", "TITLE"]);
+const HEADINGS = new Set(["H1", "H2", "H3"]);
+const BREAKS = new Set(["BR", "P", "DIV", "TR", "LI", "TABLE", "H1", "H2", "H3", "H4", "TD", "TH"]);
+const clean = s => String(s || "").replace(/\u00a0/g, " ").replace(/\s+/g, " ").trim();
+
+let text = "";
+let heading = "";
+const tables = [];
+const stack = [];
+
+function addText(value) {
+  const piece = value.replace(/\u00a0/g, " ").replace(/\s+/g, " ");
+  if (!piece.trim()) {
+    if (piece && text && !text.endsWith(" ")) text += " ";
+    return;
+  }
+  if (text.endsWith(" ") && piece.startsWith(" ")) {
+    text += piece.slice(1);
+  } else {
+    text += piece;
+  }
+}
+
+function walk(node) {
+  if (node.nodeType === Node.TEXT_NODE) {
+    addText(node.nodeValue);
+    const table = stack[stack.length - 1];
+    if (table && table.cell) table.cell[1] += node.nodeValue;
+    return;
+  }
+  if (node.nodeType !== Node.ELEMENT_NODE || SKIP.has(node.tagName)) return;
+
+  const tag = node.tagName;
+  if (BREAKS.has(tag) && text && !text.endsWith(" ")) text += " ";
+
+  let table = stack[stack.length - 1];
+
+  if (tag === "TABLE") {
+    table = {heading: heading, offset: text.length, rows: [], row: null, cell: null};
+    stack.push(table);
+    tables.push(table);
+  } else if (tag === "TR" && table) {
+    table.row = [];
+    table.rows.push(table.row);
+  } else if ((tag === "TD" || tag === "TH") && table && table.row) {
+    table.cell = [tag === "TH" ? "h" : "d", ""];
+    table.row.push(table.cell);
+  } else if (tag === "BR" && table && table.cell) {
+    table.cell[1] += " ";
+  }
+
+  for (const child of node.childNodes) walk(child);
+
+  if (HEADINGS.has(tag)) heading = clean(node.textContent);
+  if ((tag === "TD" || tag === "TH") && table) table.cell = null;
+  if (tag === "TABLE") stack.pop();
+  if (BREAKS.has(tag) && text && !text.endsWith(" ")) text += " ";
+}
+
+walk(document.body || document.documentElement);
+
+return JSON.stringify({
+  text: text.trim(),
+  tables: tables.map(t => ({
+    heading: t.heading,
+    offset: t.offset,
+    rows: t.rows.map(r => r.map(c => [c[0], clean(c[1])]))
+  }))
+});
+"""
+
+
+class PageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = ""
+        self.heading = ""
+        self.heading_text = None
+        self.tables = []
+        self.stack = []
+        self.skip_depth = 0
+        self.forms = []
+        self.form = None
+        self.field = None
+        self.option = None
+        self.links = []
+        self.link = None
+
+    def add_break(self):
+        if self.text and not self.text.endswith(" "):
+            self.text += " "
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+            return
+        if self.skip_depth:
+            return
+
+        if tag in BREAK_TAGS:
+            self.add_break()
+
+        if tag in HEADING_TAGS:
+            self.heading_text = ""
+
+        self.start_form_tag(tag, dict(attrs))
+
+        table = self.stack[-1] if self.stack else None
+
+        if tag == "table":
+            table = {"heading": self.heading, "offset": len(self.text), "rows": [], "row": None, "cell": None}
+            self.stack.append(table)
+            self.tables.append(table)
+        elif tag == "tr" and table is not None:
+            table["row"] = []
+            table["rows"].append(table["row"])
+        elif tag in {"td", "th"} and table is not None and table["row"] is not None:
+            table["cell"] = ["h" if tag == "th" else "d", ""]
+            table["row"].append(table["cell"])
+        elif tag == "br" and table is not None and table["cell"] is not None:
+            table["cell"][1] += " "
+
+    def start_form_tag(self, tag, attrs):
+        if tag == "form":
+            self.form = {
+                "action": attrs.get("action") or "",
+                "method": (attrs.get("method") or "get").lower(),
+                "fields": [],
+            }
+            self.forms.append(self.form)
+
+        elif tag in {"input", "select", "textarea", "button"}:
+            default_type = {"input": "text", "button": "submit"}.get(tag, tag)
+            field = {
+                "tag": tag,
+                "type": (attrs.get("type") or default_type).lower(),
+                "name": attrs.get("name") or "",
+                "id": attrs.get("id") or "",
+                "value": attrs.get("value") or "",
+                "text": "",
+                "checked": "checked" in attrs,
+                "offset": len(self.text),
+                "options": [],
+            }
+            if self.form is not None:
+                self.form["fields"].append(field)
+            if tag != "input":
+                self.field = field
+
+        elif tag == "option" and self.field is not None:
+            self.option = {"value": attrs.get("value"), "text": "", "selected": "selected" in attrs}
+            self.field["options"].append(self.option)
+
+        elif tag == "a":
+            self.link = {"text": "", "href": attrs.get("href") or "", "offset": len(self.text)}
+            self.links.append(self.link)
+
+    def end_form_tag(self, tag):
+        if tag == "form":
+            self.form = None
+        elif tag == "option" and self.option is not None:
+            self.option["text"] = clean_text(self.option["text"])
+            if self.option["value"] is None:
+                self.option["value"] = self.option["text"]
+            self.option = None
+        elif tag in {"select", "textarea", "button"} and self.field is not None:
+            self.field["text"] = clean_text(self.field["text"])
+            if tag == "textarea":
+                self.field["value"] = self.field["text"]
+            self.field = None
+        elif tag == "a" and self.link is not None:
+            self.link["text"] = clean_text(self.link["text"])
+            self.link = None
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+            return
+        if self.skip_depth:
+            return
+
+        self.end_form_tag(tag)
+
+        table = self.stack[-1] if self.stack else None
+
+        if tag in HEADING_TAGS and self.heading_text is not None:
+            self.heading = clean_text(self.heading_text)
+            self.heading_text = None
+        elif tag in {"td", "th"} and table is not None:
+            table["cell"] = None
+        elif tag == "table" and self.stack:
+            self.stack.pop()
+
+        if tag in BREAK_TAGS:
+            self.add_break()
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+
+        piece = re.sub(r"\s+", " ", data.replace("\xa0", " "))
+
+        if not piece.strip():
+            if piece:
+                self.add_break()
+        elif self.text.endswith(" ") and piece.startswith(" "):
+            self.text += piece[1:]
+        else:
+            self.text += piece
+
+        if self.heading_text is not None:
+            self.heading_text += data
+        if self.option is not None:
+            self.option["text"] += data
+        elif self.field is not None:
+            self.field["text"] += data
+        if self.link is not None:
+            self.link["text"] += data
+
+        table = self.stack[-1] if self.stack else None
+        if table is not None and table["cell"] is not None:
+            table["cell"][1] += data
+
+
+def parse_page(html_text):
+    """
+    Same result as EXTRACT_PAGE_SCRIPT, from saved or page_source HTML.
+    """
+    parser = PageParser()
+    parser.feed(html_text or "")
+    parser.close()
+
+    return {
+        "text": parser.text.strip(),
+        "tables": [
+            {
+                "heading": table["heading"],
+                "offset": table["offset"],
+                "rows": [[[tag, clean_text(value)] for tag, value in row] for row in table["rows"]],
+            }
+            for table in parser.tables
+        ],
+        "forms": parser.forms,
+        "links": parser.links,
+    }
+
+
+# ============================================================
+# Reading the page dict
+# ============================================================
+
+def find_table(page, heading_text):
+    """
+    First table under an h1/h2/h3 containing heading_text, else the first
+    table after the text appears anywhere on the page. None if neither.
+    """
+    for table in page["tables"]:
+        if heading_text in table["heading"]:
+            return table
+
+    position = page["text"].find(heading_text)
+    if position < 0:
+        return None
+
+    end = position + len(heading_text)
+    for table in page["tables"]:
+        if table["offset"] >= end:
+            return table
+
+    return None
+
+
+def row_cells(row, tag="d"):
+    return [value for cell_tag, value in row if cell_tag == tag]
+
+
+def table_headers(table):
+    if not table["rows"]:
+        return []
+
+    first = table["rows"][0]
+    return row_cells(first, "h") or row_cells(first, "d")
+
+
+def table_rows(table):
+    """
+    Rows after the first as dicts keyed by norm_key(header), like the
+    original Selenium extract_table_rows.
+    """
+    if table is None or not table["rows"]:
+        return []
+
+    headers = table_headers(table)
+    rows_out = []
+
+    for row in table["rows"][1:]:
+        values = row_cells(row)
+        if not values or not any(values):
+            continue
+
+        rows_out.append({
+            norm_key(header or f"col_{i+1}"): values[i] if i < len(values) else ""
+            for i, header in enumerate(headers)
+        })
+
+    return rows_out
+
+
+def summary_pairs(page):
+    """
+    Label/value pairs such as Train ID, Operator, Train Date, Origin,
+    Destination from any table row on the page.
+    """
+    result = {}
+
+    for table in page["tables"]:
+        for row in table["rows"]:
+            tds = row_cells(row)
+            if len(tds) < 2:
+                continue
+
+            texts = [text for text in tds if text]
+            for i in range(0, len(texts) - 1, 2):
+                label = norm_key(texts[i].replace(":", ""))
+                value = texts[i + 1]
+                if label in SUMMARY_LABELS and value:
+                    result[label] = value
+
+    return result
+
+
+def train_list_rows(page):
+    table = find_table(page, "Search Results")
+    results = []
+
+    if table is None:
+        return results
+
+    for row in table["rows"]:
+        cells = row_cells(row)
+        if len(cells) < 6 or not cells[0]:
+            continue
+
+        results.append({
+            "train_id": cells[0],
+            "train_date": cells[1],
+            "origin": cells[2],
+            "destination": cells[3],
+            "operator": cells[4],
+            "status": cells[5],
+        })
+
+    return results
+
+
+def progress_section(page):
+    return {
+        "summary": summary_pairs(page),
+        "schedule": table_rows(find_table(page, "Schedule")),
+    }
+
+
+def consist_section(page):
+    return {
+        "summary": summary_pairs(page),
+        "consist": table_rows(find_table(page, "Consist")),
+    }
+
+
+def incidents_section(page):
+    match = TOTAL_DELAY_RE.search(page["text"])
+
+    return {
+        "summary": summary_pairs(page),
+        "total_delay": match.group(1) if match else "",
+        "incidents": table_rows(find_table(page, "Incidents")),
+    }
+
+
+# ============================================================
+# Forms and links
+# ============================================================
+
+def find_field(page, label_text, field_types):
+    """
+    First form field of one of field_types after label_text appears in
+    the page text, like the scraper's //*[contains(., label)]/following::input[1].
+    Returns (form, field) or (None, None).
+    """
+    position = page["text"].find(label_text)
+    if position < 0:
+        return None, None
+
+    end = position + len(label_text)
+    for form in page.get("forms", []):
+        for field in form["fields"]:
+            if field["type"] in field_types and field["offset"] >= end:
+                return form, field
+
+    return None, None
+
+
+def find_button(page, label):
+    """
+    First submit button whose value or text is label. Returns
+    (form, field) or (None, None).
+    """
+    for form in page.get("forms", []):
+        for field in form["fields"]:
+            if field["type"] in {"submit", "image"} and label in {field["value"], field["text"]}:
+                return form, field
+
+    return None, None
+
+
+def find_link(page, text):
+    """
+    Link whose text is text, else the first one containing it.
+    """
+    links = page.get("links", [])
+    for link in links:
+        if link["text"] == text:
+            return link
+    for link in links:
+        if text in link["text"]:
+            return link
+    return None
+
+
+def form_data(form, button=None):
+    """
+    What a browser would post for the form: every named field's current
+    value, checked boxes only, and only the submit button pressed.
+    """
+    data = {}
+
+    for field in form["fields"]:
+        if not field["name"] or field["type"] in {"submit", "image", "button", "reset", "file"}:
+            continue
+        if field["type"] in {"checkbox", "radio"} and not field["checked"]:
+            continue
+
+        if field["tag"] == "select":
+            options = field["options"]
+            selected = [option for option in options if option["selected"]] or options[:1]
+            data[field["name"]] = selected[0]["value"] if selected else ""
+        elif field["type"] in {"checkbox", "radio"}:
+            data[field["name"]] = field["value"] or "on"
+        else:
+            data[field["name"]] = field["value"]
+
+    if button is not None and button["name"]:
+        data[button["name"]] = button["value"]
+
+    return data
+
+
+def option_value(field, visible_text):
+    for option in field["options"]:
+        if option["text"] == visible_text:
+            return option["value"]
+    raise ValueError(f"No option {visible_text!r} in {field['name']}")
+
+
+def main(argv):
+    if not argv:
+        print("Usage: python webrams_html.py saved_page.html")
+        return 2
+
+    with open(argv[0], "r", encoding="utf-8", errors="replace") as f:
+        page = parse_page(f.read())
+
+    print(json.dumps(
+        {
+            "summary": summary_pairs(page),
+            "search_results": train_list_rows(page),
+            "tables": [
+                {"heading": table["heading"], "headers": table_headers(table), "rows": table_rows(table)}
+                for table in page["tables"]
+            ],
+        },
+        indent=2,
+        ensure_ascii=False,
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,208 @@
+import os
+import re
+from urllib.parse import urlencode, urljoin
+
+import requests
+
+import webrams_html
+from webrams_html import clean_text
+
+
+# ============================================================
+# Browserless WebRAMS client
+#
+# WebRAMS is a server-rendered forms site, so the same steps the
+# Selenium scraper clicks through can be done with plain form posts:
+# login, Train Progress, the Running search, View, and the Consist
+# History / Incidents tabs. Pages are parsed with webrams_html, so the
+# sections come out exactly as webrams_scraper's parse_*_page returns
+# them.
+#
+# A client is a plain dict: {"session", "url", "page"}, where page is
+# the webrams_html dict of the last response.
+#
+# webrams_scraper.py uses this when WEBRAMS_MODE=http. Try it against
+# the local stand-in:
+#   python webrams_standin.py --port 5055
+#   WEBRAMS_BASE_URL=http://127.0.0.1:5055 WEBRAMS_MODE=http python webrams_scraper.py
+# ============================================================
+
+
+BASE_URL = os.getenv("WEBRAMS_BASE_URL", "https://webrams.artc.com.au").rstrip("/")
+HTTP_TIMEOUT = int(os.getenv("WEBRAMS_HTTP_TIMEOUT", "30"))
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+POSTBACK_RE = re.compile(r"__doPostBack\(\s*'([^']*)'\s*,\s*'([^']*)'\s*\)")
+
+
+def new_client():
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    return {"session": session, "url": None, "page": None}
+
+
+def close_client(client):
+    client["session"].close()
+
+
+def load(client, method, url, data=None):
+    response = client["session"].request(method, url, data=data, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+
+    client["url"] = response.url
+    client["page"] = webrams_html.parse_page(response.text)
+    return client["page"]
+
+
+def submit(client, form, values=None, button=None):
+    data = webrams_html.form_data(form, button)
+    data.update(values or {})
+
+    url = urljoin(client["url"], form["action"] or client["url"])
+    if form["method"] == "post":
+        return load(client, "POST", url, data)
+    return load(client, "GET", url.split("?", 1)[0] + "?" + urlencode(data))
+
+
+def follow_link(client, text):
+    """
+    Follows a link by its text. ASP.NET javascript:__doPostBack links
+    are posted back through the page's form.
+    """
+    link = webrams_html.find_link(client["page"], text)
+    if link is None:
+        raise RuntimeError(f"No link {text!r} on {client['url']}")
+
+    postback = POSTBACK_RE.search(link["href"])
+    if postback:
+        forms = client["page"]["forms"]
+        if not forms:
+            raise RuntimeError(f"Postback link {text!r} but no form on {client['url']}")
+        return submit(client, forms[0], {"__EVENTTARGET": postback.group(1), "__EVENTARGUMENT": postback.group(2)})
+
+    return load(client, "GET", urljoin(client["url"], link["href"]))
+
+
+def login(client, username, password):
+    page = load(client, "GET", BASE_URL)
+
+    form = None
+    for candidate in page["forms"]:
+        if any(field["type"] == "password" for field in candidate["fields"]):
+            form = candidate
+            break
+
+    if form is None:
+        raise RuntimeError("Could not find the login form.")
+
+    fields = form["fields"]
+    user_field = (
+        next((f for f in fields if f["type"] == "email"), None)
+        or next((f for f in fields if f["type"] == "text" and "user" in f["name"].lower()), None)
+        or next((f for f in fields if f["type"] == "text" and "user" in f["id"].lower()), None)
+        or next((f for f in fields if f["type"] == "text"), None)
+    )
+    pass_field = next(f for f in fields if f["type"] == "password")
+    button = next((f for f in fields if f["type"] in {"submit", "image"}), None)
+
+    if user_field is None:
+        raise RuntimeError("Could not find the username field.")
+
+    page = submit(client, form, {user_field["name"]: username, pass_field["name"]: password}, button)
+
+    # Same loose check as the Selenium login
+    page_text = page["text"].lower()
+    if "rail access management system" not in page_text and "train progress" not in page_text and "menu" not in page_text:
+        raise RuntimeError("Login may have failed. Could not detect expected page content.")
+
+    return page
+
+
+def go_to_train_progress(client):
+    if webrams_html.find_link(client["page"], "Train Progress") is None:
+        follow_link(client, "Menu")
+    return follow_link(client, "Train Progress")
+
+
+def search(client, train_id=None, status="Running"):
+    """
+    Fills the Train Progress search form and posts it with the Search
+    button. Returns the results page.
+    """
+    page = go_to_train_progress(client)
+    values = {}
+
+    if train_id:
+        _form, field = webrams_html.find_field(page, "Train ID", {"text", "search"})
+        if field is not None:
+            values[field["name"]] = train_id
+
+    if status:
+        _form, field = webrams_html.find_field(page, "Status", {"select"})
+        if field is not None:
+            try:
+                values[field["name"]] = webrams_html.option_value(field, status)
+            except ValueError:
+                pass
+
+    form, button = webrams_html.find_button(page, "Search")
+    if form is None:
+        raise RuntimeError("Could not find the Search button.")
+
+    return submit(client, form, values, button)
+
+
+def running_trains(client):
+    page = search(client)
+    if webrams_html.find_table(page, "Search Results") is None:
+        raise RuntimeError("No Search Results table found.")
+    return webrams_html.train_list_rows(page)
+
+
+def open_first_view_result(client):
+    form, button = webrams_html.find_button(client["page"], "View")
+    if form is not None:
+        return submit(client, form, None, button)
+    return follow_link(client, "View")
+
+
+def start_client(username, password):
+    """
+    Logged in and on the Train Progress page, like a fresh Selenium
+    worker after start_extra_driver().
+    """
+    client = new_client()
+    try:
+        login(client, username, password)
+        go_to_train_progress(client)
+        return client
+    except Exception:
+        close_client(client)
+        raise
+
+
+def fetch_train_sections(client, train_stub, stale):
+    """
+    The stale sections of one train, as {section: data} in the same
+    shapes as webrams_scraper's parse_*_page. A failed incidents tab is
+    left out, like in the Selenium path.
+    """
+    train_id = clean_text(train_stub.get("train_id", ""))
+    search(client, train_id)
+    page = open_first_view_result(client)
+
+    sections = {}
+
+    if "progress" in stale:
+        sections["progress"] = webrams_html.progress_section(page)
+
+    if "consist" in stale:
+        sections["consist"] = webrams_html.consist_section(follow_link(client, "Consist History"))
+
+    if "incidents" in stale:
+        try:
+            sections["incidents"] = webrams_html.incidents_section(follow_link(client, "Incidents"))
+        except Exception:
+            pass
+
+    return sections
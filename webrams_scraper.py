@@ -2,28 +2,82 @@ import os
 import re
 import json
 import time
+import queue
+import threading
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timezone
+from urllib.parse import quote, quote_plus
 
 from dotenv import load_dotenv
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait, Select
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+import webrams_html
+import webrams_http
+from webrams_html import clean_text, norm_key
 
 
 load_dotenv()
 
 BASE_URL = os.getenv("WEBRAMS_BASE_URL", "https://webrams.artc.com.au").rstrip("/")
 HEADLESS = os.getenv("HEADLESS", "false").strip().lower() == "true"
+# Trains scraped per account; 0 means every running train.
 MAX_TRAINS = int(os.getenv("WEBRAMS_MAX_TRAINS", "25"))
 
+# Total Chrome instances running at once. Accounts are scraped in
+# parallel worker processes, and each account splits its share of the
+# budget into train workers (see TRAIN_WORKERS).
+MAX_BROWSERS = max(1, int(os.getenv("WEBRAMS_MAX_BROWSERS", "3")))
+
+# Logged-in drivers per account pulling train IDs from a shared queue.
+# The defaults keep one driver per account; raise this together with
+# WEBRAMS_MAX_BROWSERS for a wider fan-out, e.g. 3 and 6 for every
+# train on three accounts with WEBRAMS_MAX_TRAINS=0.
+TRAIN_WORKERS = max(1, int(os.getenv("WEBRAMS_TRAIN_WORKERS", "1")))
+
+# A train that fails is retried this many times, on another worker
+# where there is one.
+TRAIN_RETRIES = max(0, int(os.getenv("WEBRAMS_TRAIN_RETRIES", "1")))
+
+# How pages are read: "script" runs webrams_html.EXTRACT_PAGE_SCRIPT in
+# the browser (one round trip per page), "source" parses page_source in
+# Python. "script" falls back to "source" if the script fails.
+PAGE_READ = os.getenv("WEBRAMS_PAGE_READ", "script").strip().lower()
+
+# "selenium" drives Chrome; "http" posts the same forms with
+# webrams_http.py and needs no browser.
+MODE = os.getenv("WEBRAMS_MODE", "selenium").strip().lower()
+
+# When set, the Selenium path saves every train view it reads as
+# train_<ID>_<view>.html here, for webrams_standin.py to replay.
+RECORD_DIR = os.getenv("WEBRAMS_RECORD_DIR", "").strip()
+
+# After the first train, open the progress / consist / incidents views
+# straight from URL templates learned on the click path. A view whose
+# URL fails this many times in a row goes back to clicking.
+DEEP_LINKS = os.getenv("WEBRAMS_DEEP_LINKS", "true").strip().lower() == "true"
+DEEP_LINK_MAX_FAILURES = 3
+
+# Seconds a cached train section stays fresh. A consist rarely changes
+# mid-journey; progress and incidents move all the time. A train whose
+# status in the Running list changed is always re-fetched in full.
+# The scrape runs every 30 minutes (update-database.yml), often a few
+# minutes late, so a TTL under that would never be hit. 3300s reuses a
+# progress or incidents read on the next run and refreshes it on the
+# one after.
+SECTION_TTLS = {
+    "progress": int(os.getenv("WEBRAMS_PROGRESS_TTL", "3300")),
+    "consist": int(os.getenv("WEBRAMS_CONSIST_TTL", "21600")),
+    "incidents": int(os.getenv("WEBRAMS_INCIDENTS_TTL", "3300")),
+}
+
+# Cached trains not seen in a Running list for this long are dropped.
+CACHE_KEEP_SECONDS = 2 * 24 * 3600
+
 DATA_DIR = "data"
 OUT_FILE = os.path.join(DATA_DIR, "webrams_consists.json")
+CACHE_FILE = os.path.join(DATA_DIR, "webrams_cache.json")
+CACHE_VERSION = 1
 
 
 def utc_now_iso() -> str:
@@ -34,23 +88,28 @@ def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
-def clean_text(value: str) -> str:
-    if value is None:
-        return ""
-    value = value.replace("\xa0", " ")
-    value = re.sub(r"\s+", " ", value)
-    return value.strip()
+# Selenium is only needed when WEBRAMS_MODE=selenium. build_driver()
+# imports it on first use, so http mode runs without it installed.
+webdriver = Options = By = WebDriverWait = Select = EC = TimeoutException = None
+
 
+def load_selenium():
+    global webdriver, Options, By, WebDriverWait, Select, EC, TimeoutException
+
+    if webdriver is not None:
+        return
 
-def norm_key(value: str) -> str:
-    value = clean_text(value).lower()
-    value = value.replace("/", "_")
-    value = re.sub(r"[^a-z0-9]+", "_", value)
-    value = re.sub(r"_+", "_", value).strip("_")
-    return value
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait, Select
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
 
 
-def build_driver() -> webdriver.Chrome:
+def build_driver():
+    load_selenium()
+
     options = Options()
     if HEADLESS:
         options.add_argument("--headless=new")
@@ -189,108 +248,40 @@ def click_search_button(driver):
     wait_for_page(driver, timeout=20)
 
 
-def parse_simple_summary_pairs(driver):
+def read_page(driver):
     """
-    Pulls top summary values like:
-    Train ID, Operator, Train Date, Origin, Destination
-    from the current page.
+    The whole current page as a webrams_html page dict (text, tables,
+    rows) in one WebDriver round trip, instead of a find_elements / .text
+    call per row and cell.
     """
-    result = {}
-    rows = driver.find_elements(By.XPATH, "//tr")
-    for row in rows:
-        tds = row.find_elements(By.XPATH, "./td")
-        if len(tds) >= 2:
-            texts = [clean_text(td.text) for td in tds]
-            texts = [t for t in texts if t]
-            if len(texts) >= 2:
-                # Look for label/value pairs
-                for i in range(0, len(texts) - 1, 2):
-                    label = norm_key(texts[i].replace(":", ""))
-                    value = texts[i + 1]
-                    if label and value:
-                        if label in {"train_id", "operator", "train_date", "origin", "destination", "status"}:
-                            result[label] = value
-    return result
+    if PAGE_READ != "source":
+        try:
+            return json.loads(driver.execute_script(webrams_html.EXTRACT_PAGE_SCRIPT))
+        except Exception as e:
+            print(f"  Page script failed, parsing page source instead: {e}")
+
+    return webrams_html.parse_page(driver.page_source)
 
 
-def find_heading_container_table(driver, heading_text):
+def read_page_with_table(driver, heading_text, timeout=10):
     """
-    Finds the first table after a heading like 'Search Results', 'Consist', or 'Incidents'.
+    Re-reads the page until a table after heading_text shows up.
+    Returns (page, table); table is None after the timeout.
     """
-    xpaths = [
-        f"//h1[contains(normalize-space(), '{heading_text}')]/following::table[1]",
-        f"//h2[contains(normalize-space(), '{heading_text}')]/following::table[1]",
-        f"//h3[contains(normalize-space(), '{heading_text}')]/following::table[1]",
-        f"//*[contains(normalize-space(), '{heading_text}')]/following::table[1]",
-    ]
-    return find_first(driver, xpaths, timeout=10)
-
-
-def extract_table_headers(table_elem):
-    headers = table_elem.find_elements(By.XPATH, ".//tr[1]//th")
-    if headers:
-        return [clean_text(h.text) for h in headers]
-
-    first_row_tds = table_elem.find_elements(By.XPATH, ".//tr[1]//td")
-    return [clean_text(td.text) for td in first_row_tds]
-
-
-def extract_table_rows(table_elem):
-    rows_out = []
-    rows = table_elem.find_elements(By.XPATH, ".//tr")
-    if not rows:
-        return rows_out
-
-    headers = extract_table_headers(table_elem)
-    start_idx = 2 if table_elem.find_elements(By.XPATH, ".//tr[1]//th") else 2
-
-    for row in rows[start_idx - 1:]:
-        tds = row.find_elements(By.XPATH, "./td")
-        if not tds:
-            continue
-
-        values = [clean_text(td.text) for td in tds]
-        if not any(values):
-            continue
-
-        item = {}
-        for i, header in enumerate(headers):
-            key = norm_key(header or f"col_{i+1}")
-            val = values[i] if i < len(values) else ""
-            item[key] = val
-
-        rows_out.append(item)
-
-    return rows_out
+    deadline = time.monotonic() + timeout
+    while True:
+        page = read_page(driver)
+        table = webrams_html.find_table(page, heading_text)
+        if table is not None or time.monotonic() >= deadline:
+            return page, table
+        time.sleep(0.5)
 
 
 def parse_train_list_rows(driver):
-    table = find_heading_container_table(driver, "Search Results")
-    rows = table.find_elements(By.XPATH, ".//tr[td]")
-    results = []
-
-    for row in rows:
-        cells = row.find_elements(By.XPATH, "./td")
-        if len(cells) < 6:
-            continue
-
-        cell_texts = [clean_text(c.text) for c in cells]
-        if not cell_texts[0]:
-            continue
-
-        # Expected visible columns from your screenshot
-        item = {
-            "train_id": cell_texts[0] if len(cell_texts) > 0 else "",
-            "train_date": cell_texts[1] if len(cell_texts) > 1 else "",
-            "origin": cell_texts[2] if len(cell_texts) > 2 else "",
-            "destination": cell_texts[3] if len(cell_texts) > 3 else "",
-            "operator": cell_texts[4] if len(cell_texts) > 4 else "",
-            "status": cell_texts[5] if len(cell_texts) > 5 else "",
-        }
-        if item["train_id"]:
-            results.append(item)
-
-    return results
+    page, table = read_page_with_table(driver, "Search Results")
+    if table is None:
+        raise TimeoutException("No Search Results table found.")
+    return webrams_html.train_list_rows(page)
 
 
 def go_to_login_page(driver):
@@ -377,80 +368,254 @@ def open_first_view_result(driver):
     wait_for_page(driver, timeout=20)
 
 
-def parse_progress_page(driver):
-    summary = parse_simple_summary_pairs(driver)
+# Train views, the heading of the table each one shows, and the tab link
+# that opens it from another view of the same train.
+VIEW_HEADINGS = {"progress": "Schedule", "consist": "Consist", "incidents": "Incidents"}
+VIEW_LINKS = {"consist": "Consist History", "incidents": "Incidents"}
 
-    try:
-        schedule_table = find_heading_container_table(driver, "Schedule")
-        schedule_rows = extract_table_rows(schedule_table)
-    except Exception:
-        schedule_rows = []
+# Per process, shared by the train workers: view -> URL template with
+# {train_id} / {train_date}, or None once the view is given up on.
+url_templates = {}
+url_failures = {}
+nav_counts = {"url": 0, "clicks": 0, "url_failed": 0}
+nav_lock = threading.Lock()
 
-    return {
-        "summary": summary,
-        "schedule": schedule_rows
-    }
 
+def learn_url_template(view, url, train_stub):
+    """
+    Turns the URL the click path landed on into a template by swapping
+    the train ID (and date) for placeholders. Postback pages whose URL
+    does not name the train cannot be deep-linked and are skipped.
+    """
+    train_id = clean_text(train_stub.get("train_id", ""))
 
-def parse_consist_page(driver):
-    click_link_by_text(driver, "Consist History", timeout=10)
-    summary = parse_simple_summary_pairs(driver)
+    with nav_lock:
+        if view in url_templates or not url or not train_id:
+            return
+
+    template = url
+    for placeholder, value in [("train_id", train_id), ("train_date", clean_text(train_stub.get("train_date", "")))]:
+        if not value:
+            continue
+        forms = {value, quote(value, safe=""), quote_plus(value)}
+        if sum(template.count(form) for form in forms) != 1:
+            continue
+        for form in forms:
+            template = template.replace(form, "{" + placeholder + "}")
+
+    if "{train_id}" not in template:
+        return
+
+    with nav_lock:
+        if view not in url_templates:
+            url_templates[view] = template
+            print(f"  Learned {view} URL: {template}")
+
+
+def deep_link_url(view, train_stub):
+    with nav_lock:
+        template = url_templates.get(view)
+
+    if not template:
+        return None
+
+    return (
+        template
+        .replace("{train_id}", quote(clean_text(train_stub.get("train_id", "")), safe=""))
+        .replace("{train_date}", quote(clean_text(train_stub.get("train_date", "")), safe=""))
+    )
+
+
+def open_view_by_url(driver, view, train_stub, url):
+    """
+    Loads the view from its learned URL and checks the page shows the
+    view's table for this train. Returns False (and counts a failure)
+    when it does not.
+    """
+    train_id = clean_text(train_stub.get("train_id", "")).upper()
 
     try:
-        consist_table = find_heading_container_table(driver, "Consist")
-        consist_rows = extract_table_rows(consist_table)
+        driver.get(url)
+        wait_for_page(driver, timeout=20)
+        page, table = read_page_with_table(driver, VIEW_HEADINGS[view], timeout=5)
+        ok = table is not None and train_id in page["text"].upper()
     except Exception:
-        consist_rows = []
+        ok = False
 
-    return {
-        "summary": summary,
-        "consist": consist_rows
-    }
+    with nav_lock:
+        if ok:
+            nav_counts["url"] += 1
+            url_failures[view] = 0
+            return True
+
+        nav_counts["url_failed"] += 1
+        url_failures[view] = url_failures.get(view, 0) + 1
+        if url_failures[view] >= DEEP_LINK_MAX_FAILURES and url_templates.get(view):
+            print(f"  {view} URL failed {url_failures[view]} times, clicking through from now on")
+            url_templates[view] = None
+
+    return False
+
+
+def open_view_by_clicks(driver, view, train_stub, on_train_page):
+    if view == "progress" or not on_train_page:
+        search_train_by_id(driver, train_stub.get("train_id", "").strip())
+        open_first_view_result(driver)
+        learn_url_template("progress", driver.current_url, train_stub)
+
+    if view != "progress":
+        click_link_by_text(driver, VIEW_LINKS[view], timeout=10)
+        learn_url_template(view, driver.current_url, train_stub)
+
+    with nav_lock:
+        nav_counts["clicks"] += 1
+
+
+def open_view(driver, view, train_stub, on_train_page):
+    """
+    Puts the driver on one view of the train: by learned URL where there
+    is one, else through the Train Progress search and tab links.
+    on_train_page says whether the driver already shows this train.
+    """
+    url = deep_link_url(view, train_stub) if DEEP_LINKS else None
+
+    if url:
+        if open_view_by_url(driver, view, train_stub, url):
+            return
+        # The failed URL left the driver on some other page.
+        on_train_page = False
+
+    open_view_by_clicks(driver, view, train_stub, on_train_page)
+
+
+def parse_progress_page(driver):
+    page, _schedule_table = read_page_with_table(driver, "Schedule")
+    return webrams_html.progress_section(page)
+
+
+def parse_consist_page(driver):
+    page, _consist_table = read_page_with_table(driver, "Consist")
+    return webrams_html.consist_section(page)
 
 
 def parse_incidents_page(driver):
-    click_link_by_text(driver, "Incidents", timeout=10)
-    summary = parse_simple_summary_pairs(driver)
+    page, _incidents_table = read_page_with_table(driver, "Incidents")
+    return webrams_html.incidents_section(page)
+
+
+def cache_key(train_id, train_date):
+    return f"{clean_text(train_id).upper()}|{clean_text(train_date)}"
 
-    incidents_total = ""
+
+def seconds_since(iso_value, now):
     try:
-        body_text = driver.find_element(By.TAG_NAME, "body").text
-        m = re.search(r"Total Delay:\s*([0-9]+)", body_text, re.IGNORECASE)
-        if m:
-            incidents_total = m.group(1)
-    except Exception:
-        pass
+        return (now - datetime.fromisoformat(iso_value)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
 
+def load_cache():
+    """
+    data/webrams_cache.json: {"version", "trains": {cache_key: entry}}.
+    An entry holds the Running-list status, last_seen and, per section,
+    {"fetched_at", "data"} where data is what parse_*_page returned.
+    """
     try:
-        incidents_table = find_heading_container_table(driver, "Incidents")
-        incidents_rows = extract_table_rows(incidents_table)
-    except Exception:
-        incidents_rows = []
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = None
 
-    return {
-        "summary": summary,
-        "total_delay": incidents_total,
-        "incidents": incidents_rows
-    }
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        cache = {"version": CACHE_VERSION, "trains": {}}
+
+    return cache
+
+
+def stale_sections(entry, train_stub, now):
+    if not entry or entry.get("status", "") != train_stub.get("status", ""):
+        return list(SECTION_TTLS)
+
+    stale = []
+    for section, ttl in SECTION_TTLS.items():
+        cached = entry.get("sections", {}).get(section)
+        age = seconds_since(cached.get("fetched_at"), now) if cached else None
+        if age is None or age < 0 or age > ttl:
+            stale.append(section)
+
+    return stale
+
+
+def record_page(driver, train_stub, view):
+    train_id = re.sub(r"[^A-Za-z0-9_-]+", "_", clean_text(train_stub.get("train_id", "")))
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    with open(os.path.join(RECORD_DIR, f"train_{train_id}_{view}.html"), "w", encoding="utf-8") as f:
+        f.write(driver.page_source)
+
+
+def fetch_train_sections(driver, train_stub, stale):
+    """
+    The stale sections of one train as {section: data}. A failed
+    incidents tab is left out, so the cached copy is kept and retried
+    next run.
+    """
+    sections = {}
+    on_train_page = False
+
+    for section, parse_section in [
+        ("progress", parse_progress_page),
+        ("consist", parse_consist_page),
+        ("incidents", parse_incidents_page),
+    ]:
+        if section not in stale:
+            continue
+
+        try:
+            open_view(driver, section, train_stub, on_train_page)
+            sections[section] = parse_section(driver)
+            on_train_page = True
+            if RECORD_DIR:
+                record_page(driver, train_stub, section)
+        except Exception:
+            if section != "incidents":
+                raise
 
+    return sections
 
-def scrape_one_train(driver, train_stub, account_label):
+
+def scrape_one_train(driver, train_stub, account_label, cached=None):
+    """
+    Fetches only the sections of the train that are stale in `cached`
+    (all of them when there is no entry or the status changed). The
+    returned record carries a "cache_entry" that main() pops and saves.
+    In http mode driver is a webrams_http client.
+    """
     train_id = train_stub.get("train_id", "").strip()
     if not train_id:
         return None
 
-    print(f"  -> Scraping train {train_id}")
-    search_train_by_id(driver, train_id)
-    open_first_view_result(driver)
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    stale = stale_sections(cached, train_stub, now)
+    status_changed = bool(cached) and cached.get("status", "") != train_stub.get("status", "")
+    sections = {} if not cached or status_changed else dict(cached.get("sections", {}))
 
-    progress_data = parse_progress_page(driver)
-    consist_data = parse_consist_page(driver)
+    if stale:
+        print(f"  -> Scraping train {train_id} ({', '.join(stale)})")
 
-    incidents_data = {"summary": {}, "total_delay": "", "incidents": []}
-    try:
-        incidents_data = parse_incidents_page(driver)
-    except Exception:
-        pass
+        if MODE == "http":
+            fresh = webrams_http.fetch_train_sections(driver, train_stub, stale)
+        else:
+            fresh = fetch_train_sections(driver, train_stub, stale)
+
+        for section, data in fresh.items():
+            sections[section] = {"fetched_at": now_iso, "data": data}
+    else:
+        print(f"  -> Train {train_id} cached")
+
+    progress_data = sections.get("progress", {}).get("data", {})
+    consist_data = sections.get("consist", {}).get("data", {})
+    incidents_data = sections.get("incidents", {}).get("data", {"summary": {}, "total_delay": "", "incidents": []})
 
     combined = {
         "account_label": account_label,
@@ -481,11 +646,73 @@ def scrape_one_train(driver, train_stub, account_label):
         "consist": consist_data.get("consist", []),
         "incidents_total_delay": incidents_data.get("total_delay", ""),
         "incidents": incidents_data.get("incidents", []),
+        "cache_entry": {
+            "key": cache_key(train_id, train_stub.get("train_date", "")),
+            "hits": [section for section in SECTION_TTLS if section not in stale],
+            "status_changed": status_changed,
+            "entry": {
+                "train_id": train_id,
+                "train_date": train_stub.get("train_date", ""),
+                "status": train_stub.get("status", ""),
+                "last_seen": now_iso,
+                "sections": sections,
+            },
+        },
     }
 
     return combined
 
 
+def cache_report(cache_entries):
+    """
+    Hits and misses per section. pages_skipped counts the page loads a
+    full scrape would have made: search + View for a train served
+    entirely from cache, plus one per cached consist / incidents tab.
+    """
+    report = {
+        "trains": len(cache_entries),
+        "full_hits": 0,
+        "status_changed": 0,
+        "pages_skipped": 0,
+        "sections": {section: {"hits": 0, "misses": 0} for section in SECTION_TTLS},
+    }
+
+    for item in cache_entries:
+        if len(item["hits"]) == len(SECTION_TTLS):
+            report["full_hits"] += 1
+            report["pages_skipped"] += 2
+        if item["status_changed"]:
+            report["status_changed"] += 1
+
+        for section in SECTION_TTLS:
+            if section in item["hits"]:
+                report["sections"][section]["hits"] += 1
+                if section != "progress":
+                    report["pages_skipped"] += 1
+            else:
+                report["sections"][section]["misses"] += 1
+
+    return report
+
+
+def save_cache(cache, cache_entries):
+    now = datetime.now(timezone.utc)
+    trains = cache["trains"]
+
+    for item in cache_entries:
+        trains[item["key"]] = item["entry"]
+
+    for key in list(trains):
+        age = seconds_since(trains[key].get("last_seen"), now)
+        if age is None or age > CACHE_KEEP_SECONDS:
+            del trains[key]
+
+    tmp_path = f"{CACHE_FILE}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, CACHE_FILE)
+
+
 def dedupe_and_merge_train_records(records):
     """
     Deduplicate by train_id + train_date.
@@ -511,45 +738,204 @@ def dedupe_and_merge_train_records(records):
     return list(best.values())
 
 
-def scrape_account(username, password, account_label):
+def start_worker(username, password):
+    if MODE == "http":
+        return webrams_http.start_client(username, password)
+    return start_extra_driver(username, password)
+
+
+def reset_worker(driver):
+    if MODE == "http":
+        webrams_http.go_to_train_progress(driver)
+    else:
+        go_to_train_progress_menu(driver)
+
+
+def stop_worker(driver):
+    try:
+        if MODE == "http":
+            webrams_http.close_client(driver)
+        else:
+            driver.quit()
+    except Exception:
+        pass
+
+
+def start_extra_driver(username, password):
     driver = build_driver()
+    try:
+        login(driver, username, password)
+        go_to_train_progress_menu(driver)
+        return driver
+    except Exception:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        raise
+
+
+def scrape_trains_pooled(first_driver, username, password, account_label, stubs, workers, cache_trains=None):
+    """
+    Scrapes stubs with up to `workers` logged-in drivers pulling from one
+    queue. first_driver is already logged in and is left open for the
+    caller; the extra drivers are started and quit here. cache_trains is
+    load_cache()["trains"]. A failed train
+    goes back on the queue for a different worker, up to TRAIN_RETRIES
+    times.
+
+    Returns (records in stub order, failed train IDs, retry count).
+    """
+    cache_trains = cache_trains or {}
+    jobs = queue.Queue()
+    for index, stub in enumerate(stubs):
+        # (index, stub, attempts so far, worker that last failed it)
+        jobs.put((index, stub, 0, None))
+
+    workers = max(1, min(workers, len(stubs)))
+    lock = threading.Lock()
+    state = {"outstanding": len(stubs), "alive": workers, "retries": 0}
+    results = {}
+    failed = []
+
+    def work(worker_id):
+        label = f"{account_label}#{worker_id + 1}"
+        driver = first_driver if worker_id == 0 else None
+
+        try:
+            if driver is None:
+                try:
+                    driver = start_worker(username, password)
+                except Exception as e:
+                    print(f"[{label}] Could not start extra driver: {e}")
+                    return
+
+            while True:
+                with lock:
+                    if state["outstanding"] <= 0:
+                        return
+
+                try:
+                    index, stub, attempts, last_worker = jobs.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                with lock:
+                    others_alive = state["alive"] > 1
+
+                if last_worker == worker_id and others_alive:
+                    jobs.put((index, stub, attempts, last_worker))
+                    time.sleep(0.2)
+                    continue
+
+                try:
+                    cached = cache_trains.get(cache_key(stub.get("train_id", ""), stub.get("train_date", "")))
+                    record = scrape_one_train(driver, stub, account_label, cached)
+                except Exception as e:
+                    print(f"[{label}] Failed on train {stub.get('train_id')}: {e}")
+                    record = False
+
+                with lock:
+                    if record is not False:
+                        state["outstanding"] -= 1
+                        if record:
+                            results[index] = record
+                    elif attempts < TRAIN_RETRIES:
+                        state["retries"] += 1
+                        jobs.put((index, stub, attempts + 1, worker_id))
+                    else:
+                        state["outstanding"] -= 1
+                        failed.append(stub.get("train_id", ""))
+
+                if record is False:
+                    # A failed page can leave the driver anywhere.
+                    try:
+                        reset_worker(driver)
+                    except Exception as e:
+                        print(f"[{label}] Driver unusable, stopping this worker: {e}")
+                        return
+
+        finally:
+            with lock:
+                state["alive"] -= 1
+
+            if driver is not None and driver is not first_driver:
+                stop_worker(driver)
+
+    threads = [threading.Thread(target=work, args=(worker_id,), daemon=True) for worker_id in range(workers)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Anything still queued had no live worker left to run it.
+    while True:
+        try:
+            _index, stub, _attempts, _last_worker = jobs.get_nowait()
+        except queue.Empty:
+            break
+        failed.append(stub.get("train_id", ""))
+
+    return [results[index] for index in sorted(results)], failed, state["retries"]
+
+
+def scrape_account(username, password, account_label, train_workers=1, cache_trains=None):
+    driver = None
     account_result = {
         "account_label": account_label,
         "scraped_at": utc_now_iso(),
         "train_count": 0,
+        "train_workers": train_workers,
         "trains": [],
+        "failed_trains": [],
+        "retries": 0,
+        "navigation": {},
         "error": ""
     }
 
+    with nav_lock:
+        nav_start = dict(nav_counts)
+
     try:
-        print(f"[{account_label}] Logging in...")
-        login(driver, username, password)
+        if MODE == "http":
+            driver = webrams_http.new_client()
 
-        print(f"[{account_label}] Opening Train Progress...")
-        go_to_train_progress_menu(driver)
+            print(f"[{account_label}] Logging in (http)...")
+            webrams_http.login(driver, username, password)
+
+            print(f"[{account_label}] Searching running trains...")
+            train_list = webrams_http.running_trains(driver)
+        else:
+            driver = build_driver()
+
+            print(f"[{account_label}] Logging in...")
+            login(driver, username, password)
+
+            print(f"[{account_label}] Opening Train Progress...")
+            go_to_train_progress_menu(driver)
+
+            print(f"[{account_label}] Searching running trains...")
+            train_list = run_running_train_search(driver)
 
-        print(f"[{account_label}] Searching running trains...")
-        train_list = run_running_train_search(driver)
         if not train_list:
             account_result["error"] = "No running trains found or results table not parsed."
             return account_result
 
-        selected = train_list[:MAX_TRAINS]
-        print(f"[{account_label}] Found {len(train_list)} trains, scraping first {len(selected)}")
+        selected = train_list[:MAX_TRAINS] if MAX_TRAINS > 0 else train_list
+        print(
+            f"[{account_label}] Found {len(train_list)} trains, scraping {len(selected)} "
+            f"with {min(train_workers, len(selected))} drivers"
+        )
 
-        trains_out = []
-        for stub in selected:
-            try:
-                item = scrape_one_train(driver, stub, account_label)
-                if item:
-                    trains_out.append(item)
-            except Exception as e:
-                print(f"[{account_label}] Failed on train {stub.get('train_id')}: {e}")
-                traceback.print_exc()
-                continue
+        trains_out, failed, retries = scrape_trains_pooled(
+            driver, username, password, account_label, selected, train_workers, cache_trains
+        )
 
         account_result["train_count"] = len(trains_out)
         account_result["trains"] = trains_out
+        account_result["failed_trains"] = failed
+        account_result["retries"] = retries
         return account_result
 
     except Exception as e:
@@ -558,10 +944,68 @@ def scrape_account(username, password, account_label):
         return account_result
 
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        with nav_lock:
+            account_result["navigation"] = {key: nav_counts[key] - nav_start[key] for key in nav_counts}
+
+        if driver is not None:
+            stop_worker(driver)
+
+
+def scrape_account_timed(account):
+    """
+    Worker entry point: scrape_account plus wall time. Runs in a pool
+    process, so it only takes and returns plain data.
+    """
+    start = time.perf_counter()
+    result = scrape_account(
+        account["username"], account["password"], account["label"], account["train_workers"], account["cache_trains"]
+    )
+    result["seconds"] = round(time.perf_counter() - start, 2)
+    return result
+
+
+def failed_account_result(account, error, seconds=0.0):
+    return {
+        "account_label": account["label"],
+        "scraped_at": utc_now_iso(),
+        "train_count": 0,
+        "train_workers": account["train_workers"],
+        "trains": [],
+        "failed_trains": [],
+        "retries": 0,
+        "navigation": {},
+        "error": error,
+        "seconds": seconds,
+    }
+
+
+def scrape_accounts(accounts, cache_trains=None):
+    """
+    Results come back in account order whatever order they finish in.
+    The MAX_BROWSERS budget is split between the accounts running at once.
+    """
+    workers = min(MAX_BROWSERS, len(accounts))
+    train_workers = max(1, min(TRAIN_WORKERS, MAX_BROWSERS // max(1, workers)))
+    accounts = [dict(account, train_workers=train_workers, cache_trains=cache_trains or {}) for account in accounts]
+
+    if workers <= 1:
+        return [scrape_account_timed(account) for account in accounts]
+
+    print(f"Scraping {len(accounts)} accounts, {workers} at a time with {train_workers} drivers each")
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(scrape_account_timed, account) for account in accounts]
+        results = []
+
+        for account, future in zip(accounts, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory).
+                print(f"[{account['label']}] Worker failed: {e}")
+                results.append(failed_account_result(account, f"{type(e).__name__}: {e}"))
+
+    return results
 
 
 def load_accounts():
@@ -586,24 +1030,41 @@ def main():
     if not accounts:
         raise RuntimeError("No WebRAMS accounts found in .env")
 
-    all_account_results = []
-    all_train_records = []
+    cache = load_cache()
+    print(f"Loaded {len(cache['trains'])} cached trains from {CACHE_FILE}")
 
-    for account in accounts:
-        result = scrape_account(
-            account["username"],
-            account["password"],
-            account["label"]
+    start = time.perf_counter()
+    all_account_results = scrape_accounts(accounts, cache["trains"])
+    wall_seconds = round(time.perf_counter() - start, 2)
+
+    all_train_records = []
+    cache_entries = []
+    for result in all_account_results:
+        for record in result.get("trains", []):
+            cache_entries.append(record.pop("cache_entry"))
+            all_train_records.append(record)
+        status = f"error: {result['error']}" if result.get("error") else "ok"
+        nav = result.get("navigation", {})
+        print(
+            f"[{result['account_label']}] {result['train_count']} trains in {result.get('seconds', 0)}s, "
+            f"{len(result.get('failed_trains', []))} failed, {result.get('retries', 0)} retries, "
+            f"views by URL/clicks {nav.get('url', 0)}/{nav.get('clicks', 0)} ({nav.get('url_failed', 0)} URL failures) "
+            f"({status})"
         )
-        all_account_results.append(result)
-        all_train_records.extend(result.get("trains", []))
 
     merged_records = dedupe_and_merge_train_records(all_train_records)
+    report = cache_report(cache_entries)
+    save_cache(cache, cache_entries)
 
     output = {
         "updated_at": utc_now_iso(),
         "base_url": BASE_URL,
+        "mode": MODE,
         "max_trains_per_account": MAX_TRAINS,
+        "max_browsers": MAX_BROWSERS,
+        "train_workers_per_account": TRAIN_WORKERS,
+        "wall_seconds": wall_seconds,
+        "cache": report,
         "accounts": all_account_results,
         "trains": merged_records
     }
@@ -613,6 +1074,12 @@ def main():
 
     print(f"Saved {OUT_FILE}")
     print(f"Merged trains: {len(merged_records)}")
+    print(f"Scrape wall time: {wall_seconds}s")
+    print(
+        f"Cache: {report['full_hits']}/{report['trains']} trains fully cached, "
+        + ", ".join(f"{name} {counts['hits']} hit/{counts['misses']} miss" for name, counts in report["sections"].items())
+        + f", {report['pages_skipped']} page loads skipped"
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,368 @@
+import argparse
+import base64
+import html
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from flask import Flask, redirect, request, session
+
+import webrams_html
+
+
+# ============================================================
+# Local WebRAMS stand-in
+#
+# A small Flask app that behaves like the parts of WebRAMS the scrapers
+# use: a login form, the Train Progress search (Status select, Train ID
+# box, Search button, a View button per result row) and the progress /
+# Consist History / Incidents views of a train. Pages post back through
+# one ASP.NET-style form with __VIEWSTATE and __doPostBack links.
+#
+# Train views are replayed from recorded pages when --recordings points
+# at a directory of train_<ID>_<view>.html files (webrams_scraper.py
+# writes them when WEBRAMS_RECORD_DIR is set). Otherwise --trains
+# synthetic trains are generated from --seed.
+#
+#   python webrams_standin.py --port 5055 --trains 40
+#   WEBRAMS_BASE_URL=http://127.0.0.1:5055 WEBRAMS_MODE=http python webrams_scraper.py
+#
+# Any non-empty username and password log in.
+# ============================================================
+
+
+VIEWS = ["progress", "consist", "incidents"]
+VIEW_LINKS = {"consist": "Consist History", "incidents": "Incidents"}
+RECORDING_RE = re.compile(r"^train_(.+)_(progress|consist|incidents)\.html$")
+
+TRAIN_PROGRESS_TARGET = "ctl00$Nav$lnkTrainProgress"
+
+STATIONS = ["MFT", "SCT", "APK", "PTA", "KWN", "BFT", "DYN", "PKS", "ALY", "TVN"]
+OPERATORS = ["Pacific National", "Aurizon", "Qube", "SCT Logistics", "One Rail"]
+LOCO_CLASSES = ["NR", "AN", "G", "8100", "XR", "CSR", "GWA", "LDP", "93"]
+
+
+# ============================================================
+# Trains
+# ============================================================
+
+def synthetic_trains(count, seed):
+    rng = random.Random(seed)
+    trains = {}
+
+    while len(trains) < count:
+        train_id = f"{rng.randint(1, 9)}{rng.choice(STATIONS)[0]}{rng.choice(STATIONS)[0]}{rng.randint(1, 99)}"
+        origin, destination = rng.sample(STATIONS, 2)
+        trains[train_id] = {
+            "train_id": train_id,
+            "train_date": f"{rng.randint(1, 28):02d}/10/2026",
+            "origin": origin,
+            "destination": destination,
+            "operator": rng.choice(OPERATORS),
+            "status": "Running",
+            "schedule": [
+                {"location": station, "arrive": f"{hour:02d}:{rng.randint(0, 59):02d}", "depart": f"{hour:02d}:{rng.randint(0, 59):02d}"}
+                for hour, station in enumerate(rng.sample(STATIONS, 4), start=rng.randint(0, 18))
+            ],
+            "consist": [
+                {"seq": str(seq), "vehicle": f"{rng.choice(LOCO_CLASSES)}{rng.randint(1, 120)}", "type": "Locomotive"}
+                for seq in range(1, rng.randint(2, 4) + 1)
+            ],
+            "incidents": [
+                {"location": rng.choice(STATIONS), "cause": rng.choice(["Signal", "Crossing", "Crew"]), "minutes": str(rng.randint(1, 40))}
+                for _ in range(rng.randint(0, 2))
+            ],
+        }
+
+    return trains
+
+
+def load_recordings(recordings_dir):
+    """
+    {train_id: {view: html}} from train_<ID>_<view>.html files.
+    """
+    recorded = {}
+
+    for path in sorted(Path(recordings_dir).glob("train_*.html")):
+        match = RECORDING_RE.match(path.name)
+        if match:
+            recorded.setdefault(match.group(1), {})[match.group(2)] = path.read_text(encoding="utf-8", errors="replace")
+
+    return recorded
+
+
+def recorded_train_row(train_id, views):
+    """
+    Search-results columns for a recorded train, read from the label /
+    value pairs on its progress page.
+    """
+    summary = webrams_html.summary_pairs(webrams_html.parse_page(views.get("progress", "")))
+    return {
+        "train_id": train_id,
+        "train_date": summary.get("train_date", ""),
+        "origin": summary.get("origin", ""),
+        "destination": summary.get("destination", ""),
+        "operator": summary.get("operator", ""),
+        "status": summary.get("status", "Running"),
+    }
+
+
+# ============================================================
+# HTML
+# ============================================================
+
+def esc(value):
+    return html.escape(str(value), quote=True)
+
+
+def encode_state(state):
+    return base64.b64encode(json.dumps(state).encode("utf-8")).decode("ascii")
+
+
+def decode_state(value):
+    try:
+        return json.loads(base64.b64decode(value or "").decode("utf-8"))
+    except ValueError:
+        return {}
+
+
+def table_html(headers, rows):
+    head = "".join(f"<th>{esc(header)}</th>" for header in headers)
+    body = "".join("<tr>" + "".join(f"<td>{esc(value)}</td>" for value in row) + "</tr>" for row in rows)
+    return f"<table class='grid'><tr>{head}</tr>{body}</table>"
+
+
+def summary_html(train):
+    return (
+        "<table class='summary'>"
+        f"<tr><td>Train ID:</td><td>{esc(train['train_id'])}</td><td>Operator:</td><td>{esc(train['operator'])}</td></tr>"
+        f"<tr><td>Train Date:</td><td>{esc(train['train_date'])}</td><td>Origin:</td><td>{esc(train['origin'])}</td></tr>"
+        f"<tr><td>Destination:</td><td>{esc(train['destination'])}</td><td>Status:</td><td>{esc(train['status'])}</td></tr>"
+        "</table>"
+    )
+
+
+def form_html(action, content, state=None, nav=True):
+    """
+    The page-wide ASP.NET form: postback fields, view state, the nav
+    links (logged-in pages only) and content.
+    """
+    nav_html = ""
+    if nav:
+        nav_html = (
+            "<div class='nav'><a href='Menu.aspx'>Menu</a> | "
+            f"<a href=\"javascript:__doPostBack('{TRAIN_PROGRESS_TARGET}','')\">Train Progress</a></div>"
+        )
+
+    return (
+        f"<form method='post' action='{esc(action)}' id='aspnetForm'>"
+        "<input type='hidden' name='__EVENTTARGET' value=''>"
+        "<input type='hidden' name='__EVENTARGUMENT' value=''>"
+        f"<input type='hidden' name='__VIEWSTATE' value='{encode_state(state or {})}'>"
+        f"{nav_html}{content}</form>"
+    )
+
+
+def layout(action, content, state=None, nav=True, title="Rail Access Management System"):
+    return (
+        "<!DOCTYPE html><html><head><title>WebRAMS</title>"
+        "<script>function __doPostBack(t, a) { var f = document.forms[0]; "
+        "f.__EVENTTARGET.value = t; f.__EVENTARGUMENT.value = a; f.submit(); }</script>"
+        f"</head><body><h1>{esc(title)}</h1>"
+        f"{form_html(action, content, state, nav)}"
+        "</body></html>"
+    )
+
+
+def synthetic_view_html(train, view):
+    if view == "progress":
+        content = "<h2>Schedule</h2>" + table_html(
+            ["Location", "Arrive", "Depart"],
+            [[row["location"], row["arrive"], row["depart"]] for row in train["schedule"]],
+        )
+    elif view == "consist":
+        content = "<h2>Consist</h2>" + table_html(
+            ["Seq", "Vehicle", "Type"],
+            [[row["seq"], row["vehicle"], row["type"]] for row in train["consist"]],
+        )
+    else:
+        total = sum(int(row["minutes"]) for row in train["incidents"])
+        content = f"<h2>Incidents</h2><p>Total Delay: {total}</p>" + table_html(
+            ["Location", "Cause", "Minutes"],
+            [[row["location"], row["cause"], row["minutes"]] for row in train["incidents"]],
+        )
+
+    return summary_html(train) + content
+
+
+def tab_links(train_id):
+    return "<div class='tabs'>" + " | ".join(
+        f"<a href='TrainView.aspx?id={esc(train_id)}&amp;tab={view}'>{label}</a>"
+        for view, label in VIEW_LINKS.items()
+    ) + "</div>"
+
+
+# ============================================================
+# App
+# ============================================================
+
+def create_app(recordings_dir=None, train_count=40, seed=1, latency_ms=0):
+    """
+    recordings_dir wins over synthetic trains when it has any recorded
+    train pages.
+    """
+    recorded = load_recordings(recordings_dir) if recordings_dir else {}
+
+    if recorded:
+        trains = {train_id: recorded_train_row(train_id, views) for train_id, views in recorded.items()}
+    else:
+        trains = synthetic_trains(train_count, seed)
+
+    app = Flask(__name__)
+    app.secret_key = "webrams-standin"
+    app.config["STANDIN_TRAINS"] = trains
+
+    def logged_in():
+        return bool(session.get("user"))
+
+    def postback_redirect():
+        if request.method == "POST" and request.form.get("__EVENTTARGET") == TRAIN_PROGRESS_TARGET:
+            return redirect("TrainProgress.aspx")
+        return None
+
+    @app.before_request
+    def slow_down():
+        if latency_ms:
+            time.sleep(latency_ms / 1000)
+
+    @app.route("/", methods=["GET"])
+    @app.route("/Login.aspx", methods=["GET", "POST"])
+    def login_page():
+        error = ""
+
+        if request.method == "POST":
+            if request.form.get("ctl00$Main$txtUserName") and request.form.get("ctl00$Main$txtPassword"):
+                session["user"] = request.form["ctl00$Main$txtUserName"]
+                return redirect("Menu.aspx")
+            error = "<p class='error'>Invalid username or password.</p>"
+
+        content = (
+            f"<h2>Login</h2>{error}<table>"
+            "<tr><td>Username</td><td><input type='text' name='ctl00$Main$txtUserName' id='txtUserName'></td></tr>"
+            "<tr><td>Password</td><td><input type='password' name='ctl00$Main$txtPassword' id='txtPassword'></td></tr>"
+            "</table><input type='submit' name='ctl00$Main$btnLogin' value='Login'>"
+        )
+        return layout("Login.aspx", content, nav=False, title="WebRAMS")
+
+    @app.route("/Menu.aspx", methods=["GET", "POST"])
+    def menu_page():
+        if not logged_in():
+            return redirect("Login.aspx")
+        return postback_redirect() or layout("Menu.aspx", "<h2>Menu</h2><p>Select an option above.</p>")
+
+    @app.route("/TrainProgress.aspx", methods=["GET", "POST"])
+    def train_progress_page():
+        if not logged_in():
+            return redirect("Login.aspx")
+
+        moved = postback_redirect()
+        if moved:
+            return moved
+
+        form = request.form if request.method == "POST" else {}
+        state = decode_state(form.get("__VIEWSTATE"))
+
+        for key in form:
+            match = re.match(r"^ctl00\$Main\$gvResults\$ctl(\d+)\$btnView$", key)
+            if match and state.get("rows"):
+                row = int(match.group(1)) - 2
+                if 0 <= row < len(state["rows"]):
+                    return redirect(f"TrainView.aspx?id={state['rows'][row]}&tab=progress")
+
+        train_id = form.get("ctl00$Main$txtTrainId", "").strip().upper()
+        status = form.get("ctl00$Main$ddlStatus", "All")
+
+        statuses = ["All", "Running", "Terminated", "Cancelled"]
+        options = "".join(
+            f"<option value='{value}'{' selected' if value == status else ''}>{value}</option>" for value in statuses
+        )
+        content = (
+            "<h2>Train Progress</h2><table>"
+            f"<tr><td>Train ID</td><td><input type='text' name='ctl00$Main$txtTrainId' value='{esc(train_id)}'></td></tr>"
+            f"<tr><td>Status</td><td><select name='ctl00$Main$ddlStatus'>{options}</select></td></tr>"
+            "</table><input type='submit' name='ctl00$Main$btnSearch' value='Search'>"
+        )
+
+        rows = []
+        if "ctl00$Main$btnSearch" in form:
+            rows = [
+                train for train in app.config["STANDIN_TRAINS"].values()
+                if (not train_id or train["train_id"].upper() == train_id)
+                and (status == "All" or train["status"] == status)
+            ]
+
+            body = "".join(
+                "<tr>"
+                + "".join(f"<td>{esc(train[key])}</td>" for key in ["train_id", "train_date", "origin", "destination", "operator", "status"])
+                + f"<td><input type='submit' name='ctl00$Main$gvResults$ctl{index + 2:02d}$btnView' value='View'></td></tr>"
+                for index, train in enumerate(rows)
+            )
+            content += (
+                "<h2>Search Results</h2><table class='grid'>"
+                "<tr><th>Train ID</th><th>Train Date</th><th>Origin</th><th>Destination</th><th>Operator</th><th>Status</th><th></th></tr>"
+                f"{body}</table>"
+            )
+
+        return layout("TrainProgress.aspx", content, {"rows": [train["train_id"] for train in rows]})
+
+    @app.route("/TrainView.aspx", methods=["GET", "POST"])
+    def train_view_page():
+        if not logged_in():
+            return redirect("Login.aspx")
+
+        moved = postback_redirect()
+        if moved:
+            return moved
+
+        train_id = request.args.get("id", "")
+        view = request.args.get("tab", "progress")
+        train = app.config["STANDIN_TRAINS"].get(train_id)
+
+        if train is None or view not in VIEWS:
+            return layout("TrainView.aspx", "<p class='error'>Train not found.</p>"), 404
+
+        if train_id in recorded:
+            page_html = recorded[train_id].get(view, "")
+            # The stand-in's form, nav and tabs go first so they are the
+            # ones a client finds; the recorded page follows unchanged.
+            header = form_html(f"TrainView.aspx?id={train_id}&tab={view}", tab_links(train_id))
+            if "<body" in page_html:
+                return re.sub(r"(<body[^>]*>)", lambda m: m.group(1) + header, page_html, count=1)
+            return header + page_html
+
+        return layout(f"TrainView.aspx?id={train_id}&tab={view}", tab_links(train_id) + synthetic_view_html(train, view))
+
+    return app
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Serve a local WebRAMS stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--recordings", default=None, help="Directory of train_<ID>_<view>.html pages to replay.")
+    parser.add_argument("--trains", type=int, default=40, help="Synthetic trains when there are no recordings.")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay added to every response.")
+    args = parser.parse_args(argv)
+
+    app = create_app(args.recordings, args.trains, args.seed, args.latency_ms)
+    print(f"WebRAMS stand-in with {len(app.config['STANDIN_TRAINS'])} trains on http://{args.host}:{args.port}")
+    app.run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))